@@ -0,0 +1,15 @@
+# Sekcje aplikacji Streamlit - każda w osobnym module z funkcją render(version).
+# Aplikacja importuje moduł dopiero przy otwarciu sekcji, więc sekcje tekstowe nie ładują
+# matplotlib/plotly, a zimny start obejmuje tylko streamlit i pakiet wyników
+# (koszt importu sekcji: python benchmarks/bench_app_import.py).
+SECTIONS = {
+    "I. Wstęp": 'aplikacja.intro',
+    "II. Dane i metodyka": 'aplikacja.data',
+    "III. Analiza związku miejsca zamieszkania kierowców": 'aplikacja.drivers',
+    "IV. Machine Learning - opis i wyniki modeli": 'aplikacja.models',
+    "V. Ważność cech (XGBoost)": 'aplikacja.feature_importance',
+    "VI. Analiza Chi-Kwadrat ważności cech": 'aplikacja.chi2',
+    "VII. Szczegółowa ocena modeli XGBoost i RandomForest": 'aplikacja.evaluation',
+    "VIII. Podsumowanie i wnioski końcowe": 'aplikacja.summary',
+    "IX. Podgląd kodu Python": 'aplikacja.code_preview',
+}
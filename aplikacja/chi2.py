@@ -0,0 +1,152 @@
+# Sekcja VI: testy chi-kwadrat i V Craméra dla kluczowych cech.
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+from aplikacja.common import fmt, get_bundle, p_label
+from wypadki.results import frame
+
+
+@st.cache_data
+def chi2_summary(version):
+    # Tabela podsumowująca testy chi-kwadrat (posortowane wg V Craméra)
+    chi2_features = get_bundle(version)['sections']['chi2_features']
+    summary_df = pd.DataFrame({
+        'Zmienna': [f"`{test['feature']}` ({test['label']})" for test in chi2_features],
+        'Statystyka χ²': [test['statistic'] for test in chi2_features],
+        'p-value': [test['p_value'] for test in chi2_features],
+        'V Craméra': [test['cramer_v'] for test in chi2_features],
+        'Siła związku': [test['strength'] for test in chi2_features],
+    })
+    summary_df.index = range(1, len(summary_df) + 1)
+    return summary_df
+
+
+@st.cache_data
+def cramer_figure(version):
+    summary_df = chi2_summary(version)
+    fig_plotly = px.bar(summary_df,
+                        x='Zmienna',
+                        y='V Craméra',
+                        color='Siła związku',
+                        title='Siła związku (V Craméra) dla kluczowych cech z modelu XGBoost',
+                        labels={'V Craméra': 'V Craméra', 'Zmienna': 'Cecha'},
+                        color_discrete_map={'Umiarkowany': '#1f77b4', 'Słaby': '#ff7f0e'},
+                        text='V Craméra')
+    fig_plotly.update_traces(texttemplate='%{text:.3f}', textposition='outside')
+    fig_plotly.update_layout(
+        yaxis_title='V Craméra',
+        xaxis_title='Cecha',
+        legend_title_text='Siła związku',
+        shapes=[
+            # Orange line at 0.1
+            dict(
+                type="line",
+                x0=-0.5,  # Start of x-axis range
+                x1=len(summary_df)-0.5,  # End of x-axis range
+                y0=0.1,  # Orange threshold
+                y1=0.1,  # Orange threshold
+                line=dict(color="orange", width=2, dash="dash")
+            ),
+            # Blue line at 0.3
+            dict(
+                type="line",
+                x0=-0.5,  # Start of x-axis range
+                x1=len(summary_df)-0.5,  # End of x-axis range
+                y0=0.3,  # Blue threshold
+                y1=0.3,  # Blue threshold
+                line=dict(color="blue", width=2, dash="dash")
+            ),
+            # Red line at 0.5
+            dict(
+                type="line",
+                x0=-0.5,  # Start of x-axis range
+                x1=len(summary_df)-0.5,  # End of x-axis range
+                y0=0.5,  # Red threshold
+                y1=0.5,  # Red threshold
+                line=dict(color="red", width=2, dash="dash")
+            )
+        ]
+    )
+    return fig_plotly
+
+
+def render(version):
+    results = get_bundle(version)['sections']
+    st.title("VI. Analiza Związku Kluczowych Cech z Lokalizacją Wypadku (Test Chi-kwadrat)")
+
+    # --- Opis sekcji ---
+    st.markdown("""
+    W tej sekcji analizujemy statystyczny związek między kluczowymi cechami zidentyfikowanymi w modelowaniu XGBoost a zmienną `is_rural_accident` (lokalizacją wypadku - teren miejski vs. wiejski) przy użyciu testu chi-kwadrat. Testy te potwierdzają, czy cechy wybrane jako istotne przez model XGBoost (sekcja V) mają statystycznie istotny związek z zmienną docelową (`is_rural_accident`). Siła powiązań mierzona jest współczynnikiem V Craméra.
+    """)
+
+    # --- Wyniki testów chi-kwadrat z pakietu wyników (posortowane wg V Craméra) ---
+    chi2_features = results['chi2_features']
+    summary_df = chi2_summary(version)
+    strongest, weakest = chi2_features[0], chi2_features[-2:]
+    ranking = frame(results['feature_importance'])['Cecha'].tolist()
+    importance = frame(results['feature_importance']).set_index('Cecha')['Ważność']
+    rank = ranking.index(strongest['feature']) + 1 if strongest['feature'] in ranking else None
+    moderate = [test['cramer_v'] for test in chi2_features if test['strength'] == 'Umiarkowany' and test['cramer_v'] is not None]
+    p_values = [test['p_value'] for test in chi2_features if test['p_value'] is not None]
+
+    # --- Wyświetlanie tabeli podsumowującej ---
+    st.subheader("Tabela 1: Podsumowanie wyników testów chi-kwadrat")
+    st.dataframe(summary_df.style.format({
+        'Statystyka χ²': '{:.1f}',
+        'p-value': '{:.3e}',
+        'V Craméra': '{:.3f}'
+    }, na_rep='b.d.'))
+    st.markdown(f"""
+    **Wniosek:** Wszystkie zmienne wykazują statystycznie istotny związek z `is_rural_accident` (p < 0.05). Najsilniejszy związek obserwujemy dla `{strongest['feature']}` ({strongest['label']}) (V = {fmt(strongest['cramer_v'], '.3f')}), co zgadza się z wysoką ważnością tej cechy w modelu XGBoost ({fmt(rank, 'd')}. miejsce, ważność = {fmt(importance.get(strongest['feature']))}). Słabsze związki dla {' i '.join(f"`{test['feature']}` ({test['label']})" for test in weakest)} potwierdzają ich mniejszy wpływ w modelowaniu.
+    """)
+
+    # --- Wykres V Craméra (interaktywny) ---
+    st.subheader("Wykres 2: Siła związku V Craméra (interaktywny)")
+    fig_plotly = cramer_figure(version)
+    st.plotly_chart(fig_plotly, use_container_width=True)
+
+    # --- Szczegółowe tabele kontyngencji ---
+    st.subheader("Szczegółowe wyniki testów chi-kwadrat")
+    st.markdown("""
+    Poniżej przedstawiono tabele kontyngencji, wartości oczekiwane (dla wybranych cech) oraz wyniki testów chi-kwadrat dla każdej zmiennej, w odniesieniu do lokalizacji wypadku `is_rural_accident` (teren miejski vs. wiejski).
+    """)
+
+    # Wyświetlanie szczegółowych wyników (tabela kontyngencji i - gdy zapisana - tabela oczekiwana)
+    for idx, test in enumerate(chi2_features, 1):
+        st.markdown(f"**{idx}. Test chi-kwadrat: `{test['feature']}` vs `is_rural_accident`** (obszar wypadku)")
+        st.markdown("**Tabela kontyngencji (obserwowane częstości):**")
+        st.dataframe(frame(test['contingency']).style.format("{:,.0f}"))
+
+        if test['expected']:
+            st.markdown("**Tabela oczekiwana (dla H₀):**")
+            st.dataframe(frame(test['expected']).style.format("{:,.1f}"))
+
+        # Test mógł nie zostać policzony (None w pakiecie wyników) - wartości przez fmt(), wniosek wg p-value
+        p_value = test['p_value']
+        if p_value is None:
+            conclusion = "Brak wyniku testu dla tej zmiennej."
+        elif p_value < 0.05:
+            conclusion = f"Odrzucamy hipotezę zerową (H₀). Istnieje statystycznie istotny związek ({p_label(p_value, 0.0001)})."
+        else:
+            conclusion = f"Nie ma podstaw do odrzucenia hipotezy zerowej (H₀) ({p_label(p_value)})."
+        st.markdown(f"""
+        *Wyniki testu statystycznego:*
+        - *Statystyka chi-kwadrat (χ²):* {fmt(test['statistic'], '.1f')}
+        - *Wartość p (p-value):* {fmt(p_value, '.3e')}
+        - *V Craméra:* {fmt(test['cramer_v'], '.3f')} ({test['strength']} związek)
+        - *Wniosek (α = 0.05):* {conclusion}
+        """)
+
+    # --- Podsumowanie ---
+    st.subheader("Podsumowanie wyników testów chi-kwadrat")
+    others = ', '.join(f"`{test['feature']}` ({test['label'].lower()}) (V = {fmt(test['cramer_v'], '.3f')})" for test in chi2_features[1:-2])
+    st.markdown(f"""
+    - Wszystkie analizowane cechy wykazują **statystycznie istotny związek** z lokalizacją wypadku `is_rural_accident` (p ≤ {fmt(max(p_values, default=None), '.3e')}), co potwierdza odrzucenie hipotezy zerowej (H₀) i wspiera wyniki modelowania XGBoost.
+    - Najsilniejszy wpływ na lokalizację wypadku ma `{strongest['feature']}` ({strongest['label'].lower()}) (V = {fmt(strongest['cramer_v'], '.3f')}), co potwierdza jego wysoką ważność w modelu XGBoost ({fmt(rank, 'd')}. miejsce), w dalszej kolejności {others}, przy czym {' i '.join(f"`{test['feature']}` ({test['label'].lower()}) (V = {fmt(test['cramer_v'], '.3f')})" for test in weakest)} mają słabszy, ale nadal istotny związek, co odpowiada ich niższej, choć zauważalnej ważności w modelu.
+    - Umiarkowana siła związku dla większości cech (V = {fmt(min(moderate, default=None), '.3f')}–{fmt(max(moderate, default=None), '.3f')}) wskazuje, że analizowane zmienne są istotne, ale inne czynniki (np. `speed_limit_normalized`, interakcje cech) mogą dodatkowo wpływać na wyniki, jak sugeruje analiza ważności cech XGBoost.
+    - Słaby związek dla {' i '.join(f"`{test['feature']}` ({test['label'].lower()})" for test in weakest)} sugeruje, że te cechy mogą być mniej uniwersalne lub wymagać bardziej szczegółowych kategorii w przyszłych analizach.
+    
+    **Wiarygodność wyników:**
+    - Duża próba (N = {fmt(results['drivers']['total_accidents'], ',')}) zapewnia wysoką wiarygodność wyników testów chi-kwadrat, co jest zgodne z wysoką skutecznością modelu XGBoost (AUC-ROC = {fmt(results['models']['test']['xgb']['auc'])}).
+    """)
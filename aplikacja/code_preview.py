@@ -0,0 +1,500 @@
+# Sekcja IX: podgląd kodu Python z notebooka.
+import streamlit as st
+import pandas as pd
+
+from aplikacja.common import fmt, get_bundle
+from wypadki.results import frame
+
+
+def render(version):
+    results = get_bundle(version)['sections']
+    st.title("IX. Podgląd użytego kodu w Python")
+    st.markdown("""
+    W tej sekcji przedstawiono pełny kod użyty do analizy wypadków drogowych w UK, obejmujący wczytanie danych, 
+    przygotowanie danych, analizę statystyczną, modelowanie uczenia maszynowego oraz wizualizacje. Kod został wykonany 
+    wcześniej w osobnym skrypcie Pythona, a wyniki są prezentowane statycznie. Poniżej opisano kluczowe etapy analizy, 
+    zilustrowane fragmentami kodu i przykładowymi wynikami. Każda podsekcja jest rozwijalna – kliknij, aby zobaczyć szczegóły.
+    """)
+
+    # --- Podsekcja 1: Import bibliotek ---
+    with st.expander("1. Import bibliotek"):
+        st.markdown("""
+        - **Opis**: Zaimportowano standardowe biblioteki do analizy danych, wizualizacji i modelowania.
+        - **Kod**:
+        """)
+        st.code("""
+# Standardowe biblioteki
+import numpy as np
+import pandas as pd
+
+# Biblioteki do wizualizacji danych
+import matplotlib.pyplot as plt
+import plotly.express as px
+from tabulate import tabulate
+
+# Biblioteki do modelowania i uczenia maszynowego (scikit-learn)
+from sklearn.metrics import classification_report, roc_curve, roc_auc_score
+
+# Biblioteki do uczenia maszynowego (inne)
+from scipy.stats import chi2_contingency
+        """, language="python")
+
+    # --- Podsekcja 2: Wczytanie i wstępne przygotowanie danych ---
+    with st.expander("2. Wczytanie i wstępne przygotowanie danych"):
+        st.markdown("""
+        - **Opis**: Pliki CSV zostały jednorazowo pobrane i zapisane jako snapshot Parquet (partycje wg `accident_year`), 
+        z którego wczytywane są tylko potrzebne kolumny i lata 2021-2023. Tabele połączono (poszkodowany z własnym pojazdem), a następnie 
+        przeprowadzono czyszczenie danych, usuwając wartości `-1` i `99` oraz wiersze z brakami.
+        - **Kod**:
+        """)
+        st.code("""
+from wypadki.config import TABLE_COLUMNS, YEARS
+from wypadki.ingest import load_tables
+from wypadki.join import join_tables
+
+# Wczytanie danych ze snapshotu Parquet (przy pierwszym uruchomieniu: jednorazowe pobranie CSV z data.dft.gov.uk)
+tables = load_tables(years=YEARS, columns=TABLE_COLUMNS)
+casualties, vehicles, accidents = tables['casualties'], tables['vehicles'], tables['accidents']
+
+# Połączenie tabel: jeden wiersz na poszkodowanego, połączony z własnym pojazdem/kierowcą (accident_index + vehicle_reference)
+data = join_tables(accidents, vehicles, casualties, grain='casualty')
+
+# Przygotowanie danych
+# Kody -1 i 99 zostały zamienione na <NA> już przy wczytywaniu (wypadki.schema, typy nullable Int8/Int16)
+# Usunięcie wierszy z brakami w columns_to_check_NaN oraz z błędnym zapisem godziny (time)
+from wypadki.features import clean
+
+data = clean(data)
+        """, language="python")
+
+    # --- Podsekcja 3: Transformacje i inżynieria cech ---
+    with st.expander("3. Transformacje i inżynieria cech"):
+        st.markdown("""
+        - **Opis**: Wykonano transformacje danych, takie jak wyodrębnienie godziny z czasu, normalizacja `speed_limit`, 
+        binowanie zmiennych wiekowych oraz tworzenie nowych cech (np. `is_urban_driver`, `is_rural_accident`, 
+        `urban_driver_speed`). Parametry skalowania i słownik kolumn dopasowano tylko na zbiorze treningowym 
+        i zapisano razem jako jeden artefakt potoku.
+        - **Kod**:
+        """)
+        st.code("""
+from wypadki.preprocessing import PreprocessingPipeline, split_positions
+
+data.reset_index(drop=True, inplace=True)
+
+# Pozycje wierszy zbiorów treningowego (60%), walidacyjnego (20%) i testowego (20%) ze stratyfikacją wg is_rural_accident
+pos_train, pos_val, pos_test = split_positions((data['urban_or_rural_area'] == 2).astype(int))
+
+# Potok przygotowania danych dopasowany tylko na zbiorze treningowym i zapisany jako jeden artefakt (modele/preprocessing.json):
+# hour_of_day, is_urban_driver (driver_home_area_type 3 -> 2), is_rural_accident, speed_limit_normalized,
+# binowanie wieku (≤17, 18-25, 26-40, 41-60, >60), urban_driver_speed, is_rush_hour (7-9 i 15-18),
+# distance_speed_interaction, important_driver_distance, urban_driver_long_distance, urban_driver_no_junction_control
+# oraz kodowanie zero-jedynkowe do macierzy rzadkiej CSR (kolumny jak w pd.get_dummies(drop_first=True))
+preprocessing = PreprocessingPipeline().fit(data.iloc[pos_train])
+preprocessing.save()
+
+data = preprocessing.add_features(data)
+X = preprocessing.encode(data)
+feature_names = preprocessing.feature_names
+y = data['is_rural_accident']
+        """, language="python")
+        st.markdown("- **Wynik (statyczny)**: Przykładowe dane po transformacji:")
+        sample_data = {
+            'is_urban_driver': [1, 0, 1],
+            'speed_limit_normalized': [0.5, -1.2, 0.8],
+            'urban_driver_speed': [0.5, 0.0, 0.8],
+            'is_rush_hour': [1, 0, 0],
+            'is_rural_accident': [0, 1, 1]
+        }
+        st.dataframe(pd.DataFrame(sample_data))
+
+    # --- Podsekcja 4: Podział danych i balansowanie ---
+    with st.expander("4. Podział danych i balansowanie"):
+        st.markdown("""
+        - **Opis**: Dane podzielono na zbiory treningowy (60%), walidacyjny (20%) i testowy (20%), a zbiór treningowy 
+        zbalansowano za pomocą SMOTE (wariant konfigurowalny: SMOTE na próbce, undersampling lub wagi klas w modelach).
+        - **Kod**:
+        """)
+        st.code("""
+# Podział na zbiory treningowy (60%), walidacyjny (20%) i testowy (20%) wg pozycji z split_positions
+X_train, X_val, X_test = X[pos_train], X[pos_val], X[pos_test]
+y_train, y_val, y_test = y.iloc[pos_train], y.iloc[pos_val], y.iloc[pos_test]
+
+# Balansowanie klas na zbiorze treningowym (wypadki.imbalance): 'smote', 'smote_subset', 'undersample' lub 'class_weight'
+from wypadki.imbalance import IMBALANCE_MODE, balance
+
+X_train, y_train, model_params = balance(X_train, y_train, mode=IMBALANCE_MODE)
+        """, language="python")
+        split_sizes = results['models'].get('split_sizes')
+        if split_sizes:
+            st.markdown(f"- **Wynik**: Rozmiary zbiorów: treningowy {split_sizes['train']:,} rekordów "
+                        f"(po balansowaniu {split_sizes['train_balanced']:,}), walidacyjny {split_sizes['validation']:,} rekordów, "
+                        f"testowy {split_sizes['test']:,} rekordów.")
+        else:
+            st.markdown("- **Wynik**: Rozmiary zbiorów nie zostały zapisane w pakiecie wyników tej wersji.")
+
+    # --- Podsekcja 5: Analiza statystyczna (proporcje kierowców) ---
+    with st.expander("5. Analiza statystyczna - proporcje kierowców"):
+        st.markdown("""
+        - **Opis**: Obliczono proporcje kierowców z obszarów miejskich i wiejskich oraz ich rozkład w latach 2021-2023.
+        - **Kod**:
+        """)
+        st.code("""
+# 1. Całkowita liczba wypadków
+total_accidents = len(data)
+total_stats = pd.DataFrame({
+    'Kategoria': ['Wszystkie wypadki'],
+    'Liczba': [total_accidents],
+    'Procent': [100.0]
+})
+
+# 2. Proporcje kierowców z obszarów miejskich i niemiejskich
+driver_origin = data['is_urban_driver'].value_counts().reset_index()
+driver_origin.columns = ['is_urban_driver', 'Liczba kierowców']
+driver_origin['Pochodzenie'] = driver_origin['is_urban_driver'].map({0: 'kier. Wiejski', 1: 'kier. Miejski'})
+driver_origin['Procent'] = (driver_origin['Liczba kierowców'] / driver_origin['Liczba kierowców'].sum()) * 100
+
+# Przygotowanie danych do tabeli dla proporcji kierowców
+driver_origin_display = driver_origin[['Pochodzenie', 'Liczba kierowców', 'Procent']].copy()
+driver_origin_display['Procent'] = driver_origin_display['Procent'].map('{:.1f}%'.format)
+driver_origin_display.loc[len(driver_origin_display)] = ['Suma', driver_origin['Liczba kierowców'].sum(), '100.0%']
+
+# 3. Rozkład kierowców według lat
+driver_stats = data.groupby(['accident_year', 'is_urban_driver']).size().unstack()
+driver_stats.columns = ['kier. Wiejski', 'kier. Miejski']
+driver_stats['Rok'] = driver_stats.index
+
+# Obliczamy sumę i procenty
+driver_stats['Suma'] = driver_stats['kier. Wiejski'] + driver_stats['kier. Miejski']
+driver_stats['% kier. Wiejskich'] = (driver_stats['kier. Wiejski'] / driver_stats['Suma']) * 100
+driver_stats['% kier. Miejskich'] = (driver_stats['kier. Miejski'] / driver_stats['Suma']) * 100
+
+# Przygotowanie tabeli do wyświetlenia
+driver_stats_display = driver_stats[['Rok', 'kier. Wiejski', '% kier. Wiejskich', 'kier. Miejski', '% kier. Miejskich', 'Suma']].copy()
+driver_stats_display['% kier. Wiejskich'] = driver_stats_display['% kier. Wiejskich'].map('{:.1f}%'.format)
+driver_stats_display['% kier. Miejskich'] = driver_stats_display['% kier. Miejskich'].map('{:.1f}%'.format)
+        """, language="python")
+        st.markdown("- **Wynik**:")
+        st.dataframe(frame(results['drivers']['driver_origin']))
+        st.dataframe(frame(results['drivers']['driver_stats']))
+
+    # --- Podsekcja 6: Wizualizacje statystyczne ---
+    with st.expander("6. Wizualizacje statystyczne"):
+        st.markdown("""
+        - **Opis**: Stworzono wykresy przedstawiające całkowitą liczbę wypadków, proporcje kierowców oraz rozkład 
+        kierowców według lat.
+        - **Kod**:
+        """)
+        st.code("""
+# Tworzenie figury z trzema wykresami w układzie 2x2
+fig = plt.figure(figsize=(14, 10))
+gs = fig.add_gridspec(2, 2, height_ratios=[1, 1])
+
+# Wykres 1: Całkowita liczba wypadków
+ax1 = fig.add_subplot(gs[0, 0])
+bars1 = ax1.bar(total_stats['Kategoria'], total_stats['Liczba'], color='#93c47d')
+ax1.set_title('Całkowita liczba wypadków')
+ax1.set_ylabel('Liczba')
+ax1.grid(axis='y', linestyle='--', alpha=0.7)
+for bar in bars1:
+    height = bar.get_height()
+    ax1.text(bar.get_x() + bar.get_width()/2., height/2,
+             f'{int(height)} (100%)', ha='center', va='center', fontsize=12, color='black')
+
+# Wykres 2: Proporcje kierowców
+ax2 = fig.add_subplot(gs[0, 1])
+bars2 = ax2.bar(['Kierowcy'], driver_origin['Liczba kierowców'][0], color='#1f77b4', label='kier. Wiejski')
+bars3 = ax2.bar(['Kierowcy'], driver_origin['Liczba kierowców'][1], bottom=driver_origin['Liczba kierowców'][0],
+                color='#ff7f0e', label='kier. Miejski')
+ax2.set_title('Proporcje kierowców według miejsca zamieszkania')
+ax2.set_ylabel('Liczba kierowców')
+ax2.grid(axis='y', linestyle='--', alpha=0.7)
+for i, (bar, procent) in enumerate(zip([bars2[0], bars3[0]], driver_origin['Procent'])):
+    height = bar.get_height()
+    bottom = bar.get_y()
+    text_position = bottom + height/2 if i == 0 else bottom + height/3
+    ax2.text(bar.get_x() + bar.get_width()/2., text_position,
+             f"{int(height)} ({procent:.1f}%)", ha='center', va='center', fontsize=12)
+
+# Wykres 3: Rozkład kierowców według lat
+ax3 = fig.add_subplot(gs[1, :])
+bar_width = 0.35
+x = range(len(driver_stats))
+bars4 = ax3.bar(x, driver_stats['kier. Wiejski'], width=bar_width, color='#ff7f0e', label='kier. Wiejski')
+bars5 = ax3.bar([i + bar_width for i in x], driver_stats['kier. Miejski'], width=bar_width, color='#1f77b4', label='kier. Miejski')
+ax3.set_title('Rozkład kierowców według miejsca zamieszkania w poszczególnych latach')
+ax3.set_xlabel('Rok')
+ax3.set_ylabel('Liczba kierowców')
+ax3.set_xticks([i + bar_width/2 for i in x])
+ax3.set_xticklabels(driver_stats['Rok'])
+ax3.legend(loc='upper center', bbox_to_anchor=(0.5, 1.35))
+ax3.grid(axis='y', linestyle='--', alpha=0.7)
+
+for bars in [bars4, bars5]:
+    for bar in bars:
+        height = bar.get_height()
+        ax3.text(bar.get_x() + bar.get_width()/2., height/2,
+                 f'{int(height)}', ha='center', va='center', fontsize=10, color='white')
+
+fig.suptitle('Analiza kierowców w wypadkach drogowych', fontsize=16)
+plt.tight_layout(rect=[0, 0, 1, 0.90])
+plt.show()
+        """, language="python")
+        st.markdown("- **Wynik**: Wykresy są statyczne i nie są wyświetlane w tej wersji aplikacji. W rzeczywistej analizie byłyby widoczne jako obrazy matplotlib.")
+
+    # --- Podsekcja 7: Test chi-kwadrat ---
+    with st.expander("7. Test chi-kwadrat"):
+        st.markdown("""
+        - **Opis**: Przeprowadzono test chi-kwadrat dla zmiennych `is_urban_driver` i `is_rural_accident`, tworząc 
+        tabelę kontyngencji i obliczając współczynnik Phi.
+        - **Kod**:
+        """)
+        st.code("""
+# Tworzenie tabeli kontyngencji
+contingency_table = pd.crosstab(data['is_urban_driver'], data['is_rural_accident'])
+contingency_table.index = ['kier. Wiejski', 'kier. Miejski']
+contingency_table.columns = ['Wypadek obszar miejski', 'Wypadek obszar wiejski']
+
+# Obliczenie procentów
+location_stats = pd.crosstab(data['is_urban_driver'], data['is_rural_accident'], normalize='index') * 100
+location_stats.index = ['kier. Wiejski', 'kier. Miejski']
+location_stats.columns = ['obszar Miejski', 'obszar Wiejski']
+location_stats['Suma'] = 100
+
+# Przeprowadzenie testu chi-kwadrat
+chi2, p, dof, expected = chi2_contingency(contingency_table)
+n = contingency_table.values.sum()
+phi = np.sqrt(chi2 / n)
+        """, language="python")
+        st.markdown("- **Wynik**:")
+        chi2_driver = results['drivers']['chi2']
+        st.dataframe(frame(results['drivers']['contingency']))
+        st.markdown(f"""
+        **Wyniki testu chi-kwadrat:**
+        - Statystyka χ²: {fmt(chi2_driver['statistic'], '.2f')}
+        - p-value: {fmt(chi2_driver['p_value'], '.4g')}
+        - Stopnie swobody: {chi2_driver['dof']}
+        - Współczynnik Phi: {fmt(chi2_driver['phi'], '.3f')}
+        - Wniosek: {chi2_driver['conclusion']}
+        """)
+
+    # --- Podsekcja 8: Wykres słupkowy Plotly ---
+    with st.expander("8. Wykres słupkowy (Plotly)"):
+        st.markdown("""
+        - **Opis**: Stworzono interaktywny wykres słupkowy przedstawiający procent wypadków wg miejsca zamieszkania i lokalizacji.
+        - **Kod**:
+        """)
+        st.code("""
+# Wykres słupkowy
+location_stats_reset = location_stats.reset_index().rename(columns={'index': 'is_urban_driver'})
+fig = px.bar(location_stats_reset,
+             x='is_urban_driver',
+             y=['obszar Miejski', 'obszar Wiejski'],
+             title='Procent uczestników wypadków na obszarze miejskim i wiejskim<br>wg miejsca zamieszkania kierowcy',
+             labels={'value': 'Procent wypadków', 'variable': 'Typ obszaru', 'is_urban_driver': 'Pochodzenie kierowcy'},
+             color_discrete_map={'obszar Miejski': '#1f77b4', 'obszar Wiejski': '#ff7f0e'},
+             barmode='group')
+fig.update_layout(yaxis={'ticksuffix': '%', 'title': 'Procent wypadków'},
+                  xaxis={'title': 'Pochodzenie kierowcy'},
+                  legend_title='Typ obszaru')
+fig.update_traces(texttemplate='%{y:.1f}%', textposition='auto')
+fig.show()
+        """, language="python")
+        st.markdown("- **Wynik**: Wykres jest statyczny i nie jest wyświetlany w tej wersji aplikacji.")
+
+    # --- Podsekcja 9: Modelowanie (XGBoost i RandomForest) ---
+    with st.expander("9. Modelowanie (XGBoost i RandomForest)"):
+        st.markdown("""
+        - **Opis**: Zbudowano i oceniono modele XGBoost i RandomForest, stosując walidację krzyżową i oceniając na 
+        zbiorach walidacyjnym oraz testowym.
+        - **Kod**:
+        """)
+        st.code("""
+from wypadki.training import train_model
+
+# 5-krotna walidacja krzyżowa z równolegle uczonymi podzbiorami; modelem końcowym jest zespół modeli podzbiorów
+# (bez ponownego uczenia), metryki zapisywane są do wyniki/cv_metrics.json
+
+# Model XGBoost (hiperparametry w wypadki.models.XGB_PARAMS: max_depth=9, n_estimators=269, learning_rate=0.06, ...)
+# Tryb histogramowy: wspólne kwantyle cech dla wszystkich podzbiorów i wczesne zatrzymanie na zbiorze walidacyjnym
+from wypadki.boosting import quantile_reference
+
+xgb_reference = quantile_reference(X_train, y_train)
+xgb_model, xgb_cv = train_model('xgb_hist', X_train, y_train, model_params=model_params['xgb'], n_splits=5,
+                                fit_params={'eval_set': (X_val, y_val), 'ref': xgb_reference})
+
+# Model RandomForest (hiperparametry w wypadki.models.RF_PARAMS: n_estimators=229, max_depth=14, ...)
+rf_model, rf_cv = train_model('rf', X_train, y_train, model_params=model_params['rf'], n_splits=5)
+
+# Ocena modelu XGBoost na zbiorze walidacyjnym
+y_val_pred_proba_xgb = xgb_model.predict_proba(X_val)[:, 1]
+y_val_pred_xgb = (y_val_pred_proba_xgb >= 0.5).astype(int)
+
+# Ocena modelu RandomForest na zbiorze walidacyjnym
+y_val_pred_proba_rf = rf_model.predict_proba(X_val)[:, 1]
+y_val_pred_rf = (y_val_pred_proba_rf >= 0.5).astype(int)
+
+# Ocena modelu XGBoost na zbiorze testowym
+y_test_pred_proba_xgb = xgb_model.predict_proba(X_test)[:, 1]
+y_test_pred_xgb = (y_test_pred_proba_xgb >= 0.5).astype(int)
+
+# Ocena modelu RandomForest na zbiorze testowym
+y_test_pred_proba_rf = rf_model.predict_proba(X_test)[:, 1]
+y_test_pred_rf = (y_test_pred_proba_rf >= 0.5).astype(int)
+        """, language="python")
+        test = results['models']['test']
+        st.markdown(f"- **Wynik**: AUC-ROC XGBoost (testowy): {fmt(test['xgb']['auc'])}, AUC-ROC RandomForest (testowy): {fmt(test['rf']['auc'])}.")
+
+    # --- Podsekcja 10: Ważność cech (XGBoost) ---
+    with st.expander("10. Ważność cech (XGBoost)"):
+        st.markdown("""
+        - **Opis**: Obliczono i zwizualizowano ważność cech dla modelu XGBoost.
+        - **Kod**:
+        """)
+        st.code("""
+# Ważność cech dla XGBoost
+feature_importance_xgb = pd.DataFrame({'Feature': feature_names, 'Importance': xgb_model.feature_importances_})
+top_xgb = feature_importance_xgb.sort_values(by='Importance', ascending=False).head(12)
+
+# Wizualizacja ważności cech
+fig, ax = plt.subplots(figsize=(10, 8))
+ax.barh(top_xgb['Feature'], top_xgb['Importance'], color='blue')
+ax.set_xlabel('Ważność cechy')
+ax.set_ylabel('Cecha')
+ax.set_title('Ważność cech (XGBoost) - 12 najważniejszych')
+ax.invert_yaxis()
+ax.grid(axis='x', linestyle='--', alpha=0.7)
+plt.tight_layout()
+plt.show()
+        """, language="python")
+        top_features = frame(results['feature_importance'])['Cecha'].head(3)
+        st.markdown(f"- **Wynik**: Najważniejsze cechy to m.in. {', '.join(f'`{feature}`' for feature in top_features)}.")
+
+    # --- Podsekcja 11: Analiza chi-kwadrat dla kluczowych cech ---
+    with st.expander("11. Analiza chi-kwadrat dla kluczowych cech"):
+        st.markdown("""
+        - **Opis**: Przeprowadzono testy chi-kwadrat dla kluczowych cech w odniesieniu do `is_rural_accident`, obliczając 
+        współczynnik V Craméra.
+        - **Kod**:
+        """)
+        st.code("""
+# Lista kluczowych zmiennych
+key_features = [
+    'is_urban_driver', 'road_type', 'junction_control', 'junction_detail',
+    'important_driver_distance', 'light_conditions', 'casualty_type', 'skidding_and_overturning'
+]
+
+# Opis zmiennych dla czytelności
+variable_names = {
+    'is_urban_driver': 'Pochodzenie kierowcy',
+    'road_type': 'Typ drogi',
+    'junction_control': 'Kontrola skrzyżowania',
+    'junction_detail': 'Szczegóły skrzyżowania',
+    'important_driver_distance': 'Odległość od miejsca zamieszkania',
+    'light_conditions': 'Warunki oświetleniowe',
+    'casualty_type': 'Typ poszkodowanego',
+    'skidding_and_overturning': 'Poślizg i wywrócenie'
+}
+
+# Testy chi-kwadrat wszystkich cech naraz (wypadki.association): tabele kontyngencji z jednego np.bincount,
+# kategorie łączone jak wcześniej (np. road_type: 3, 6, pozostałe -> 99), cechy bez danych dostają NaN
+from wypadki.association import association_with_target
+
+association, contingency_tables = association_with_target(data, key_features)
+results = [{
+    'Zmienna': row.feature,
+    'Statystyka χ²': row.statistic,
+    'p-value': row.p_value,
+    'V Craméra': row.cramer_v,
+    'Siła związku': row.strength,
+} for row in association.itertuples()]
+
+# Tworzenie DataFrame z wynikami
+summary_df = pd.DataFrame(results)
+summary_df['Zmienna'] = summary_df['Zmienna'].map(lambda x: f"`{x}` ({variable_names[x]})")
+summary_df = summary_df.sort_values(by='V Craméra', ascending=False)
+        """, language="python")
+        strongest = results['chi2_features'][0]
+        st.markdown(f"- **Wynik**: Najsilniejszy związek: `{strongest['feature']}` (V Craméra {fmt(strongest['cramer_v'], '.3f')}).")
+
+    # --- Podsekcja 12: Krzywa ROC i krzywa uczenia ---
+    with st.expander("12. Krzywa ROC i krzywa uczenia"):
+        st.markdown("""
+        - **Opis**: Stworzono krzywą ROC dla modelu XGBoost oraz krzywą uczenia, aby ocenić wydajność modelu.
+        - **Kod**:
+        """)
+        st.code("""
+# Krzywa ROC dla XGBoost
+plt.figure(figsize=(10, 6))
+fpr_xgb, tpr_xgb, _ = roc_curve(y_test, xgb_model.predict_proba(X_test)[:, 1])
+auc_xgb = roc_auc_score(y_test, xgb_model.predict_proba(X_test)[:, 1])
+plt.plot(fpr_xgb, tpr_xgb, label=f'XGBoost (AUC = {auc_xgb:.4f})', color='blue')
+plt.plot([0, 1], [0, 1], 'k--', label='Losowy klasyfikator (AUC = 0.5)')
+plt.xlabel('False Positive Rate (FPR)')
+plt.ylabel('True Positive Rate (TPR)')
+plt.title('Krzywa ROC (zbiór testowy)')
+plt.legend(loc='best')
+plt.grid()
+plt.show()
+
+# Krzywa uczenia dla XGBoost
+plt.figure(figsize=(12, 8))
+# Równolegle, z zapisem wyników cząstkowych; krzywa zapisywana do wyniki/learning_curve_xgb_hist.json
+from wypadki.learning_curve import compute_learning_curve
+
+curve_xgb = compute_learning_curve(
+    'xgb_hist', X_train, y_train, model_params=model_params['xgb'], train_sizes=np.linspace(0.1, 1.0, 10),
+    n_splits=5, scoring='f1', n_jobs=-1, fit_params={'eval_set': (X_val, y_val), 'ref': xgb_reference}
+)
+train_sizes_xgb = np.array(curve_xgb['train_sizes'])
+train_scores_mean_xgb = np.array(curve_xgb['train_mean'], dtype=float)
+train_scores_std_xgb = np.array(curve_xgb['train_std'], dtype=float)
+val_scores_mean_xgb = np.array(curve_xgb['val_mean'], dtype=float)
+
+plt.plot(train_sizes_xgb, train_scores_mean_xgb, label='F1-score XGBoost (trening)', color='blue')
+plt.fill_between(train_sizes_xgb, train_scores_mean_xgb - train_scores_std_xgb, train_scores_mean_xgb + train_scores_std_xgb, alpha=0.1, color='blue')
+plt.plot(train_sizes_xgb, val_scores_mean_xgb, label='F1-score XGBoost (walidacja)', color='cyan')
+plt.xlabel('Rozmiar zbioru treningowego')
+plt.ylabel('F1-score')
+plt.title('Krzywa uczenia (F1-score) - XGBoost')
+plt.legend(loc='best')
+plt.grid()
+plt.show()
+        """, language="python")
+        st.markdown(f"- **Wynik**: AUC-ROC XGBoost: {fmt(results['models']['test']['xgb']['auc'])}. Krzywa uczenia pokazuje stabilność modelu przy większych zbiorach danych.")
+    with st.expander("13. Eksport pakietu wyników"):
+        st.code("""
+# Tabele, krzywe i metryki prezentowane w aplikacji zapisywane są w jednym wersjonowanym pliku
+# wyniki/bundle_<lata>.json, razem z wcześniej zapisanymi wynikami (cv_metrics, learning_curve_<model>)
+from wypadki.evaluation import save_predictions
+from wypadki.models import RF_PARAMS, XGB_PARAMS
+from wypadki.results import export_bundle, table
+
+driver_table = pd.crosstab(data['is_urban_driver'], data['is_rural_accident'])
+chi2_driver, p_driver, dof_driver, expected_driver = chi2_contingency(driver_table)
+drivers_export = {
+    'total_accidents': len(data),
+    'contingency': table(pd.DataFrame(driver_table.values, index=drivers_index,
+                                      columns=['Wypadek obszar Miejski', 'Wypadek obszar Wiejski'])),
+    # ... proporcje kierowców, rozkład wg lat, procenty, tabela oczekiwana, wynik testu (φ, wniosek)
+}
+
+models_export = {'params': {'xgb': {**XGB_PARAMS, **model_params['xgb']}, 'rf': {**RF_PARAMS, **model_params['rf']}}}
+for split, (y_true, probas) in predictions.items():
+    models_export[split] = {
+        name: {'auc': float(roc_auc_score(y_true, proba)), 'report': classification_report(y_true, (proba >= 0.5).astype(int))}
+        for name, proba in probas.items()
+    }
+
+# ... testy chi-kwadrat kluczowych cech (chi2_export)
+
+# Predykcje zbioru testowego (float16 + etykiety) - krzywe ROC/PR i macierz pomyłek liczone w aplikacji
+predictions_path = save_predictions(y_test, predictions['test'][1])
+
+bundle_path = export_bundle({
+    'drivers': drivers_export,
+    'models': models_export,
+    'feature_importance': table(top_xgb.rename(columns={'Feature': 'Cecha', 'Importance': 'Ważność'}).reset_index(drop=True)),
+    'chi2_features': chi2_export,
+})
+        """, language="python")
+        st.markdown("- **Wynik**: pliki `wyniki/bundle_2021-2023.json` i `wyniki/predictions_2021-2023.npz` wczytywane przez aplikację (wybór wersji w pasku bocznym, gdy zapisano kilka pakietów).")
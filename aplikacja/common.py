@@ -0,0 +1,65 @@
+# Wyniki analizy (wyniki/bundle_<wersja>.json eksportowany przez notebook) wspólne dla wszystkich sekcji.
+import math
+
+import streamlit as st
+
+from wypadki.results import load_bundle
+
+
+@st.cache_data
+def get_bundle(version):
+    # Pakiet wczytywany raz na wersję i współdzielony przez wszystkie sekcje i sesje
+    return load_bundle(version)
+
+
+def year_range(years):
+    """Zakres lat do nagłówków i komentarzy, np. '2021–2023' (lata rosnąco, np. kolumna 'Rok' tabeli driver_stats)."""
+    years = list(years)
+    return f'{years[0]}–{years[-1]}' if len(years) > 1 else f'{years[0]}'
+
+
+def bundle_years(version):
+    """Zakres lat danych pakietu wyników - wersja pakietu to '<rok od>-<rok do>' (wypadki.results.BUNDLE_VERSION)."""
+    return year_range(get_bundle(version)['version'].split('-'))
+
+
+def model_version(version):
+    """Wersja pakietu, z której pochodzą sekcje modeli (inna niż `version`, gdy przeniósł je wypadki.yearly --export)."""
+    return get_bundle(version)['sections'].get('model_version', version)
+
+
+def model_version_note(version):
+    # Informacja w sekcjach z wynikami modeli, gdy modele nie były uczone na danych tego pakietu
+    if model_version(version) != version:
+        st.info(f"Wyniki modeli pochodzą z pakietu {model_version(version)} - modele nie były uczone "
+                f"na danych z lat {bundle_years(version)}.")
+
+
+def fmt(value, spec='.4f', missing='b.d.'):
+    """Liczba z pakietu wyników sformatowana wg `spec`; brak wartości (None/NaN w JSON) -> `missing`."""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return missing
+    return format(value, spec)
+
+
+def p_label(p_value, alpha=0.001):
+    """Wartość p w komentarzach: 'p < 0.001' dla bardzo małych wartości, inaczej dokładna wartość."""
+    if p_value is None:
+        return 'p = b.d.'
+    return f'p < {alpha:g}' if p_value < alpha else f'p = {p_value:.3f}'
+
+
+def class_scores(report, label='1'):
+    """Precision, recall i F1-score klasy `label` z tekstu classification_report (sklearn) zapisanego w pakiecie."""
+    for line in report.splitlines():
+        parts = line.split()
+        if parts[:1] == [label]:
+            precision, recall, f1 = (float(v) for v in parts[1:4])
+            return {'precision': precision, 'recall': recall, 'f1': f1}
+    return {'precision': None, 'recall': None, 'f1': None}
+
+
+def curve_range(curve, key):
+    """Pierwsza i ostatnia zapisana (nie-null) wartość krzywej uczenia, np. key='val_mean'; (None, None), gdy brak."""
+    values = [v for v in (curve or {}).get(key) or [] if v is not None]
+    return (values[0], values[-1]) if values else (None, None)
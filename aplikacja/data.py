@@ -0,0 +1,91 @@
+# Sekcja II: źródła danych, opis zmiennych i przygotowania danych.
+import streamlit as st
+
+from aplikacja.common import bundle_years, get_bundle
+
+
+def render(version):
+    split_sizes = get_bundle(version)['sections']['models'].get('split_sizes')
+    st.title("II. Dane i metodyka")
+
+    st.header("1. Źródła danych")
+    st.markdown(f"""
+    - Dane pochodzą z oficjalnych brytyjskich baz danych (Department for Transport - data.gov.uk) dotyczących wypadków drogowych z lat {bundle_years(version)} na terenie UK.
+    - Tabele (`casualties`, `vehicles`, `accidents`) zawierające dane m.in. o ofiarach (wiek, miejsce zamieszkania), informacje o pojazdach i kierowcach (np. obszar zamieszkania, odległość od miejsca wypadku) oraz kontekst wypadków (warunki pogodowe, typ drogi) zostały połączone w tabelę `data`: poszkodowani z wypadkami po kluczu `accident_index`, a z pojazdem (i jego kierowcą), którym podróżowali, po kluczu (`accident_index`, `vehicle_reference`) - jeden wiersz na poszkodowanego, bez łączenia z każdym pojazdem biorącym udział w wypadku.
+    - Statystyki dotyczą wyłącznie wypadków z obrażeniami ciała na drogach publicznych, które są zgłaszane policji, a następnie rejestrowane przy użyciu formularza zgłaszania kolizji `STATS19`.
+    - **Przewodnik** po statystykach dotyczących wypadków drogowych: [link](https://www.gov.uk/guidance/road-accident-and-safety-statistics-guidance)
+    - **Zestawy danych** do pobrania: [link](https://www.data.gov.uk/dataset/cb7ae6f0-4be6-4935-9277-47e5ce24a11f/road-accidents-safety-data)
+    - Poniższa analiza została udostępnione na platformie `streamlit.io`, a jej dane zostały wygenerowane za pomocą wartości statycznych wykonanych przez program Python oraz jego wersje bibliotek:
+        - **NumPy**: 1.26.4  
+        - **Pandas**: 2.2.3  
+        - **Matplotlib**: 3.9.2  
+        - **Plotly**: 5.24.1  
+        - **Scikit-learn**: 1.5.1  
+        - **Tabulate**: 0.9.0  
+        - **Imbalanced-learn (SMOTE)**: 0.12.3  
+        - **XGBoost**: 2.1.4  
+        - **SciPy**: 1.13.1
+    """)
+
+    st.header("2. Opis użytych zmiennych")
+    st.markdown("""
+    W analizie wykorzystano następujące zmienne, które opisują okoliczności wypadków drogowych, charakterystyki kierowców, pojazdów oraz poszkodowanych:
+    - `road_type` – Rodzaj drogi, na której doszło do wypadku. Kategorie obejmują: rondo (1), ulica jednokierunkowa (2), droga dwujezdniowa (3), droga jednojezdniowa (6), droga dojazdowa (7), nieznana (9), ulica jednokierunkowa/droga dojazdowa (12) lub brak danych (-1).
+    - `light_conditions` – Warunki oświetlenia w czasie wypadku. Kategorie: światło dzienne (1), ciemność z działającym oświetleniem (4), ciemność z niedziałającym oświetleniem (5), ciemność bez oświetlenia (6), ciemność z nieznanym stanem oświetlenia (7) lub brak danych (-1).
+    - `junction_detail` – Szczegóły dotyczące skrzyżowania w miejscu wypadku. Obejmuje: brak skrzyżowania w promieniu 20 metrów (0), rondo (1), mini-rondo (2), skrzyżowanie typu T lub rozwidlenie (3), droga dojazdowa (5), skrzyżowanie czteroramienne (6), skrzyżowanie z więcej niż 4 ramionami (7), prywatny wjazd (8), inne skrzyżowanie (9), nieznane (99) lub brak danych (-1).
+    - `junction_control` – Rodzaj kontroli ruchu na skrzyżowaniu. Kategorie: brak skrzyżowania w promieniu 20 metrów (0), osoba upoważniona (1), sygnalizacja świetlna (2), znak stopu (3), ustąp pierwszeństwa lub brak kontroli (4), nieznane (9) lub brak danych (-1).
+    - `driver_home_area_type` – Typ obszaru zamieszkania kierowcy. Obejmuje: obszar miejski (1), małe miasto (2), obszar wiejski (3) lub brak danych (-1).
+    - `accident_year` – Rok, w którym doszło do wypadku.
+    - `age_of_casualty` – Wiek osoby poszkodowanej w wypadku. Wartość -1 oznacza brak danych.
+    - `driver_distance_banding` – Odległość miejsca wypadku od miejsca zamieszkania kierowcy. Kategorie: do 5 km (1), 5,001–10 km (2), 10,001–20 km (3), 20,001–100 km (4), powyżej 100 km (5) lub brak danych (-1).
+    - `weather_conditions` – Warunki pogodowe w czasie wypadku. Kategorie: dobra pogoda bez silnego wiatru (1), deszcz bez silnego wiatru (2), śnieg bez silnego wiatru (3), dobra pogoda z silnym wiatrem (4), deszcz z silnym wiatrem (5), śnieg z silnym wiatrem (6), mgła (7), inne (8), nieznane (9) lub brak danych (-1).
+    - `urban_or_rural_area` – Typ obszaru, w którym doszło do wypadku: miejski (1), wiejski (2), nieprzypisany (3) lub brak danych (-1).
+    - `casualty_type` – Typ poszkodowanego w wypadku, np.: pieszy (0), rowerzysta (1), motocyklista (2–5, 23, 97, 103–106), pasażer
+    taksówki (8), pasażer samochodu (9), pasażer busa (10–11), jeździec konny (16), inne typy pojazdów (17–21, 90, 98–99, 108–110, 113) lub brak danych (-1).
+    - `speed_limit` – Ograniczenie prędkości na drodze w miejscu wypadku. Wartości w milach na godzinę, np. 30, 60; 99 oznacza nieznane (zgłoszone przez uczestnika), a -1 brak danych.
+    - `driver_imd_decile` – Poziom deprywacji społeczno-ekonomicznej kierowcy według indeksu IMD (ang. Index of Multiple Deprivation). Skala od 1 (najbardziej deprywowany 10%) do 10 (najmniej deprywowany 10%) lub brak danych (-1).
+    - `age_of_vehicle` – Wiek pojazdu w latach w momencie wypadku. Wartość -1 oznacza brak danych.
+    - `age_of_driver` – Wiek kierowcy w momencie wypadku. Wartość -1 oznacza brak danych.
+    - `number_of_casualties` – Liczba osób poszkodowanych w wyniku wypadku.
+    - `skidding_and_overturning` – Informacja o poślizgu lub przewróceniu pojazdu. Kategorie: brak (0), poślizg (1), poślizg i przewrócenie (2), wyłamanie (3), wyłamanie i przewrócenie (4), przewrócenie (5), nieznane (9) lub brak danych (-1).
+    """)
+
+    st.header("3. Opis przygotowania danych")
+    if split_sizes:
+        sizes = (f"        * Zbiór treningowy: {split_sizes['train']:,} rekordów (po balansowaniu {split_sizes['balancing']}: "
+                 f"{split_sizes['train_balanced']:,}) / Zbiór walidacyjny: {split_sizes['validation']:,} rekordów / "
+                 f"Zbiór testowy: {split_sizes['test']:,} rekordów.")
+    else:
+        sizes = "        * Rozmiary zbiorów nie zostały zapisane w pakiecie wyników tej wersji."
+    st.markdown(f"""
+    W oryginalnej analizie przeprowadzono następujące kroki przygotowania danych (nie są one wykonywane w tej statycznej wersji):
+    -  **Oczyszczono dane:** Zastąpiono `-1` i `99` na `NaN`, a następnie usunięto wiersze z brakami w tych kolumnach.
+    -  **Podział danych: Dane podzielono na zbiory:**
+        * Treningowy + walidacyjny (80%) i testowy (20%) z zachowaniem stratyfikacji.
+        * Następnie zbiór treningowy + walidacyjny podzielono na treningowy (60% całości) i walidacyjny (20% całości), również ze stratyfikacją.
+    -  **Potok przygotowania danych** (`wypadki.preprocessing.PreprocessingPipeline`) dopasowano **wyłącznie na zbiorze treningowym** - parametry skalowania prędkości i słownik kolumn zero-jedynkowych nie korzystają ze zbiorów walidacyjnego i testowego - a następnie zastosowano bez zmian do wszystkich trzech zbiorów:
+    -  **Przekształcono czas:** Z kolumny `time` utworzono `hour_of_day`; wiersze z błędnym zapisem godziny (poza formatem HH:MM) są usuwane przy czyszczeniu.
+    -  **Przygotowanie zmiennej docelowej:** dla `driver_home_area_type` zsumowano wartości 2 i 3 (small town oraz unrual) w jedną etykietę nr 2 dla przejrzystości danych
+    -  **Tworzenie zmiennych binarnych:**
+         - is_urban_driver: Kierowca pochodzi z obszaru miejskiego (`driver_home_area_type` = 1).
+         - is_rural_accident: Wypadek miał miejsce na terenie wiejskim (`urban_or_rural_area` = 2).
+    -  **Znormalizowano prędkość:** `speed_limit` przekształcono w `speed_limit_normalized` (średnia i odchylenie standardowe ze zbioru treningowego).
+    -  **Zbindowano wiek:** `age_of_casualty` i `age_of_driver` przekształcono w `age_of_casualty_binned` i `age_of_driver_binned`.
+         - Zarówno age_of_casualty jak i age_of_driver podzielono na 5 przedziałów:
+         - ≤17 lat, 18-25 lat, 26-40 lat, 41-60 lat, >60 lat.
+    -  **Stworzono nowe cechy:**
+        * `urban_driver_speed` jako iloczyn `is_urban_driver` i `speed_limit_normalized`.
+        * `is_rush_hour` na podstawie `hour_of_day`.
+        * `distance_speed_interaction` jako iloczyn `driver_distance_banding` i `urban_driver_speed`.
+        * `important_driver_distance`: `driver_distance_banding` równe 3 lub 4 (odpowiednik `driver_distance_banding_3` lub `driver_distance_banding_4` po kodowaniu).
+        * `urban_driver_long_distance` jako iloczyn `is_urban_driver` i `important_driver_distance`.
+        * `urban_driver_no_junction_control` jako iloczyn `is_urban_driver` i `junction_control` = 4 (odpowiednik `junction_control_4`).
+    -  **Wybrano cechy:** Ustalono listę `selected_features`, która teraz zawiera również `casualty_type`.
+    -  **Zakodowano kategorie:** Zmienne kategorialne z `selected_features` (w tym nowa kolumna `casualty_type` oraz `road_type`, `light_conditions`, `junction_detail`, `junction_control`, `age_of_casualty_binned`, `driver_distance_banding`, `weather_conditions`, `age_of_driver_binned`, `skidding_and_overturning`) zakodowano zero-jedynkowo (`drop_first`), z nazwami kolumn `<zmienna>_<kod>`, np. `junction_control_4`, `light_conditions_6`.
+    -  **Balansowanie danych:**
+        * Zastosowano SMOTE na zbiorze treningowym, aby zrównoważyć klasy zmiennej docelowej `is_rural_accident`; zbiory walidacyjny i testowy pozostały niezbalansowane.
+    -  **Rozmiary zbiorów danych po przetworzeniu:**
+{sizes}
+                
+    Celem było przygotowanie danych (X) i zmiennej docelowej (y, czyli `is_rural_accident`) do modelowania poprzez oczyszczenie, transformację i stworzenie nowych cech, uwzględniając teraz również typ uczestnika wypadku (`casualty_type`).
+""")
@@ -0,0 +1,236 @@
+# Sekcja III: związek miejsca zamieszkania kierowcy z lokalizacją wypadku (tabele, wykresy, test chi-kwadrat).
+import streamlit as st
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from aplikacja.common import bundle_years, fmt, get_bundle, p_label, year_range
+from wypadki.cube import FILTER_DIMENSIONS, OlapCube, drivers_section, value_label
+from wypadki.results import frame
+
+
+@st.cache_resource
+def get_cube(version):
+    # Kostka OLAP (wyniki/cube_<wersja>.npz) wczytywana raz na wersję; None, gdy jej nie zapisano
+    return OlapCube.load(version)
+
+
+def drivers_view(version, filters=()):
+    # filters: krotka par (wymiar, wybrane kody); bez filtrów - wyniki z pakietu, z filtrami - przeliczenie kostki
+    if not filters:
+        return get_bundle(version)['sections']['drivers']
+    return drivers_section(get_cube(version).select(dict(filters)))
+
+
+def live_filters(version):
+    cube = get_cube(version)
+    if cube is None or not st.toggle("Filtrowanie na żywo", help="Tabele, wykresy i test chi-kwadrat liczone z kostki liczności (wyniki/cube_<wersja>.npz) dla wybranych wartości filtrów."):
+        return ()
+    filters = []
+    for column, (name, label) in zip(st.columns(len(FILTER_DIMENSIONS)), FILTER_DIMENSIONS.items()):
+        selected = column.multiselect(label, cube.values[name].tolist(), placeholder="Wszystkie",
+                                      format_func=lambda value, name=name: value_label(name, value))
+        if selected:
+            filters.append((name, tuple(selected)))
+    return tuple(filters)
+
+
+ORIGIN_COLORS = {'kier. Wiejski': '#ff7f0e', 'kier. Miejski': '#1f77b4'}
+AREA_COLORS = {'Wypadki obszar Miejski': '#1f77b4', 'Wypadki obszar Wiejski': '#ff7f0e'}
+
+
+def drivers_plot(drivers):
+    """Wykresy tabel 1 i 2 (Plotly) z sekcji kierowców - pakietu wyników lub przefiltrowanej kostki."""
+    total_accidents = drivers['total_accidents']
+    driver_origin_display = frame(drivers['driver_origin']).set_index('Pochodzenie')
+    driver_stats_display = frame(drivers['driver_stats'])
+    years = driver_stats_display['Rok'].astype(str)
+
+    fig_plotly = make_subplots(rows=2, cols=2, specs=[[{}, {}], [{'colspan': 2}, None]], row_heights=[1, 1.2],
+                               vertical_spacing=0.15, subplot_titles=(
+                                   'Całkowita liczba analizowanych wypadków',
+                                   'Proporcje kierowców wg miejsca zamieszkania',
+                                   'Rozkład kierowców wg miejsca zamieszkania w latach'))
+
+    # Wykres 1: Całkowita liczba wypadków
+    fig_plotly.add_trace(go.Bar(x=['Wszystkie wypadki'], y=[total_accidents], marker_color='#93c47d', showlegend=False,
+                                text=[f'{int(total_accidents):,} (100%)'], textposition='inside'), row=1, col=1)
+
+    # Wykres 2: Proporcje kierowców - słupek skumulowany (wspólna grupa słupków, kolejne segmenty od `base`)
+    bottom_val = 0
+    for origin_type in ORIGIN_COLORS:
+        if origin_type in driver_origin_display.index:
+            value = driver_origin_display.loc[origin_type, 'Liczba']
+            percentage = driver_origin_display.loc[origin_type, 'Procent']
+            fig_plotly.add_trace(go.Bar(x=['Kierowcy'], y=[value], base=[bottom_val], offsetgroup='origin',
+                                        name=origin_type, legendgroup=origin_type, marker_color=ORIGIN_COLORS[origin_type],
+                                        text=[f'{int(value):,}<br>({percentage:.1f}%)'], textposition='inside',
+                                        insidetextfont_color='white'), row=1, col=2)
+            bottom_val += value
+
+    # Wykres 3: Rozkład kierowców według lat
+    for origin_type, color in ORIGIN_COLORS.items():
+        counts = driver_stats_display[origin_type]
+        fig_plotly.add_trace(go.Bar(x=years, y=counts, name=origin_type, legendgroup=origin_type, showlegend=False,
+                                    marker_color=color, text=[f'{int(count):,}' for count in counts],
+                                    textposition='outside'), row=2, col=1)
+
+    fig_plotly.update_yaxes(title_text='Liczba', row=1, col=1)
+    fig_plotly.update_yaxes(title_text='Liczba kierowców', range=[0, total_accidents * 1.1], row=1, col=2)
+    fig_plotly.update_yaxes(title_text='Liczba kierowców', row=2, col=1)
+    fig_plotly.update_xaxes(title_text='Rok', type='category', row=2, col=1)
+    fig_plotly.update_layout(
+        title_text=f"Analiza kierowców w wypadkach drogowych ({year_range(driver_stats_display['Rok'])})",
+        barmode='group', height=800, legend=dict(orientation='h', yanchor='top', y=-0.08, xanchor='center', x=0.5))
+    return fig_plotly
+
+
+def location_plot(drivers):
+    """Wykres tabeli 3 (Plotly): procent wypadków miejskich i wiejskich wg miejsca zamieszkania kierowcy."""
+    location_stats = frame(drivers['location_stats'])
+    fig_plotly = go.Figure([
+        go.Bar(x=location_stats.index, y=location_stats[f'{area} (%)'], name=area, marker_color=color,
+               text=location_stats[f'{area} (%)'], texttemplate='%{text:.1f}%', textposition='outside')
+        for area, color in AREA_COLORS.items()
+    ])
+    fig_plotly.update_layout(title_text='Procentowy udział wypadków Miejskich i Wiejskich wg Miejsca Zamieszkania Kierowcy',
+                             barmode='group', yaxis_ticksuffix='%', yaxis_title='Procent Wypadków (%)',
+                             xaxis_title='Pochodzenie Kierowcy', legend_title_text='Lokalizacja Wypadku')
+    return fig_plotly
+
+
+# Wykresy przechowywane osobno dla każdego klucza (wersja, filtry): ponowny wybór tych samych filtrów nie buduje ich od nowa
+@st.cache_data
+def drivers_figure(version, filters=()):
+    return drivers_plot(drivers_view(version, filters))
+
+
+@st.cache_data
+def location_figure(version, filters=()):
+    return location_plot(drivers_view(version, filters))
+
+
+def render(version):
+    st.title("III. CZ.1 Analiza i wyniki związku między miejscem zamieszkania kierowcy (wiejskim lub miejskim), a prawdopodobieństwem jego udziału w wypadku drogowym.")
+
+    # --- Dane z pakietu wyników lub z kostki przefiltrowanej w trybie na żywo ---
+    filters = live_filters(version)
+    drivers = drivers_view(version, filters)
+    if drivers['total_accidents'] == 0:
+        st.warning("Brak wypadków spełniających wybrane filtry.")
+        return
+    if filters:
+        st.caption(f"Przefiltrowano: {drivers['total_accidents']:,} poszkodowanych. Komentarze poniżej opisują pełny zbiór danych.")
+
+    # Komentarze opisują pełny zbiór danych (pakiet wyników), niezależnie od filtrów
+    full = drivers_view(version)
+    origin_share = frame(full['driver_origin']).set_index('Pochodzenie')['Procent']
+    rural_share_by_year = frame(full['driver_stats']).set_index('Rok')['kier. Wiejskich (%)']
+    shares = frame(full['location_stats'])
+    rural_rural, rural_urban = shares.loc['kier. Wiejski', 'Wypadki obszar Wiejski (%)'], shares.loc['kier. Wiejski', 'Wypadki obszar Miejski (%)']
+    urban_urban, urban_rural = shares.loc['kier. Miejski', 'Wypadki obszar Miejski (%)'], shares.loc['kier. Miejski', 'Wypadki obszar Wiejski (%)']
+
+    # Tabela 1: Proporcje kierowców
+    driver_origin_display = frame(drivers['driver_origin'])
+
+    # Tabela 2: Rozkład wg lat
+    driver_stats_display = frame(drivers['driver_stats'])
+
+    # --- Wyświetlanie w Streamlit ---
+    st.subheader("Tabela 1: Proporcje kierowców według miejsca zamieszkania")
+    st.dataframe(driver_origin_display.style.format({'Liczba': '{:,.0f}', 'Procent': '{:.1f}%'}))
+    st.markdown(f"""
+    **Komentarz:** Kierowcy z obszarów miejskich dominują w ogólnej liczbie wypadków ({fmt(origin_share.get('kier. Miejski'), '.1f')}%), co może odzwierciedlać większą populację miejską lub częstsze korzystanie z dróg.
+    """)
+
+    st.subheader(f"Tabela 2: Rozkład kierowców według miejsca zamieszkania w latach {year_range(driver_stats_display['Rok'])}")
+    st.dataframe(driver_stats_display.style.format({
+        'kier. Wiejski': '{:,.0f}', 'kier. Wiejskich (%)': '{:.1f}%',
+        'kier. Miejski': '{:,.0f}', 'kier. Miejskich (%)': '{:.1f}%',
+        'Suma': '{:,.0f}'
+    }))
+    st.markdown(f"""
+    **Komentarz:** Proporcje pozostają stosunkowo stałe w latach {rural_share_by_year.index[0]}-{rural_share_by_year.index[-1]}; udział kierowców wiejskich wynosi od {fmt(rural_share_by_year.min(), '.1f')}% do {fmt(rural_share_by_year.max(), '.1f')}% ({fmt(rural_share_by_year.iloc[-1], '.1f')}% w {rural_share_by_year.index[-1]} roku), co sugeruje stabilność trendów w czasie.
+    """)
+
+    st.subheader("Wykresy tabel 1 i 2")
+
+    st.plotly_chart(drivers_figure(version, filters), use_container_width=True)
+
+    # --- Dane z pakietu wyników ---
+    contingency_table = frame(drivers['contingency'])
+    location_stats = frame(drivers['location_stats'])
+    expected_df = frame(drivers['expected'])
+
+    chi2_stat = drivers['chi2']['statistic']
+    p_value_chi2 = drivers['chi2']['p_value']
+    dof_chi2 = drivers['chi2']['dof']
+    phi_stat = drivers['chi2']['phi']
+    strength = drivers['chi2']['strength']
+    conclusion = drivers['chi2']['conclusion']
+    alpha = drivers['chi2']['alpha']
+
+    # --- Wyświetlanie w Streamlit ---
+    st.subheader("Tabela 3: Procent uczestników wypadków wg miejsca zamieszkania i lokalizacji")
+    st.dataframe(location_stats.style.format("{:.1f}%"))
+
+    # --- Odtworzenie Wykresu Plotly ---
+    st.subheader("Wykres tabeli nr 3")
+    fig_plotly = location_figure(version, filters)
+    st.plotly_chart(fig_plotly, use_container_width=True)
+
+    st.subheader("Test chi-kwadrat dla niezależności")
+    st.markdown(f"""
+    Aby ocenić, czy istnieje statystycznie istotny związek między miejscem zamieszkania kierowcy a lokalizacją wypadku, przeprowadzono **test chi-kwadrat**.  
+    - **Hipoteza zerowa (H₀):** Nie ma związku między pochodzeniem kierowcy a lokalizacją wypadku.  
+    - **Hipoteza alternatywna (H₁):** Istnieje związek między tymi zmiennymi.  
+    """)
+    st.markdown(f"""
+    **Tabela 4 Kontyngencji (obserwowane częstości):** """)
+    st.dataframe(contingency_table.style.format("{:,.0f}"))
+
+    st.markdown(f"""
+    **Tabela 5 oczekiwana (dla H₀):** """)
+    st.dataframe(expected_df.style.format("{:,.1f}"))
+
+    st.markdown(f"""
+    **Wyniki testu statystycznego:** """)
+    st.markdown(f"""
+    - **Statystyka chi-kwadrat (χ²):** {chi2_stat:.2f}
+    - **Wartość p (p-value):** {p_value_chi2:.4e}{' (bardzo bliska 0)' if p_value_chi2 < 1e-4 else ''}
+    - **Stopnie swobody (dof):** {dof_chi2}
+    - **Współczynnik Phi (φ) = {phi_stat:.3f} → związek: {strength}
+
+    **Wniosek (poziom istotności α = {alpha}):** 
+    {conclusion}
+    """)
+
+    # --- Kluczowe obserwacje z tej sekcji ---
+    st.subheader("Kluczowe obserwacje")
+    st.markdown(f"""
+    **Kluczowe obserwacje:**
+    - **Kierowcy z obszarów wiejskich**: Znacznie częściej uczestniczą w wypadkach na terenach wiejskich ({fmt(rural_rural, '.1f')}%) niż miejskich ({fmt(rural_urban, '.1f')}%).
+    - **Kierowcy z obszarów miejskich**: Dominują w wypadkach na terenach miejskich ({fmt(urban_urban, '.1f')}%), a rzadziej uczestniczą w wypadkach na terenach wiejskich ({fmt(urban_rural, '.1f')}%).
+
+    **Wyniki testu chi-kwadrat:**
+    - Test chi-kwadrat (χ² = {fmt(full['chi2']['statistic'], ',.1f')}, {p_label(full['chi2']['p_value'])}) wykazał wartość **{p_label(full['chi2']['p_value'])}**, która wskazuje na **odrzucenie hipotezy zerowej (H₀)**, co potwierdza statystycznie istotny związek między miejscem zamieszkania kierowcy a lokalizacją wypadku. Oznacza to, że korelacja (zależność) między miejscem zamieszkania, a lokalizacją wypadku jest nieprzypadkowa i może być generalizowana na szerszą populację.
+    - Siła tej korelacji (związku/zależności), mierzona współczynnikiem Phi, osiągneła wartość (φ ≈ {fmt(full['chi2']['phi'], '.3f')}), co sugeruje siłę związku: **{full['chi2']['strength']}**. Oznacza to, że zmienna miejsca zamieszkania jest ważna, jednak inne czynniki (zmienne) (np. warunki drogowe, doświadczenie kierowcy) mogą również wpływać na wyniki.
+
+    **Wiarygodność wyników:**  
+    - Duża próba (N = {fmt(full['total_accidents'], ',')}) zwiększa wiarygodność wyników, choć siła związku (φ = {fmt(full['chi2']['phi'], '.3f')}) sugeruje potrzebę uwzględnienia dodatkowych czynników w dalszych analizach.
+    """)
+
+    # --- Wnioski końcowe ---
+    st.subheader("Wnioski końcowe")
+    st.markdown(f"""
+    1.1. **Cel pracy:** Zbadanie, czy istnieje związek między miejscem zamieszkania kierowcy (miejskim lub wiejskim), a prawdopodobieństwem jego udziału w wypadku drogowym.    
+    1.2. **Pytanie badawcze:** Czy miejsce zamieszkania kierowcy (miejskie vs. wiejskie) wpływa na prawdopodobieństwo udziału w wypadku drogowym?     
+    1.3. **Hipoteza badawcza:** Kierowcy miejscy są bardziej narażeni na wypadki na terenach wiejskich niż kierowcy wiejscy.
+                
+    **Na podstawie danych z brytyjskich baz wypadków drogowych z lat {bundle_years(version)} stwierdzono:**
+                
+    **1.1. i 1.2. Odpowiedź:**  
+    - Analiza potwierdziła istotny związek. Kierowcy mają tendencję do uczestniczenia w wypadkach w środowisku zgodnym z miejscem zamieszkania — kierowcy miejscy częściej ulegają wypadkom na obszarach miejskich, a kierowcy z obszarów wiejskich na terenach wiejskich. Szczególnie wyraźnie widać to w przypadku kierowców wiejskich, którzy {fmt(rural_rural / urban_rural, '.1f')} razy częściej uczestniczą w wypadkach na obszarach wiejskich ({fmt(rural_rural, '.1f')}%) niż kierowcy miejscy ({fmt(urban_rural, '.1f')}%).
+
+    **1.3. Odpowiedź:**  
+    - Wyniki nie potwierdzają hipotezy, że kierowcy z obszarów miejskich są bardziej narażeni na wypadki na terenach wiejskich. Przeciwnie, kierowcy z obszarów wiejskich dominują w tej kategorii w swoich grupach.
+    """)
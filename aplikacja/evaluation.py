@@ -0,0 +1,209 @@
+# Sekcja VII: krzywe ROC i precision-recall, macierz pomyłek dla wybranego progu, walidacja krzyżowa i krzywa uczenia.
+import streamlit as st
+import pandas as pd
+import numpy as np
+import matplotlib.pyplot as plt
+import plotly.graph_objects as go
+
+from aplikacja.common import curve_range, fmt, get_bundle, model_version, model_version_note
+from aplikacja.figures import figure_png
+from wypadki.evaluation import ThresholdIndex, decimate, load_predictions
+
+
+@st.cache_resource
+def get_threshold_indexes(version):
+    # Predykcje zbioru testowego (wyniki/predictions_<wersja modeli>.npz) posortowane raz na wersję - potem każdy
+    # próg suwaka to wyszukiwanie binarne; None, gdy dla wersji nie zapisano predykcji
+    predictions = load_predictions(model_version(version))
+    if predictions is None:
+        return None
+    y_true, probas = predictions
+    return {name: ThresholdIndex(y_true, proba) for name, proba in probas.items()}
+
+
+@st.cache_data
+def get_curves(version):
+    # Krzywe ROC i precision-recall uproszczone do kilkuset punktów (zamiast punktu na każdy próg)
+    indexes = get_threshold_indexes(version)
+    if indexes is None:
+        return None
+    curves = {}
+    for name, index in indexes.items():
+        fpr, tpr = decimate(*index.roc())
+        recall, precision = decimate(*index.precision_recall())
+        curves[name] = {'fpr': fpr, 'tpr': tpr, 'recall': recall, 'precision': precision, 'auc': index.auc(), 'n': index.n}
+    return curves
+
+
+@st.cache_data
+def roc_figure(version):
+    # Krzywe ROC z zapisanych predykcji (gdy brak - punkty z pakietu wyników); None, gdy nie ma żadnych
+    model_labels = {'xgb': 'XGBoost', 'rf': 'Random Forest'}
+    roc = get_curves(version) or get_bundle(version)['sections'].get('evaluation', {}).get('roc')
+    if roc is None:
+        return None
+    fig_roc = go.Figure()
+    for name, label in model_labels.items():
+        fig_roc.add_trace(go.Scatter(x=roc[name]['fpr'], y=roc[name]['tpr'], mode='lines',
+                                     name=f"{label} (AUC ≈ {roc[name]['auc']:.4f})"))
+    fig_roc.add_trace(go.Scatter(x=[0, 1], y=[0, 1], mode='lines', name='Losowy Klasyfikator', line=dict(dash='dash')))
+
+    fig_roc.update_layout(
+        title='Krzywa ROC - Zbiór Testowy',
+        xaxis_title='False Positive Rate (FPR)',
+        yaxis_title='True Positive Rate (TPR)',
+        legend_title='Model',
+        xaxis=dict(range=[0.0, 1.0]),
+        yaxis=dict(range=[0.0, 1.05])
+    )
+    return fig_roc
+
+
+@st.cache_data
+def precision_recall_figure(version):
+    model_labels = {'xgb': 'XGBoost', 'rf': 'Random Forest'}
+    curves = get_curves(version)
+    fig_pr = go.Figure()
+    for name, label in model_labels.items():
+        fig_pr.add_trace(go.Scatter(x=curves[name]['recall'], y=curves[name]['precision'], mode='lines', name=label))
+    fig_pr.update_layout(
+        title='Krzywa Precision-Recall - Zbiór Testowy',
+        xaxis_title='Recall',
+        yaxis_title='Precision',
+        legend_title='Model',
+        xaxis=dict(range=[0.0, 1.0]),
+        yaxis=dict(range=[0.0, 1.05])
+    )
+    return fig_pr
+
+
+@st.cache_data
+def cv_figure(version):
+    model_labels = {'xgb': 'XGBoost', 'xgb_hist': 'XGBoost', 'rf': 'Random Forest'}
+    cv_metrics = get_bundle(version)['artifacts']['cv_metrics']
+    fig_cv = go.Figure()
+    for name, metrics in cv_metrics.items():
+        folds = [f'Podzbiór {k + 1}' for k in range(len(metrics['fold_auc']))]
+        fig_cv.add_trace(go.Bar(x=folds, y=metrics['fold_auc'],
+                                name=f"{model_labels.get(name, name)} (OOF AUC = {metrics['oof_auc']:.4f})"))
+    fig_cv.update_layout(barmode='group', yaxis_title='AUC-ROC', legend_title='Model')
+    return fig_cv
+
+
+@st.cache_data
+def learning_curve_figure(version):
+    # Krzywa z wyniki/learning_curve_<model>.json (wypadki.learning_curve, w pakiecie jako artefakt); brak wartości zapisany jako null
+    artifacts = get_bundle(version)['artifacts']
+    curve = artifacts.get('learning_curve_xgb_hist') or artifacts.get('learning_curve_xgb')
+
+    def curve_values(key):
+        values = curve.get(key)
+        return np.array([np.nan if v is None else v for v in values], dtype=float) if values else None
+
+    train_sizes = np.array(curve['train_sizes'])
+    f1_train, f1_val = curve_values('train_mean'), curve_values('val_mean')
+    std_train, std_val = curve_values('train_std'), curve_values('val_std')
+
+    valid_indices = ~np.isnan(f1_train) & ~np.isnan(f1_val)
+    train_sizes = train_sizes[valid_indices]
+    f1_train = f1_train[valid_indices]
+    f1_val = f1_val[valid_indices]
+
+    fig_learning, ax = plt.subplots(figsize=(10, 6))
+    ax.plot(train_sizes, f1_train, label='F1-score XGBoost (trening)', color='blue', marker='o')
+    ax.plot(train_sizes, f1_val, label='F1-score XGBoost (walidacja)', color='cyan', marker='o')
+    # Pasmo ± odchylenie standardowe między podzbiorami (gdy zapisane w wynikach)
+    if std_train is not None and std_val is not None:
+        std_train, std_val = std_train[valid_indices], std_val[valid_indices]
+        ax.fill_between(train_sizes, f1_train - std_train, f1_train + std_train, alpha=0.1, color='blue')
+        ax.fill_between(train_sizes, f1_val - std_val, f1_val + std_val, alpha=0.1, color='cyan')
+
+    ax.set_title('Krzywa uczenia (F1-score) - XGBoost', fontsize=14)
+    ax.set_xlabel('Rozmiar zbioru treningowego', fontsize=12)
+    ax.set_ylabel('F1-score', fontsize=12)
+    ax.legend(loc='best')
+    ax.grid(True, linestyle='--', alpha=0.7)
+    fig_learning.tight_layout()
+    return figure_png(fig_learning)
+
+
+def render(version):
+    artifacts = get_bundle(version)['artifacts']
+    st.title("VII. Szczegółowa Ocena Modeli Uczenia Maszynowego (Krzywe ROC i Uczenia się)")
+    st.markdown("Ocena przeprowadzona na zbiorach **walidacyjnym** i **testowym** (bez SMOTE). Próg decyzyjny: 0.5.")
+    model_version_note(version)
+
+    # --- Krzywe ROC z zapisanych predykcji (gdy brak - punkty z pakietu wyników) ---
+    st.subheader("Krzywe ROC (Zbiór Testowy)")
+    model_labels = {'xgb': 'XGBoost', 'rf': 'Random Forest'}
+    curves = get_curves(version)
+    fig_roc = roc_figure(version)
+    if fig_roc is None:
+        st.info("Brak krzywych ROC dla tej wersji: nie zapisano predykcji zbioru testowego ani punktów krzywych w pakiecie wyników.")
+    else:
+        st.plotly_chart(fig_roc, use_container_width=True)
+    if curves is None:
+        if fig_roc is not None:
+            st.caption("Uwaga: Krzywa ROC jest ilustracją opartą na przykładowych danych dla tej wersji statycznej.")
+    else:
+        st.caption(f"Krzywe wyznaczone z predykcji {curves['xgb']['n']:,} przypadków zbioru testowego, "
+                   f"uproszczone do {len(curves['xgb']['fpr'])} punktów (algorytm Douglasa-Peuckera).")
+
+        # --- Krzywe Precision-Recall ---
+        st.subheader("Krzywe Precision-Recall (Zbiór Testowy)")
+        fig_pr = precision_recall_figure(version)
+        st.plotly_chart(fig_pr, use_container_width=True)
+
+        # --- Macierz pomyłek dla wybranego progu ---
+        st.subheader("Macierz Pomyłek dla Wybranego Progu")
+        threshold = st.slider("Próg decyzyjny:", 0.0, 1.0, 0.5, 0.01)
+        indexes = get_threshold_indexes(version)
+        for column, (name, label) in zip(st.columns(len(model_labels)), model_labels.items()):
+            counts = indexes[name].confusion(threshold)
+            tp, fp, fn = counts['tp'], counts['fp'], counts['fn']
+            precision = tp / (tp + fp) if tp + fp else 0.0
+            recall = tp / (tp + fn) if tp + fn else 0.0
+            f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+            with column:
+                st.markdown(f"**{label}**")
+                st.dataframe(pd.DataFrame(
+                    [[counts['tn'], fp], [fn, tp]],
+                    index=['Rzeczywisty: miejski (0)', 'Rzeczywisty: wiejski (1)'],
+                    columns=['Przewidywany: miejski (0)', 'Przewidywany: wiejski (1)']
+                ).style.format("{:,.0f}"))
+                st.text(f"Precision: {precision:.4f}   Recall: {recall:.4f}   F1-score: {f1:.4f}")
+
+    # --- Stabilność modeli w walidacji krzyżowej ---
+    cv_metrics = artifacts.get('cv_metrics')
+    if cv_metrics:
+        st.subheader("AUC-ROC w Podzbiorach Walidacji Krzyżowej")
+        fig_cv = cv_figure(version)
+        st.plotly_chart(fig_cv, use_container_width=True)
+
+    # --- Krzywa Uczenia się (Learning Curve) ---
+    st.subheader("Krzywa Uczenia się (F1-score) - XGBoost")
+    st.image(learning_curve_figure(version), use_column_width=True)
+
+    # --- Podsumowanie (wartości z pakietu wyników) ---
+    results = get_bundle(version)['sections']
+    auc = {name: results['models']['test'][name]['auc'] for name in model_labels}
+    curve = artifacts.get('learning_curve_xgb_hist') or artifacts.get('learning_curve_xgb')
+    train_first, train_last = curve_range(curve, 'train_mean')
+    val_first, val_last = curve_range(curve, 'val_mean')
+    urban_driver = next((test for test in results['chi2_features'] if test['feature'] == 'is_urban_driver'), {})
+    # Zastrzeżenie o ilustracyjnych krzywych tylko wtedy, gdy dla wersji nie zapisano predykcji
+    illustrative = ("- Ilustracyjny charakter krzywych ROC (oparty na przykładowych danych) nie wpływa na ogólne wnioski, "
+                    "które są zgodne z wysoką skutecznością modeli.\n    ") if curves is None and fig_roc is not None else ""
+    st.subheader("Podsumowanie wyników oceny modeli")
+    st.markdown(f"""
+    **Kluczowe obserwacje:**
+    - **Krzywe ROC**: Model XGBoost osiąga AUC-ROC = {fmt(auc['xgb'])} na zbiorze testowym, wobec AUC-ROC = {fmt(auc['rf'])} dla Random Forest. Oba modele znacząco przewyższają losowy klasyfikator (AUC = 0.5), co potwierdza ich wysoką zdolność do rozróżniania wypadków wiejskich od miejskich.
+    - **Krzywa uczenia (XGBoost)**: F1-score na zbiorze treningowym zmienia się od {fmt(train_first, '.3f')} do {fmt(train_last, '.3f')}, a na zbiorze walidacyjnym od {fmt(val_first, '.3f')} do {fmt(val_last, '.3f')} wraz ze wzrostem rozmiaru danych. Niewielka różnica między krzywymi dla pełnego zbioru wskazuje na dobrą generalizację modelu z minimalnym ryzykiem nadmiernego dopasowania.
+    - **Porównanie modeli**: Wartości AUC-ROC obu modeli oraz przebieg F1-score na krzywej uczenia są podstawą wyboru XGBoost do dalszej analizy, szczególnie w predykcji wypadków wiejskich.
+    - **Kontekst wcześniejszych analiz**: Wysoka skuteczność modeli jest wspierana przez statystycznie istotne cechy zidentyfikowane w testach chi-kwadrat (sekcja VI, np. V Craméra = {fmt(urban_driver.get('cramer_v'), '.3f')} dla „is_urban_driver”), które odpowiadają kluczowym predyktorom w modelowaniu XGBoost (sekcja V).
+
+    **Wiarygodność wyników:**
+    - Duża próba danych (N = {fmt(results['drivers']['total_accidents'], ',')}) oraz brak zastosowania SMOTE na zbiorach walidacyjnym i testowym zapewniają realistyczne odzwierciedlenie rozkładów danych, zwiększając wiarygodność wyników.
+    - Wysoka wartość AUC-ROC ({fmt(auc['xgb'])}) i stabilność F1-score na krzywej uczenia wskazują na solidność modelu XGBoost, szczególnie w zadaniu klasyfikacji binarnej.
+    {illustrative}- Spójność wyników z analizą ważności cech (sekcja V) i testami statystycznymi (sekcja VI) wzmacnia zaufanie do uzyskanych rezultatów.
+    """)
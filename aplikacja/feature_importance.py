@@ -0,0 +1,144 @@
+# Sekcja V: ważność cech modelu XGBoost.
+import streamlit as st
+import plotly.express as px
+
+from aplikacja.common import get_bundle, model_version_note
+from wypadki.results import frame
+
+
+@st.cache_data
+def feature_importance_figure(version):
+    feature_importance_df = frame(get_bundle(version)['sections']['feature_importance'])
+    fig_feature_importance = px.bar(
+        feature_importance_df,
+        x='Ważność',
+        y='Cecha',
+        orientation='h',
+        title='Wizualizacja tabeli 6: Ważność Cech - Model XGBoost (Top 12)',
+        labels={'Ważność': 'Ważność Cechy (udział %)', 'Cecha': 'Nazwa Cechy'},
+        color='Ważność',
+        color_continuous_scale='viridis'
+    )
+    fig_feature_importance.update_layout(
+        yaxis=dict(autorange="reversed"),
+        xaxis=dict(range=[0, 0.20])
+    )
+    return fig_feature_importance
+
+
+@st.cache_data
+def permutation_figure(version):
+    # Spadek AUC po permutacji cechy z przedziałem ufności z powtórzeń (wyniki/permutation_importance_xgb.json)
+    result = get_bundle(version)['artifacts']['permutation_importance_xgb']
+    permutation_df = frame(result['importance']).head(12)
+    fig_permutation = px.bar(
+        permutation_df,
+        x='importance',
+        y='feature',
+        orientation='h',
+        error_x=permutation_df['ci_high'] - permutation_df['importance'],
+        error_x_minus=permutation_df['importance'] - permutation_df['ci_low'],
+        title=f"Wizualizacja tabeli 7: Ważność permutacyjna cech - Model XGBoost (przedziały ufności {result['confidence']:.0%})",
+        labels={'importance': 'Spadek AUC-ROC po permutacji', 'feature': 'Cecha'},
+    )
+    fig_permutation.update_layout(yaxis=dict(autorange="reversed"))
+    return fig_permutation
+
+
+@st.cache_data
+def shap_figure(version):
+    # Średnie |SHAP| cech źródłowych (kolumny zero-jedynkowe jednej cechy zsumowane) - z pakietu wyników
+    shap_df = frame(get_bundle(version)['sections']['shap']['features']).head(12)
+    fig_shap = px.bar(
+        shap_df,
+        x='Średnie |SHAP|',
+        y='Cecha',
+        orientation='h',
+        title='Wizualizacja tabeli 8: Średni wkład cech w predykcję (|SHAP|, skala logitu) - Model XGBoost',
+        color='Średnie |SHAP|',
+        color_continuous_scale='viridis'
+    )
+    fig_shap.update_layout(yaxis=dict(autorange="reversed"))
+    return fig_shap
+
+
+@st.cache_data
+def dependence_figure(version, feature):
+    dependence_df = frame(get_bundle(version)['sections']['shap']['dependence'][feature])
+    fig_dependence = px.bar(
+        dependence_df,
+        x='Wartość',
+        y='Średni SHAP',
+        title=f'Średni wkład cechy {feature} w predykcję w zależności od jej wartości',
+        hover_data=['Liczba wierszy'],
+        color='Średni SHAP',
+        color_continuous_scale='RdBu_r'
+    )
+    fig_dependence.update_xaxes(type='category')
+    return fig_dependence
+
+
+def render(version):
+    results = get_bundle(version)['sections']
+    st.title("V. Najważniejsze czynniki wypływające na przewidywanie lokalizacji wypadku (na obszarze wiejskim) wg Modelu XGBoost")
+    model_version_note(version)
+    st.markdown("Pokazuje, które cechy miały największy wpływ na predykcje modelu XGBoost w niniejszej analizie.")
+
+    # --- Ważność Cech (Top 12) z pakietu wyników ---
+    feature_importance_df = frame(results['feature_importance'])
+
+    st.subheader("Tabela 6: Top 12 najważniejszych cech")
+    st.dataframe(feature_importance_df.style.format({'Ważność': '{:.4f}'}))
+
+    # --- Wykres Ważności Cech (Top 12) ---
+    fig_feature_importance = feature_importance_figure(version)
+    st.plotly_chart(fig_feature_importance, use_container_width=True)
+
+    # --- Interpretacja 12 Najważności Cech ---
+    st.subheader("Identyfikacja kluczowych cech wpływających na przewidywanie lokalizacji wypadku (na obszarze wiejskim)")
+    st.markdown("""
+    1.  **Ograniczenie prędkości (`speed_limit_normalized`)**: Najważniejsza cecha, co sugeruje, że (wyższe) limity prędkości znacząco wpływają na ryzyko wypadków na obszarach wiejskich.
+    2.  **Interakcja prędkości i typu kierowcy (`urban_driver_speed`)**: Zależność między prędkością a pochodzeniem kierowcy (miejski lub wiejski) wydaje się istotna dla modelu.
+    3.  **Pochodzenie kierowcy (`is_urban_driver`)**: Informacja, czy kierowca jest z obszaru miejskiego, wpływa na ocenę ryzyka lokalizacji zdarzenia.
+    4.  **Interakcja odległości i prędkości (`distance_speed_interaction`)**: Sugeruje, że kierowcy pokonujący większe odległości mogą być bardziej narażeni na ryzyko.
+    5.  **Szczegóły skrzyżowania (rondo) (`junction_detail_1`)**: Obecność ronda jako typu skrzyżowania może być czynnikiem wpływającym na przewidywania modelu.
+    6.  **Typ drogi (droga jednojezdniowa) (`road_type_6`)**: Rodzaj drogi (tutaj jednojezdniowej) może mieć znaczenie przy określaniu lokalizacji wypadków.
+    7.  **Kontrola skrzyżowania (brak kontroli) (`junction_control_4`)**: Brak kontroli na skrzyżowaniu jest zmienną istotną w kontekście przewidywania.
+    8.  **Warunki oświetleniowe (ciemność bez oświetlenia) (`light_conditions_6`)**: Słabe warunki oświetleniowe (brak oświetlenia) mogą mieć wpływ na lokalizację zdarzenia.
+    9.  **Typ poszkodowanego (pasażer samochodu) (`casualty_type_9`)**: Typ poszkodowanej osoby może współwystępować z określonymi lokalizacjami wypadków.
+    10. **Odległość od miejsca zamieszkania (`important_driver_distance`)**: Podobnie jak wyżej, większa odległość do pokonania zwiększa ryzyko.
+    11. **Interakcja odległości i pochodzenia kierowcy (`urban_driver_long_distance`)**: Podobnie jak wyżej, większa odległość do pokonania zwiększa ryzyko.
+    12. **Poślizg i wywrócenie (`skidding_and_overturning_9`)**: Informacja o tym, czy doszło do poślizgu i/lub wywrócenia pojazdu, jest istotna dla modelu.
+""")
+
+    # --- Ważność permutacyjna (python -m wypadki.permutation) ---
+    permutation = get_bundle(version)['artifacts'].get('permutation_importance_xgb')
+    if permutation is not None:
+        st.subheader("Tabela 7: Ważność permutacyjna cech (spadek AUC-ROC na zbiorze testowym)")
+        st.markdown(f"Ważność typu gain faworyzuje cechy z wieloma progami podziału (np. `speed_limit_normalized` "
+                    f"i jego interakcje). Ważność permutacyjna mierzy spadek AUC-ROC (bez permutacji: "
+                    f"{permutation['baseline_auc']:.4f}) po losowym przestawieniu wartości cechy - kolumny zero-jedynkowe "
+                    f"jednej cechy (np. wszystkie `road_type_*`) permutowane są razem; {permutation['n_repeats']} powtórzeń.")
+        st.dataframe(frame(permutation['importance']).style.format(
+            {'importance': '{:.4f}', 'std': '{:.4f}', 'ci_low': '{:.4f}', 'ci_high': '{:.4f}'}))
+        st.plotly_chart(permutation_figure(version), use_container_width=True)
+
+    # --- Wyjaśnienia SHAP (wyniki policzone w notebooku / python -m wypadki.explain) ---
+    shap = results.get('shap')
+    if shap is None:
+        st.info("Pakiet wyników tej wersji nie zawiera wartości SHAP (uruchom `python -m wypadki.explain`).")
+        return
+    st.subheader("Tabela 8: Średni wkład cech w predykcję (wartości SHAP)")
+    st.markdown(f"Wartości SHAP (TreeSHAP) rozkładają predykcję każdego z {shap['rows']:,} przypadków zbioru testowego "
+                f"na wkłady cech w skali logitu (wartość bazowa: {shap['expected_value']:.3f}). W przeciwieństwie do "
+                "ważności typu gain pokazują kierunek wpływu: wartości dodatnie zwiększają prawdopodobieństwo wypadku "
+                "na obszarze wiejskim.")
+    if shap.get('additivity_max_error') is not None:
+        st.caption(f"Addytywność: największa różnica między sigmoid(wartość bazowa + suma wkładów) a prawdopodobieństwem "
+                   f"zwracanym przez model wynosi {shap['additivity_max_error']:.1e}.")
+    st.plotly_chart(shap_figure(version), use_container_width=True)
+
+    feature = st.selectbox("Cecha - wkład w zależności od wartości (kategorii):", list(shap['dependence']))
+    dependence_df = frame(shap['dependence'][feature])
+    st.plotly_chart(dependence_figure(version, feature), use_container_width=True)
+    st.dataframe(dependence_df.style.format({'Średni SHAP': '{:.4f}', 'Średnie |SHAP|': '{:.4f}'}))
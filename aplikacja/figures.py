@@ -0,0 +1,12 @@
+# --- Wykresy sekcji budowane raz na wersję wyników i przechowywane jako PNG (st.cache_data) ---
+# Importowany tylko przez sekcje z wykresami matplotlib.
+import io
+
+import matplotlib.pyplot as plt
+
+
+def figure_png(fig):
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=200, bbox_inches='tight')
+    plt.close(fig)
+    return buffer.getvalue()
@@ -0,0 +1,27 @@
+# Sekcja I: wstęp - temat, cel pracy, pytania badawcze i hipoteza.
+import streamlit as st
+
+
+def render(version):
+    st.title("I. Wstęp")
+    
+    st.subheader('1. Temat: "Analiza związku między miejscem zamieszkania kierowcy, a prawdopodobieństwem udziału w wypadku drogowym".')
+
+    st.subheader("1.1 Cel pracy:")
+    st.markdown("""
+    - Zbadanie, czy istnieje związek między miejscem zamieszkania kierowcy (wiejskim lub miejskim), a prawdopodobieństwem jego udziału w wypadku drogowym oraz identyfikacja kluczowych czynników wpływających na przewidywanie lokalizacji wypadku na terenie wiejskim, z wykorzystaniem modeli uczenia maszynowego.
+    """)
+
+    st.subheader("1.2 Pytania badawcze:")
+    st.markdown("""
+    - Czy miejsce zamieszkania kierowcy (miejskie vs. niemiejskie) wpływa na prawdopodobieństwo udziału w wypadku drogowym?
+    - Jakie z wybranych cech kontekstowych (np. typ drogi, warunki oświetleniowe, kontrola skrzyżowań) mają największy wpływ na prawdopodobieństwo wystąpienia wypadku na terenie wiejskim?
+    - Czy modele uczenia maszynowego (XGBoost, RandomForest) mogą skutecznie przewidzieć lokalizację wypadku na podstawie miejsca zamieszkania kierowcy i cech kontekstowych?
+    """)
+
+    st.subheader("1.3 Hipoteza badawcza:")
+    st.markdown("""
+    - Kierowcy z obszarów miejskich są bardziej narażeni na udział w wypadkach drogowych na terenach wiejskich niż kierowcy z obszarów wiejskich.
+    - Specyficzne cechy, takie jak drogi jednopasmowe, brak oświetlenia ulicznego oraz niekontrolowane skrzyżowania, znacząco zwiększają ryzyko wypadku na terenie wiejskim.
+    - Modele uczenia maszynowego (XGBoost, RandomForest) nie osiągają wysokiej skuteczności w przewidywaniu lokalizacji wypadku (wiejskiej vs. miejskiej) na podstawie miejsca zamieszkania kierowcy i cech kontekstowych.
+    """)
@@ -0,0 +1,88 @@
+# Sekcja IV: opis modelowania, hiperparametry, walidacja krzyżowa i wyniki modeli.
+from pprint import pformat
+
+import streamlit as st
+import pandas as pd
+
+from aplikacja.common import class_scores, fmt, get_bundle, model_version_note
+
+
+def render(version):
+    bundle = get_bundle(version)
+    results, artifacts = bundle['sections'], bundle['artifacts']
+    st.title("IV. Modelowanie Uczenia Maszynowego")
+    model_version_note(version)
+    st.header("II. CZ. 2 - Identyfikacja kluczowych czynników wpływających na przewidywanie lokalizacji wypadku (na terenie wiejskim), z wykorzystaniem modeli uczenia maszynowego.")
+    st.markdown("""
+    - Drugi cel pracy koncentruje się na identyfikacji kluczowych czynników wpływających na przewidywanie, czy wypadek drogowy miał miejsce na terenie wiejskim (`is_rural_accident` = 1), z wykorzystaniem modeli uczenia maszynowego.
+    """)
+    st.subheader("Wybrane modele w celu zbadania binarnej klasyfikacji lokalizacji wypadku drogowego – czy miał on miejsce na terenie wiejskim, czy nie:")
+    st.markdown("- **XGBoost Classifier**")
+    st.markdown("- **Random Forest Classifier**")
+
+    st.subheader("Opis Procesu modelowania:")
+    st.markdown("""
+    1. **Przygotowanie danych** do trenowania modeli:
+        - Dane zostały podzielone na trzy zbiory: treningowy (60%), walidacyjny (20%) oraz testowy (20%).
+        - Na zbiorze treningowym zastosowano technikę **SMOTE** w celu zrównoważenia klas przed uczeniem modeli.
+    2. **Trenowanie modeli XGBoost i Random Forest** na zbalansowanym zbiorze treningowym, z zastosowaniem odpowiednio dobranych hiperparametrów.
+    3. **Ocena modeli** na zbiorze walidacyjnym i testowym (pozostawionych w oryginalnej, niezbalansowanej postaci):
+        - Wykorzystano metryki klasyfikacji: `classification_report` (dokładność, precyzja, recall, F1-score) oraz **AUC-ROC**.
+    4. Na podstawie wyników metryk walidacyjnych i testowych **wybrano model XGBoost** jako skuteczniejszy (wyższe AUC-ROC).
+    5. Dla modelu XGBoost przeanalizowano **ważność cech wejściowych (feature importance)**:
+        - Utworzono tabelę ważności cech na podstawie `.feature_importances_`.
+        - Wybrano 12 najważniejszych cech i zaprezentowano je w formie tekstowej oraz graficznej (poziomy wykres słupkowy).
+    6. **Wykonano testy niezależności (chi-kwadrat)**:
+        - Przeprowadzono je dla najważniejszych zmiennych kategorialnych względem `is_rural_accident`.
+        - Siłę powiązań oceniono na podstawie wartości V Craméra i dokonano interpretacji (słaby, umiarkowany, silny efekt).
+    7. **Sprawdzono skuteczność modelu XGBoost**:
+        - Wygenerowano krzywą ROC oraz obliczono AUC w celu oceny rozdzielczości modelu.
+        - Wygenerowano wykres uczenia (`learning_curve()`) z użyciem scoringu F1 — graficzna analiza overfittingu i underfittingu.
+    8. **Przedstawiono wnioski końcowe** z procesu analizy i modelowania.     
+                
+    *Ta statyczna wersja aplikacji nie trenuje modeli, jedynie prezentuje wcześniej uzyskane wyniki.*
+    """)
+    st.subheader("Hiperparametry Użyte w Analizie:")
+    model_results = results['models']
+    st.code("\n\n".join(
+        f"# {label}\nparams_{name} = {pformat(model_results['params'][name], sort_dicts=False, width=70)}"
+        for name, label in (('xgb', 'XGBoost'), ('rf', 'RandomForest'))
+    ), language='python')
+
+    # --- Walidacja krzyżowa (wyniki/cv_metrics.json zapisywane przez notebook, w pakiecie jako artefakt) ---
+    cv_metrics = artifacts.get('cv_metrics')
+    if cv_metrics:
+        st.subheader("Walidacja Krzyżowa (5-krotna, AUC-ROC)")
+        model_labels = {'xgb': 'XGBoost', 'xgb_hist': 'XGBoost', 'rf': 'Random Forest'}
+        st.dataframe(pd.DataFrame([
+            {
+                'Model': model_labels.get(name, name),
+                'Średnie AUC-ROC': round(metrics['mean_auc'], 4),
+                'Odchylenie std.': round(metrics['std_auc'], 4),
+                'AUC-ROC out-of-fold': round(metrics['oof_auc'], 4),
+                'AUC-ROC podzbiorów': ', '.join(f'{auc:.4f}' for auc in metrics['fold_auc']),
+                'Liczba drzew (wczesne zatrzymanie)': ', '.join(str(i + 1) for i in metrics.get('best_iteration', [])) or '-',
+                'Czas uczenia [s]': fmt(None if None in metrics['fit_seconds'] else sum(metrics['fit_seconds']), '.1f'),
+                'Podzbiory z pamięci podręcznej': f"{sum(metrics['cached'])}/{len(metrics['cached'])}" if 'cached' in metrics else '-',
+            }
+            for name, metrics in cv_metrics.items()
+        ]))
+
+    # --- Wyniki na zbiorach walidacyjnym i testowym ---
+    for split, title in (('validation', "Wyniki na Zbiorze Walidacyjnym"), ('test', "Wyniki na Zbiorze Testowym (Ostateczna Ocena)")):
+        st.subheader(title)
+        for column, (name, label) in zip(st.columns(2), (('xgb', 'XGBoost'), ('rf', 'Random Forest'))):
+            with column:
+                st.markdown(f"**{label}**")
+                st.text(f"AUC-ROC: {model_results[split][name]['auc']:.4f}")
+                st.text("Raport Klasyfikacji:")
+                st.code(model_results[split][name]['report'])
+
+    test = model_results['test']
+    f1 = {name: class_scores(test[name]['report'])['f1'] for name in ('xgb', 'rf')}
+    better = 'Lepszy' if test['xgb']['auc'] >= test['rf']['auc'] else 'Słabszy'
+    st.markdown(f"""
+    **Podsumowanie:**
+    - **XGBoost**: {better} od RandomForest pod względem AUC-ROC ({fmt(test['xgb']['auc'])} vs {fmt(test['rf']['auc'])}); F1-score dla klasy wiejskiej: {fmt(f1['xgb'], '.2f')} vs {fmt(f1['rf'], '.2f')} (zbiór testowy).
+    - **Wniosek**: XGBoost wybrano do dalszej analizy ze względu na wyższą skuteczność i stabilność.
+    """)
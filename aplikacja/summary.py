@@ -0,0 +1,71 @@
+# Sekcja VIII: podsumowanie i wnioski końcowe.
+import streamlit as st
+
+from aplikacja.common import bundle_years, class_scores, curve_range, fmt, get_bundle, model_version_note, p_label
+from wypadki.results import frame
+
+
+def render(version):
+    bundle = get_bundle(version)
+    results, artifacts = bundle['sections'], bundle['artifacts']
+    drivers = results['drivers']
+    location_stats = frame(drivers['location_stats'])
+    importance = frame(results['feature_importance']).set_index('Cecha')['Ważność'] * 100
+    cramer = {test['feature']: test['cramer_v'] for test in results['chi2_features']}
+    test = results['models']['test']
+    scores = {name: class_scores(test[name]['report']) for name in ('xgb', 'rf')}
+    curve = artifacts.get('learning_curve_xgb_hist') or artifacts.get('learning_curve_xgb')
+    st.title("VIII. Podsumowanie i wnioski końcowe")
+    model_version_note(version)
+
+    st.header("1. Cel pracy i pytania badawcze")
+    st.markdown(f"""
+    Celem pracy było zbadanie związku między miejscem zamieszkania kierowcy (miejskim lub wiejskim) a prawdopodobieństwem udziału w wypadku drogowym, z naciskiem na identyfikację kluczowych czynników wpływających na przewidywanie lokalizacji wypadków na terenach wiejskich przy użyciu modeli uczenia maszynowego. Analiza opierała się na danych z brytyjskich baz wypadków drogowych z lat {bundle_years(version)} (N = {fmt(drivers['total_accidents'], ',')}). Pytania badawcze koncentrowały się na:
+    - Związku między miejscem zamieszkania kierowcy a lokalizacją wypadku (`is_rural_accident`).
+    - Kluczowych cechach kontekstowych (np. `road_type`, `light_conditions`) wpływających na wypadki na obszarach wiejskich.
+    - Skuteczności modeli uczenia maszynowego (XGBoost, RandomForest) w przewidywaniu lokalizacji wypadków.
+    """)
+
+    st.header("2. Kluczowe wyniki")
+    
+    st.subheader("2.1 Związek między miejscem zamieszkania a lokalizacją wypadku")
+    st.markdown(f"""
+    - **Statystyczna istotność**: Test chi-kwadrat (χ² = {fmt(drivers['chi2']['statistic'], ',.1f')}, {p_label(drivers['chi2']['p_value'])}, V Craméra = {fmt(drivers['chi2']['phi'], '.3f')}) potwierdził statystycznie istotny związek (siła: {drivers['chi2']['strength']}) między miejscem zamieszkania kierowcy (`is_urban_driver`) a lokalizacją wypadku (`is_rural_accident`). Kierowcy wiejscy częściej uczestniczą w wypadkach na terenach wiejskich ({fmt(location_stats.loc['kier. Wiejski', 'Wypadki obszar Wiejski (%)'], '.1f')}%) niż miejscy ({fmt(location_stats.loc['kier. Miejski', 'Wypadki obszar Wiejski (%)'], '.1f')}%), a kierowcy miejscy dominują w wypadkach miejskich ({fmt(location_stats.loc['kier. Miejski', 'Wypadki obszar Miejski (%)'], '.1f')}%).
+    - **Obalenie hipotezy badawczej**: Hipoteza, że kierowcy miejscy są bardziej narażeni na wypadki na terenach wiejskich, została obalona. Kierowcy wiejscy wykazują wyższe prawdopodobieństwo wypadków w środowisku wiejskim, co może wynikać z większej znajomości dróg miejskich przez kierowców miejskich lub różnic w infrastrukturze drogowej.
+    """)
+
+    st.subheader("2.2 Kluczowe czynniki wpływające na wypadki wiejskie")
+    st.markdown(f"""
+    - **Najważniejsze cechy (XGBoost)**: Analiza ważności cech w modelu XGBoost wskazała, że ograniczenie prędkości (`speed_limit_normalized`, {fmt(importance.get('speed_limit_normalized'), '.2f')}%), interakcja prędkości i typu kierowcy (`urban_driver_speed`, {fmt(importance.get('urban_driver_speed'), '.2f')}%), pochodzenie kierowcy (`is_urban_driver`, {fmt(importance.get('is_urban_driver'), '.2f')}%) oraz interakcja odległości i prędkości (`distance_speed_interaction`, {fmt(importance.get('distance_speed_interaction'), '.2f')}%) mają największy wpływ na przewidywanie wypadków wiejskich (`is_rural_accident`). Inne istotne cechy to brak kontroli skrzyżowań (`junction_control`), ciemność bez oświetlenia (`light_conditions`) i typ drogi jednojezdniowej (`road_type`).
+    - **Testy chi-kwadrat**: Wszystkie kluczowe cechy wykazały statystycznie istotny związek z lokalizacją wypadku (`is_rural_accident`) (p < 0.05). Najsilniejszy związek miał `is_urban_driver` (V = {fmt(cramer.get('is_urban_driver'), '.3f')}), a umiarkowane powiązania dotyczyły `light_conditions` (warunki oświetleniowe) (V = {fmt(cramer.get('light_conditions'), '.3f')}), `driver_journey_purpose` (odległość od miejsca zamieszkania) (V = {fmt(cramer.get('driver_journey_purpose'), '.3f')}) oraz `junction_control` (kontrola skrzyżowań) (V = {fmt(cramer.get('junction_control'), '.3f')}).
+    """)
+
+    st.subheader("2.3 Skuteczność modeli uczenia maszynowego")
+    st.markdown(f"""
+    - **XGBoost vs. Random Forest**: Model XGBoost osiągnął na zbiorze testowym AUC-ROC = {fmt(test['xgb']['auc'])} i F1-score dla klasy wiejskiej = {fmt(scores['xgb']['f1'], '.2f')}, w porównaniu do Random Forest (AUC-ROC = {fmt(test['rf']['auc'])}, F1-score = {fmt(scores['rf']['f1'], '.2f')}). XGBoost wykazał lepszy balans między precyzją a czułością oraz stabilność wyników w przewidywaniu `is_rural_accident`.
+    - **Krzywa uczenia się**: Krzywa uczenia dla XGBoost osiągnęła dla pełnego zbioru treningowego F1-score {fmt(curve_range(curve, 'val_mean')[1], '.2f')} (walidacja) i {fmt(curve_range(curve, 'train_mean')[1], '.2f')} (trening), wskazując na dobrą generalizację modelu z minimalnym ryzykiem nadmiernego dopasowania.
+    - **Wiarygodność modeli**: Duża próba danych i realistyczny rozkład klas w zbiorach walidacyjnym i testowym (bez SMOTE) zapewniają wysoką wiarygodność wyników. Wysoka wartość AUC-ROC potwierdza zdolność modelu do rozróżniania wypadków wiejskich (`is_rural_accident = 1`) od miejskich (`is_rural_accident = 0`).
+    """)
+
+    st.header("3. Odpowiedzi na pytania badawcze")
+    st.markdown(f"""
+    1. **Czy miejsce zamieszkania kierowcy wpływa na prawdopodobieństwo udziału w wypadku drogowym?**  
+       Tak, istnieje statystycznie istotny, umiarkowany związek między miejscem zamieszkania kierowcy (`is_urban_driver`) a lokalizacją wypadku (`is_rural_accident`). Kierowcy wiejscy są bardziej narażeni na wypadki na terenach wiejskich, a kierowcy miejscy na terenach miejskich.
+    2. **Jakie cechy kontekstowe mają największy wpływ na wypadki wiejskie?**  
+       Kluczowe cechy to wyższe limity prędkości (`speed_limit_normalized`), brak kontroli skrzyżowań (`junction_control`), ciemność bez oświetlenia (`light_conditions`), drogi jednojezdniowe (`road_type`) oraz interakcje między prędkością (`urban_driver_speed`), odległością od miejsca zamieszkania (`driver_journey_purpose`) i pochodzeniem kierowcy (`is_urban_driver`).
+    3. **Czy modele uczenia maszynowego mogą skutecznie przewidzieć lokalizację wypadku?**  
+       Tak, model XGBoost osiągnął wysoką skuteczność (AUC-ROC = {fmt(test['xgb']['auc'])}), obalając hipotezę, że modele uczenia maszynowego nie są skuteczne w tym zadaniu. Model dobrze radzi sobie z przewidywaniem wypadków wiejskich (`is_rural_accident`), choć precyzja dla tej klasy ({fmt(scores['xgb']['precision'], '.2f')}) wskazuje na potencjalne obszary do poprawy.
+    """)
+
+    st.header("4. Wnioski końcowe")
+    st.markdown("""
+    - **Związek miejsca zamieszkania z wypadkami**: Miejsce zamieszkania kierowcy (`is_urban_driver`) istotnie wpływa na lokalizację wypadków (`is_rural_accident`), przy czym kierowcy wiejscy są bardziej narażeni na wypadki w środowisku wiejskim, co może wynikać z różnic w infrastrukturze, nawykach jazdy lub warunkach drogowych.
+    - **Kluczowe czynniki ryzyka**: Wysokie limity prędkości (`speed_limit_normalized`), brak oświetlenia (`light_conditions`), niekontrolowane skrzyżowania (`junction_control`) i drogi jednojezdniowe (`road_type`) znacząco zwiększają ryzyko wypadków na terenach wiejskich, co powinno być uwzględnione w strategiach prewencji.
+    - **Skuteczność modelowania**: Model XGBoost okazał się skutecznym narzędziem do przewidywania lokalizacji wypadków (`is_rural_accident`), oferując wysoką dokładność i możliwość identyfikacji kluczowych czynników ryzyka. Jego przewaga nad Random Forest oraz stabilność wyników potwierdzają przydatność uczenia maszynowego w analizie bezpieczeństwa drogowego.
+    - **Praktyczne implikacje**: Wyniki sugerują potrzebę dostosowania działań prewencyjnych do specyfiki obszarów wiejskich, np. poprawy oświetlenia (`light_conditions`), kontroli skrzyżowań (`junction_control`) i edukacji kierowców miejskich podróżujących na tereny wiejskie.
+    """)
+
+    st.header("5. Podsumowanie")
+    st.markdown("""
+    Analiza potwierdziła istotny związek między miejscem zamieszkania kierowcy (`is_urban_driver`) a lokalizacją wypadków drogowych (`is_rural_accident`), identyfikując kluczowe czynniki ryzyka, takie jak prędkość (`speed_limit_normalized`), oświetlenie (`light_conditions`) i kontrola skrzyżowań (`junction_control`). Model XGBoost okazał się skutecznym narzędziem predykcyjnym, oferując wysoką dokładność i cenne wskazówki dla dalszych badań oraz działań prewencyjnych. Wyniki podkreślają znaczenie dostosowania infrastruktury i edukacji kierowców do specyfiki obszarów wiejskich, aby zmniejszyć ryzyko wypadków drogowych.
+    """)
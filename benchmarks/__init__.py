@@ -0,0 +1,2 @@
+# Mikro-benchmarki kroków przetwarzania; uruchamiane z katalogu głównego repozytorium,
+# np. `python -m benchmarks.bench_features`.
@@ -0,0 +1,55 @@
+# Wspólne funkcje mikro-benchmarków: dane (pełny zbiór ze snapshotu, macierze modelu lub dane syntetyczne) i pomiar czasu
+import time
+
+import numpy as np
+import pandas as pd
+
+from wypadki.config import YEARS
+from wypadki.preprocessing import load_clean_data, prepare_model_data
+
+
+def load_full_data(years=YEARS):
+    # Pełny zbiór 2021-2023 (snapshot Parquet budowany przy pierwszym uruchomieniu)
+    return load_clean_data(years)
+
+
+def model_data(years=YEARS):
+    # Macierze modelu jak w notebooku: podział 60/20/20 i potok dopasowany na zbiorze treningowym
+    pipeline, data = prepare_model_data(load_full_data(years))
+    return {**data, 'feature_names': pipeline.feature_names}
+
+
+def synthetic_data(n_rows, seed=42):
+    # Dane o rozkładach zbliżonych do STATS19 - gdy snapshot nie jest dostępny
+    rng = np.random.default_rng(seed)
+    hours = rng.integers(0, 24, n_rows)
+    minutes = rng.integers(0, 60, n_rows)
+    return pd.DataFrame({
+        'time': pd.array([f'{h:02d}:{m:02d}' for h, m in zip(hours, minutes)], dtype='string'),
+        'driver_home_area_type': pd.array(rng.integers(1, 4, n_rows), dtype='Int8'),
+        'urban_or_rural_area': pd.array(rng.integers(1, 3, n_rows), dtype='Int8'),
+        'speed_limit': pd.array(rng.choice([20, 30, 40, 50, 60, 70], n_rows), dtype='Int8'),
+        'age_of_casualty': pd.array(rng.integers(0, 95, n_rows), dtype='Int8'),
+        'age_of_driver': pd.array(rng.integers(17, 95, n_rows), dtype='Int8'),
+        'driver_distance_banding': pd.array(rng.integers(1, 6, n_rows), dtype='Int8'),
+    })
+
+
+def benchmark_data(rows=None):
+    if rows:
+        return synthetic_data(rows)
+    try:
+        return load_full_data()
+    except OSError as exc:
+        print(f'Brak snapshotu danych ({exc}) - używam 1 000 000 wierszy syntetycznych.')
+        return synthetic_data(1_000_000)
+
+
+def best_time(func, repeat=5):
+    # Najlepszy z `repeat` pomiarów (sekundy)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
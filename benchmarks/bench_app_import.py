@@ -0,0 +1,76 @@
+# Koszt importu aplikacji Streamlit: zimny start (streamlit + pakiet wyników) i czas dodawany przez pierwsze
+# otwarcie każdej sekcji (moduły aplikacja.*), mierzone przez `python -X importtime` w osobnych procesach.
+# Dla każdej sekcji podawane są też pakiety, które najbardziej wydłużają jej import (np. matplotlib, plotly).
+#
+#   python -m benchmarks.bench_app_import
+#   python -m benchmarks.bench_app_import --repeat 5 --top 5
+import argparse
+import subprocess
+import sys
+from collections import defaultdict
+
+from aplikacja import SECTIONS
+
+# Importy wykonywane przy każdym starcie aplikacji (Streamlit_app_Wypadki_M_W.py przed wybraniem sekcji)
+BASE_IMPORTS = ['streamlit', 'aplikacja', 'aplikacja.common']
+
+
+def import_times(modules):
+    """Wpisy `-X importtime` dla importu `modules` w nowym procesie: lista (moduł, czas własny, czas łączny, poziom) w µs."""
+    code = '; '.join(f'import {module}' for module in modules)
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            capture_output=True, text=True, check=True).stderr
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        # Poziom zagnieżdżenia wynika z wcięcia nazwy (2 spacje na poziom)
+        level = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((name.strip(), int(self_us), int(cumulative_us), level))
+    return entries
+
+
+def section_cost(module, repeat):
+    """Najlepszy z `repeat` pomiarów: czas importu sekcji po imporcie bazowym [ms] i czas własny pakietów [ms]."""
+    best = None
+    for _ in range(repeat):
+        entries = import_times(BASE_IMPORTS + [module])
+        # -X importtime wypisuje moduł po modułach, które zaimportował - sekcja jest ostatnim wpisem poziomu 0
+        end = max(i for i, entry in enumerate(entries) if entry[0] == module and entry[3] == 0)
+        start = max((i for i, entry in enumerate(entries[:end]) if entry[3] == 0), default=-1) + 1
+        packages = defaultdict(int)
+        for name, self_us, _, _ in entries[start:end + 1]:
+            packages[name.split('.')[0]] += self_us
+        total = entries[end][2]
+        if best is None or total < best[0]:
+            best = (total, packages)
+    total, packages = best
+    return total / 1000, {name: us / 1000 for name, us in packages.items()}
+
+
+def base_cost(repeat):
+    # Łączny czas importów wykonywanych przy starcie (najlepszy z `repeat` pomiarów) [ms]
+    return min(sum(entry[2] for entry in import_times(BASE_IMPORTS) if entry[3] == 0)
+               for _ in range(repeat)) / 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Koszt importu aplikacji Streamlit i jej sekcji (-X importtime).')
+    parser.add_argument('--repeat', type=int, default=3, help='liczba pomiarów (brany najlepszy)')
+    parser.add_argument('--top', type=int, default=3, help='liczba najcięższych pakietów na sekcję')
+    args = parser.parse_args()
+
+    # Pierwszy import kompiluje pliki .pyc - nie wliczany do pomiarów
+    import_times(BASE_IMPORTS + list(SECTIONS.values()))
+
+    print(f"Start aplikacji ({', '.join(BASE_IMPORTS)}): {base_cost(args.repeat):.0f} ms\n")
+    print(f"{'sekcja':<60}{'import [ms]':>12}  najcięższe pakiety")
+    for title, module in SECTIONS.items():
+        total, packages = section_cost(module, args.repeat)
+        heaviest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:args.top]
+        print(f"{title:<60}{total:>12.1f}  " + ', '.join(f'{name} {ms:.0f} ms' for name, ms in heaviest))
+
+
+if __name__ == '__main__':
+    main()
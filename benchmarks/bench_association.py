@@ -0,0 +1,73 @@
+# Porównanie testów chi-kwadrat: pętla pd.crosstab + chi2_contingency po cechach (kod z notebooka)
+# vs wektorowy moduł wypadki.association (wszystkie tabele z jednego np.bincount), dla par (cecha, is_rural_accident)
+# oraz dla wszystkich par cech.
+#
+#   python -m benchmarks.bench_association
+#   python -m benchmarks.bench_association --rows 2000000 --repeat 3
+import argparse
+import itertools
+
+import numpy as np
+import pandas as pd
+from scipy.stats import chi2_contingency
+
+from benchmarks._common import benchmark_data, best_time
+from wypadki.association import COLLAPSE, association_with_target, pairwise_association
+from wypadki.features import is_rural_accident
+
+# Cechy kategorialne testowane w benchmarku (używane są te obecne w danych)
+CANDIDATE_FEATURES = [
+    'road_type', 'light_conditions', 'junction_detail', 'junction_control', 'weather_conditions', 'speed_limit',
+    'driver_home_area_type', 'driver_distance_banding', 'driver_imd_decile', 'casualty_type', 'skidding_and_overturning',
+    'accident_year',
+]
+
+
+def legacy_tests(data, pairs):
+    # Jak w notebooku: łączenie kategorii przez where(isin), crosstab i chi2_contingency dla każdej pary
+    results = []
+    for a, b in pairs:
+        columns = []
+        for feature in (a, b):
+            if feature in COLLAPSE:
+                kept, other = COLLAPSE[feature]
+                columns.append(data[feature].where(data[feature].isin(kept), other))
+            else:
+                columns.append(data[feature])
+        contingency = pd.crosstab(*columns)
+        chi2, p, _, _ = chi2_contingency(contingency)
+        results.append((chi2, p, np.sqrt(chi2 / (contingency.values.sum() * (min(contingency.shape) - 1)))))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark testów chi-kwadrat / V Craméra.')
+    parser.add_argument('--rows', type=int, default=None, help='liczba wierszy syntetycznych zamiast pełnego zbioru')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    data = benchmark_data(args.rows)
+    data['is_rural_accident'] = is_rural_accident(data, None)
+    features = [f for f in CANDIDATE_FEATURES if f in data.columns]
+    target_pairs = [(f, 'is_rural_accident') for f in features]
+    all_pairs = list(itertools.combinations(features, 2))
+    print(f"{len(data):,} wierszy, {len(features)} cech, {len(all_pairs)} par cech")
+
+    # Zgodność wyników z scipy
+    summary, _ = association_with_target(data, features)
+    legacy = legacy_tests(data, target_pairs)
+    max_diff = max(abs(v - l[2]) for v, l in zip(summary['cramer_v'], legacy))
+    print(f"Maks. różnica V Craméra względem crosstab + chi2_contingency: {max_diff:.2e}\n")
+
+    print(f"{'testy':<22}{'pętla [s]':>12}{'bincount [s]':>14}{'przyspieszenie':>16}")
+    for label, pairs, batch in (
+        ('cecha × is_rural', target_pairs, lambda: association_with_target(data, features)),
+        ('wszystkie pary cech', all_pairs, lambda: pairwise_association(data, features)),
+    ):
+        t_legacy = best_time(lambda: legacy_tests(data, pairs), args.repeat)
+        t_batch = best_time(batch, args.repeat)
+        print(f"{label:<22}{t_legacy:>12.3f}{t_batch:>14.3f}{t_legacy / t_batch:>15.1f}x")
+
+
+if __name__ == '__main__':
+    main()
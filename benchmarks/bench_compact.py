@@ -0,0 +1,55 @@
+# Porównanie modelu RandomForest z modele/<model>.joblib i jego zapisu kompaktowego (wypadki.compact):
+# rozmiar na dysku, czas wczytania (joblib.load vs mapowanie plików .npy), czas predict_proba i AUC na zbiorze testowym,
+# a także maksymalna różnica prawdopodobieństw wszystkich drzew po przycięciu i kwantyzacji (bez ograniczania drzew).
+# Wymaga modelu zapisanego przez notebook i kompaktowego zapisu (python -m wypadki.compact rf).
+#
+#   python -m benchmarks.bench_compact
+#   python -m benchmarks.bench_compact --name rf --rows 20000 --repeat 5
+import argparse
+import time
+
+import joblib
+import numpy as np
+from sklearn.metrics import roc_auc_score
+
+from benchmarks._common import best_time, model_data
+from wypadki.compact import compact_dir, compact_model, load_compact
+from wypadki.training import model_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark kompaktowego zapisu lasu (wypadki.compact).')
+    parser.add_argument('--name', default='rf')
+    parser.add_argument('--rows', type=int, default=None, help='liczba wierszy zbioru testowego (domyślnie wszystkie)')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    data = model_data()
+    X, y = data['X_test'], data['y_test']
+    X, y = (X[:args.rows], y[:args.rows]) if args.rows else (X, y)
+
+    start = time.perf_counter()
+    model = joblib.load(model_path(args.name))
+    t_load_native = time.perf_counter() - start
+    start = time.perf_counter()
+    forest = load_compact(args.name)
+    t_load_compact = time.perf_counter() - start
+
+    size_native = model_path(args.name).stat().st_size / 2**20
+    size_compact = sum(path.stat().st_size for path in compact_dir(args.name).iterdir()) / 2**20
+    native = model.predict_proba(X)[:, 1]
+    compact = forest.predict_proba(X)[:, 1]
+    max_diff = float(np.abs(native - compact_model(model).predict_proba(X)[:, 1]).max())
+    t_native = best_time(lambda: model.predict_proba(X), args.repeat)
+    t_compact = best_time(lambda: forest.predict_proba(X), args.repeat)
+
+    print(f"Zbiór testowy: {X.shape[0]:,} wierszy × {X.shape[1]} cech, drzewa w zapisie kompaktowym: {forest.n_trees}, "
+          f"węzły: {forest.meta['nodes']:,} (przed przycięciem {forest.meta['nodes_before_pruning']:,})\n")
+    print(f"{'':<12}{'dysk [MB]':>11}{'wczytanie [s]':>15}{'predict_proba [s]':>19}{'AUC test':>10}")
+    print(f"{'joblib':<12}{size_native:>11.1f}{t_load_native:>15.3f}{t_native:>19.3f}{roc_auc_score(y, native):>10.4f}")
+    print(f"{'kompaktowy':<12}{size_compact:>11.1f}{t_load_compact:>15.4f}{t_compact:>19.3f}{roc_auc_score(y, compact):>10.4f}")
+    print(f"\nMaks. różnica prawdopodobieństw (wszystkie drzewa, przycięcie + kwantyzacja): {max_diff:.2e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+# Tryb filtrowania na żywo (wypadki.cube): rozmiar kostki liczności i czas odpowiedzi na losowe filtry
+# (zawężenie kostki + tabele i test chi-kwadrat sekcji III) w porównaniu z filtrowaniem danych wierszowych
+# oraz czas całej ścieżki filtr -> wykresy sekcji III (zapytanie kostki, budowa wykresów Plotly i ich serializacja
+# do JSON wysyłanego przez st.plotly_chart) przy pierwszym wyborze danych filtrów.
+#
+#   python -m benchmarks.bench_cube
+#   python -m benchmarks.bench_cube --queries 500 --target-ms 100
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from aplikacja.drivers import drivers_plot, location_plot
+from benchmarks._common import load_full_data
+from wypadki.cube import FILTER_DIMENSIONS, OlapCube, drivers_section
+from wypadki.features import is_rural_accident, is_urban_driver
+
+
+def random_filters(cube, rng):
+    # Każdy wymiar filtrowany z prawdopodobieństwem 1/2, wybierany jest losowy niepusty podzbiór wartości
+    filters = {}
+    for name in FILTER_DIMENSIONS:
+        values = cube.values[name]
+        if rng.random() < 0.5:
+            filters[name] = rng.choice(values, size=rng.integers(1, len(values) + 1), replace=False).tolist()
+    return filters
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark kostki OLAP trybu filtrowania na żywo.')
+    parser.add_argument('--queries', type=int, default=200, help='liczba losowych zapytań')
+    parser.add_argument('--target-ms', type=float, default=100.0, help='docelowy czas odpowiedzi')
+    args = parser.parse_args()
+
+    data = load_full_data()
+    start = time.perf_counter()
+    cube = OlapCube.build(data)
+    t_build = time.perf_counter() - start
+    with tempfile.TemporaryDirectory() as tmp:
+        size_kb = cube.save(results_dir=Path(tmp)).stat().st_size / 1024
+    print(f"Dane: {len(data):,} wierszy; kostka: {cube.counts.shape} = {cube.counts.size:,} komórek, "
+          f"{size_kb:.1f} kB na dysku, budowa {t_build:.2f} s")
+    # Komórka tabeli kontyngencji każdego wiersza (is_urban_driver × is_rural_accident) - dla porównania
+    cells = is_urban_driver(data, None).astype('int64') * 2 + is_rural_accident(data, None)
+
+    rng = np.random.default_rng(42)
+    queries = [random_filters(cube, rng) for _ in range(args.queries)]
+    cube_ms, rows_ms, render_ms = [], [], []
+    for filters in queries:
+        start = time.perf_counter()
+        drivers = drivers_section(cube.select(filters))
+        cube_ms.append((time.perf_counter() - start) * 1000)
+
+        # Pełna ścieżka filtr -> wykresy (bez pamięci podręcznej Streamlit, czyli pierwszy wybór tych filtrów)
+        start = time.perf_counter()
+        drivers = drivers_section(cube.select(filters))
+        if drivers['total_accidents']:
+            drivers_plot(drivers).to_json()
+            location_plot(drivers).to_json()
+        render_ms.append((time.perf_counter() - start) * 1000)
+
+        # To samo zapytanie na danych wierszowych: maska + tabela kontyngencji
+        start = time.perf_counter()
+        mask = np.ones(len(data), dtype=bool)
+        for name, selected in filters.items():
+            mask &= data[name].isin(selected).to_numpy()
+        np.bincount(cells[mask], minlength=4)
+        rows_ms.append((time.perf_counter() - start) * 1000)
+
+    print(f"{'źródło':<18}{'mediana [ms]':>14}{'p95 [ms]':>12}{'max [ms]':>12}")
+    for label, times in (('kostka', cube_ms), ('dane wierszowe', rows_ms), ('kostka + wykresy', render_ms)):
+        print(f"{label:<18}{np.median(times):>14.2f}{np.percentile(times, 95):>12.2f}{np.max(times):>12.2f}")
+    print()
+    for label, times in (('zapytanie kostki', cube_ms), ('filtr -> wykresy', render_ms)):
+        verdict = 'spełniony' if np.max(times) < args.target_ms else 'NIESPEŁNIONY'
+        print(f"Cel {args.target_ms:.0f} ms ({label}): {verdict}")
+
+
+if __name__ == '__main__':
+    main()
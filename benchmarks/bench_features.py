@@ -0,0 +1,68 @@
+# Porównanie inżynierii cech: dotychczasowy kod z notebooka (apply/lambda dla każdego wiersza)
+# vs wektorowy moduł wypadki.features.
+#
+#   python -m benchmarks.bench_features              # pełny zbiór 2021-2023 ze snapshotu
+#   python -m benchmarks.bench_features --rows 5000000
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from benchmarks._common import benchmark_data, best_time
+from wypadki.features import RUSH_HOUR_WINDOWS, add_features, bins_age_driver, is_rush_hour, labels_age_driver
+
+
+def legacy_features(data, speed_mean, speed_std):
+    # Kod z notebooka przed zmianą
+    data['hour_of_day'] = pd.to_datetime(data['time'], format='%H:%M').dt.hour
+    data['driver_home_area_type'] = data['driver_home_area_type'].replace({3: 2})
+    data['is_urban_driver'] = (data['driver_home_area_type'] == 1).astype(int)
+    data['is_rural_accident'] = (data['urban_or_rural_area'] == 2).astype(int)
+    data['speed_limit_normalized'] = (data['speed_limit'].astype(float) - speed_mean) / speed_std
+    data['age_of_casualty_binned'] = pd.cut(data['age_of_casualty'], bins=bins_age_driver, labels=labels_age_driver, right=False)
+    data['age_of_driver_binned'] = pd.cut(data['age_of_driver'], bins=bins_age_driver, labels=labels_age_driver, right=False)
+    data['urban_driver_speed'] = data['is_urban_driver'] * data['speed_limit_normalized']
+    data['is_rush_hour'] = data['hour_of_day'].apply(lambda h: 1 if (7 <= h <= 9) or (15 <= h <= 18) else 0)
+    data['distance_speed_interaction'] = data['driver_distance_banding'].astype(float) * data['urban_driver_speed']
+    dummies = pd.get_dummies(data['driver_distance_banding'], prefix='driver_distance_banding')
+    data['important_driver_distance'] = (dummies['driver_distance_banding_4'] + dummies['driver_distance_banding_3'] > 0).astype(int)
+    data['urban_driver_long_distance'] = data['is_urban_driver'] * data['important_driver_distance']
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark inżynierii cech.')
+    parser.add_argument('--rows', type=int, default=None, help='liczba wierszy syntetycznych zamiast pełnego zbioru')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    data = benchmark_data(args.rows)
+    speed = data['speed_limit'].to_numpy(dtype='float64')
+    speed_mean, speed_std = speed.mean(), speed.std()
+    print(f'Wiersze: {len(data):,}')
+
+    # Sama cecha is_rush_hour
+    hours = pd.to_datetime(data['time'], format='%H:%M').dt.hour
+    t_apply = best_time(lambda: hours.apply(lambda h: 1 if (7 <= h <= 9) or (15 <= h <= 18) else 0), args.repeat)
+    frame = pd.DataFrame({'hour_of_day': hours})
+    t_vec = best_time(lambda: is_rush_hour(frame, {'rush_hour_windows': RUSH_HOUR_WINDOWS}), args.repeat)
+    print(f'is_rush_hour  apply: {t_apply:8.3f} s   wektorowo: {t_vec:8.4f} s   przyspieszenie: {t_apply / t_vec:6.1f}x')
+
+    # Cały zestaw cech
+    t_legacy = best_time(lambda: legacy_features(data.copy(), speed_mean, speed_std), args.repeat)
+    t_new = best_time(lambda: add_features(data.copy(), speed_mean, speed_std), args.repeat)
+    print(f'wszystkie cechy  dotychczas: {t_legacy:8.3f} s   wektorowo: {t_new:8.3f} s   przyspieszenie: {t_legacy / t_new:6.1f}x')
+
+    # Kontrola zgodności wyników
+    old = legacy_features(data.copy(), speed_mean, speed_std)
+    new = add_features(data.copy(), speed_mean, speed_std)
+    for column in ['hour_of_day', 'is_urban_driver', 'is_rural_accident', 'is_rush_hour',
+                   'important_driver_distance', 'urban_driver_long_distance']:
+        assert np.array_equal(old[column].to_numpy(dtype='int64'), new[column].to_numpy(dtype='int64')), column
+    for column in ['speed_limit_normalized', 'urban_driver_speed', 'distance_speed_interaction']:
+        assert np.allclose(old[column].to_numpy(dtype='float64'), new[column].to_numpy(dtype='float64')), column
+    print('Wyniki zgodne z dotychczasowym kodem.')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+# Porównanie wariantów balansowania klas (wypadki.imbalance): czas balansowania i uczenia,
+# szczytowa pamięć (alokacje Pythona/NumPy śledzone przez tracemalloc), liczba wierszy treningowych
+# i AUC-ROC na zbiorze testowym. Na końcu wskazywany jest najtańszy wariant z AUC nie niższym niż próg.
+#
+#   python -m benchmarks.bench_imbalance
+#   python -m benchmarks.bench_imbalance --model rf --modes class_weight undersample smote --min-auc 0.94
+import argparse
+import time
+import tracemalloc
+
+from sklearn.metrics import roc_auc_score
+
+from benchmarks._common import model_data
+from wypadki.imbalance import STRATEGIES, balance
+from wypadki.models import MODELS
+
+
+def run_mode(data, mode, model, max_rows):
+    tracemalloc.start()
+    start = time.perf_counter()
+    X, y, model_params = balance(data['X_train'], data['y_train'], mode=mode, max_rows=max_rows)
+    t_balance = time.perf_counter() - start
+
+    start = time.perf_counter()
+    estimator = MODELS[model](**model_params[model]).fit(X, y)
+    t_fit = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    auc = roc_auc_score(data['y_test'], estimator.predict_proba(data['X_test'])[:, 1])
+    return {'mode': mode, 'rows': X.shape[0], 'balance_s': t_balance, 'fit_s': t_fit,
+            'peak_mb': peak / 2**20, 'auc': auc}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark wariantów balansowania klas.')
+    parser.add_argument('--model', choices=list(MODELS), default='xgb')
+    parser.add_argument('--modes', nargs='+', choices=list(STRATEGIES), default=list(STRATEGIES))
+    parser.add_argument('--max-rows', type=int, default=100_000, help='wielkość próbki dla smote_subset')
+    parser.add_argument('--min-auc', type=float, default=0.94, help='minimalne AUC-ROC na zbiorze testowym')
+    args = parser.parse_args()
+
+    data = model_data()
+    print(f"Zbiór treningowy: {data['X_train'].shape[0]:,} wierszy, model: {args.model}")
+    print(f"{'wariant':<14}{'wiersze':>10}{'balans. [s]':>13}{'uczenie [s]':>13}{'pamięć [MB]':>13}{'AUC':>8}")
+
+    results = []
+    for mode in args.modes:
+        r = run_mode(data, mode, args.model, args.max_rows)
+        results.append(r)
+        print(f"{r['mode']:<14}{r['rows']:>10,}{r['balance_s']:>13.2f}{r['fit_s']:>13.2f}{r['peak_mb']:>13.1f}{r['auc']:>8.4f}")
+
+    # Najtańszy (łączny czas) wariant, który utrzymuje wymagane AUC
+    accepted = [r for r in results if r['auc'] >= args.min_auc]
+    if accepted:
+        best = min(accepted, key=lambda r: r['balance_s'] + r['fit_s'])
+        print(f"\nNajtańszy wariant z AUC >= {args.min_auc}: {best['mode']} (AUC {best['auc']:.4f})")
+    else:
+        print(f'\nŻaden wariant nie osiągnął AUC >= {args.min_auc}.')
+
+
+if __name__ == '__main__':
+    main()
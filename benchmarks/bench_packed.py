@@ -0,0 +1,49 @@
+# Porównanie predykcji: predict_proba zapisanych modeli (XGBoost, RandomForest) vs drzewa skompilowane do tablic
+# NumPy (wypadki.packed) na zbiorze testowym - maksymalna różnica prawdopodobieństw, czas i rozmiar modelu.
+# Wymaga modeli zapisanych przez notebook (modele/xgb.joblib, modele/rf.joblib).
+#
+#   python -m benchmarks.bench_packed
+#   python -m benchmarks.bench_packed --models rf --rows 10000 --repeat 5
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks._common import best_time, model_data
+from wypadki.packed import compile_model
+from wypadki.training import load_model, model_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark skompilowanych drzew (wypadki.packed).')
+    parser.add_argument('--models', nargs='+', default=['xgb', 'rf'], choices=['xgb', 'rf'])
+    parser.add_argument('--rows', type=int, default=None, help='liczba wierszy zbioru testowego (domyślnie wszystkie)')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--tolerance', type=float, default=1e-5, help='dopuszczalna różnica prawdopodobieństw')
+    args = parser.parse_args()
+
+    X = model_data()['X_test']
+    X = X[:args.rows] if args.rows else X
+    print(f"Zbiór testowy: {X.shape[0]:,} wierszy × {X.shape[1]} cech\n")
+    print(f"{'model':<8}{'predict_proba [s]':>19}{'tablice [s]':>13}{'przyspieszenie':>16}{'maks. różnica':>15}"
+          f"{'joblib [MB]':>13}{'tablice [MB]':>14}")
+    for name in args.models:
+        model = load_model(name)
+        start = time.perf_counter()
+        packed = compile_model(model)
+        t_compile = time.perf_counter() - start
+
+        native = model.predict_proba(X)[:, 1]
+        compiled = packed.predict_proba(X)[:, 1]
+        max_diff = float(np.abs(native - compiled).max())
+        t_native = best_time(lambda: model.predict_proba(X), args.repeat)
+        t_packed = best_time(lambda: packed.predict_proba(X), args.repeat)
+        print(f"{name:<8}{t_native:>19.3f}{t_packed:>13.3f}{t_native / t_packed:>15.1f}x{max_diff:>15.2e}"
+              f"{model_path(name).stat().st_size / 2**20:>13.1f}{packed.nbytes / 2**20:>14.1f}")
+        if max_diff > args.tolerance:
+            print(f'  UWAGA: różnica {max_diff:.2e} przekracza tolerancję {args.tolerance:.0e}')
+        print(f'  kompilacja: {t_compile:.2f} s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+# Czas ważności permutacyjnej (wypadki.permutation) na zbiorze testowym: jeden proces vs procesy równoległe,
+# opcjonalnie z drzewami skompilowanymi (wypadki.packed). Wymaga modeli zapisanych przez notebook.
+#
+#   python -m benchmarks.bench_permutation
+#   python -m benchmarks.bench_permutation --model rf --packed --rows 20000 --repeats 3
+import argparse
+import time
+
+from benchmarks._common import model_data
+from wypadki.packed import compile_model
+from wypadki.permutation import permutation_importance
+from wypadki.preprocessing import PreprocessingPipeline
+from wypadki.training import load_model
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark ważności permutacyjnej (wypadki.permutation).')
+    parser.add_argument('--model', default='xgb')
+    parser.add_argument('--rows', type=int, default=None, help='liczba wierszy zbioru testowego (domyślnie wszystkie)')
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--packed', action='store_true')
+    parser.add_argument('--n-jobs', type=int, nargs='+', default=[1, -1])
+    args = parser.parse_args()
+
+    data = model_data()
+    X, y = data['X_test'], data['y_test']
+    X, y = (X[:args.rows], y[:args.rows]) if args.rows else (X, y)
+    model = load_model(args.model)
+    model = compile_model(model) if args.packed else model
+    groups = PreprocessingPipeline.load().encoder.feature_groups()
+    print(f"Zbiór testowy: {X.shape[0]:,} wierszy, {len(groups)} cech źródłowych × {args.repeats} powtórzeń\n")
+
+    for n_jobs in args.n_jobs:
+        start = time.perf_counter()
+        importance, baseline = permutation_importance(model, X, y, groups, args.repeats, n_jobs)
+        print(f"n_jobs={n_jobs:>3}: {time.perf_counter() - start:>8.1f} s, najważniejsza cecha: "
+              f"{importance['feature'][0]} (spadek AUC {importance['importance'][0]:.4f})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+# Ocena zapisanymi modelami (wypadki.scoring): przepustowość oceny pliku partiami (wiersze/min, cel >= 1 mln)
+# oraz opóźnienia małych zapytań online przez lokalny serwer HTTP (p50/p99).
+# Wymaga modeli i potoku zapisanych przez notebook (modele/xgb.joblib, modele/rf.joblib, modele/preprocessing.json).
+#
+#   python -m benchmarks.bench_scoring
+#   python -m benchmarks.bench_scoring --models xgb --requests 1000 --request-rows 1 10 100
+import argparse
+import json
+import tempfile
+import threading
+import time
+import urllib.request
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks._common import load_full_data
+from wypadki.scoring import BATCH_ROWS, Scorer, make_server, score_file
+
+
+def request_latencies(url, rows, n_requests):
+    body = json.dumps({'rows': rows}).encode('utf-8')
+    times = []
+    for _ in range(n_requests):
+        start = time.perf_counter()
+        request = urllib.request.Request(url, data=body, headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request) as response:
+            response.read()
+        times.append((time.perf_counter() - start) * 1000)
+    return np.array(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark oceny plików i zapytań online.')
+    parser.add_argument('--models', nargs='+', default=['xgb', 'rf'], choices=['xgb', 'rf'])
+    parser.add_argument('--packed', action='store_true', help='drzewa skompilowane do tablic NumPy (wypadki.packed)')
+    parser.add_argument('--batch-rows', type=int, default=BATCH_ROWS)
+    parser.add_argument('--requests', type=int, default=500, help='liczba zapytań HTTP na rozmiar')
+    parser.add_argument('--request-rows', type=int, nargs='+', default=[1, 10, 100])
+    args = parser.parse_args()
+
+    scorer = Scorer(args.models, packed=args.packed)
+    data = load_full_data()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'dane.parquet'
+        data.to_parquet(path, index=False)
+        with open(Path(tmp) / 'wynik.csv', 'w', newline='') as out:
+            stats = score_file(scorer, path, out, args.batch_rows)
+    print(f"Plik: {stats['rows']:,} wierszy w {stats['seconds']:.1f} s - {stats['rows_per_min']:,.0f} wierszy/min "
+          f"(cel 1 000 000: {'spełniony' if stats['rows_per_min'] >= 1_000_000 else 'NIESPEŁNIONY'})")
+
+    server = make_server(scorer, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_address[1]}/score'
+    records = json.loads(data.head(max(args.request_rows)).to_json(orient='records'))
+    print(f"\n{'wiersze':>8}{'p50 [ms]':>12}{'p99 [ms]':>12}{'max [ms]':>12}")
+    for n_rows in args.request_rows:
+        request_latencies(url, records[:n_rows], 10)  # rozgrzewka
+        times = request_latencies(url, records[:n_rows], args.requests)
+        print(f"{n_rows:>8}{np.percentile(times, 50):>12.2f}{np.percentile(times, 99):>12.2f}{times.max():>12.2f}")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
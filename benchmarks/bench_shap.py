@@ -0,0 +1,51 @@
+# Czas wyznaczania wartości SHAP (wypadki.explain.shap_values, TreeSHAP XGBoost) dla zbioru testowego:
+# jedna partia na wszystkich rdzeniach vs partie liczone równolegle, oraz rozmiar macierzy float16 vs float32
+# i największy błąd zaokrąglenia float16, a także addytywność względem serwowanego modelu (sigmoid(baza + suma SHAP)
+# vs predict_proba). Wymaga modelu zapisanego przez notebook (modele/xgb.joblib).
+#
+#   python -m benchmarks.bench_shap
+#   python -m benchmarks.bench_shap --rows 20000 --batch-rows 5000
+import argparse
+import time
+
+import numpy as np
+import xgboost as xgb
+
+from benchmarks._common import model_data
+from wypadki.explain import SHAP_BATCH_ROWS, _boosters, additivity_error, shap_values
+from wypadki.training import load_model
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark wartości SHAP (wypadki.explain).')
+    parser.add_argument('--model', default='xgb')
+    parser.add_argument('--rows', type=int, default=None, help='liczba wierszy zbioru testowego (domyślnie wszystkie)')
+    parser.add_argument('--batch-rows', type=int, default=SHAP_BATCH_ROWS)
+    args = parser.parse_args()
+
+    X = model_data()['X_test']
+    X = X[:args.rows] if args.rows else X
+    model = load_model(args.model)
+    print(f"Zbiór testowy: {X.shape[0]:,} wierszy × {X.shape[1]} kolumn\n")
+
+    for label, batch_rows in [('jedna partia', X.shape[0]), (f'partie po {args.batch_rows:,}', args.batch_rows)]:
+        start = time.perf_counter()
+        values, expected_value = shap_values(model, X, batch_rows)
+        print(f"{label:<24}{time.perf_counter() - start:>8.2f} s")
+
+    exact = _contributions_float32(model, X)
+    print(f"\nmacierz float32: {exact.nbytes / 2**20:.1f} MB, float16: {values.nbytes / 2**20:.1f} MB, "
+          f"maks. błąd float16: {np.abs(exact - values.astype('float32')).max():.2e}")
+    print(f"addytywność (float32): {additivity_error(model, X, exact, expected_value):.2e}, "
+          f"(float16): {additivity_error(model, X, values, expected_value):.2e}")
+
+
+def _contributions_float32(model, X):
+    # Wkłady bez konwersji do float16 (jedna partia) - punkt odniesienia dla błędu zaokrąglenia
+    dmatrix = xgb.DMatrix(X)
+    return np.mean([booster.predict(dmatrix, pred_contribs=True, iteration_range=(0, n_trees))[:, :-1]
+                    for booster, n_trees in _boosters(model)], axis=0)
+
+
+if __name__ == '__main__':
+    main()
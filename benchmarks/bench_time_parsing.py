@@ -0,0 +1,41 @@
+# Porównanie wyodrębniania godziny z kolumny `time`:
+# pd.to_datetime(..., format='%H:%M').dt.hour vs wektorowe odczytywanie cyfr (wypadki.time_parsing).
+#
+#   python -m benchmarks.bench_time_parsing              # pełny zbiór 2021-2023 ze snapshotu
+#   python -m benchmarks.bench_time_parsing --rows 5000000
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from benchmarks._common import benchmark_data, best_time
+from wypadki.time_parsing import extract_hour, extract_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark wyodrębniania godziny.')
+    parser.add_argument('--rows', type=int, default=None, help='liczba wierszy syntetycznych zamiast pełnego zbioru')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    times = benchmark_data(args.rows)['time'].dropna()
+    print(f'Wiersze: {len(times):,}')
+
+    t_datetime = best_time(lambda: pd.to_datetime(times, format='%H:%M').dt.hour, args.repeat)
+    t_hour = best_time(lambda: extract_hour(times), args.repeat)
+    t_full = best_time(lambda: extract_time(times, minute=True, time_of_day=True), args.repeat)
+    print(f'pd.to_datetime().dt.hour: {t_datetime:8.3f} s')
+    print(f'extract_hour:             {t_hour:8.3f} s   przyspieszenie: {t_datetime / t_hour:6.1f}x')
+    print(f'extract_time (+minuta, pora dnia): {t_full:8.3f} s')
+
+    # Kontrola zgodności wyników
+    expected = pd.to_datetime(times, format='%H:%M').dt.hour.to_numpy()
+    assert np.array_equal(extract_hour(times).to_numpy(dtype='int64'), expected)
+    print('Wyniki zgodne z pd.to_datetime.')
+
+    # Wartości błędne dają <NA> zamiast wyjątku
+    print(extract_time(pd.Series(['07:45', '7:05', '24:10', '12:60', 'abc', '', None]), time_of_day=True))
+
+
+if __name__ == '__main__':
+    main()
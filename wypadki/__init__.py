@@ -0,0 +1,2 @@
+# Pakiet pomocniczy projektu "Analiza wypadków drogowych UK" (dane STATS19, DfT).
+# Moduły są importowane bezpośrednio, np. `from wypadki.ingest import load_tables`.
@@ -0,0 +1,149 @@
+# Testy chi-kwadrat i V Craméra dla wielu cech naraz (sekcja VI: związek cech z is_rural_accident).
+# Zamiast pd.crosstab + chi2_contingency w pętli po cechach:
+#   - cechy kodowane są do liczb całkowitych 0..k-1 (z łączeniem rzadkich kategorii wg COLLAPSE, jak w notebooku),
+#   - wszystkie tabele kontyngencji powstają z jednego np.bincount na połączonych kodach (kod pary + przesunięcie
+#     tabeli), dla par (cecha, is_rural_accident) albo dla wszystkich par cech,
+#   - χ², p-value, V Craméra (zwykłe i z poprawką na obciążenie) liczone są wektorowo dla wszystkich tabel naraz
+#     (tabele dopełniane zerami do wspólnego rozmiaru).
+import itertools
+
+import numpy as np
+import pandas as pd
+from scipy.stats import chi2 as chi2_distribution
+
+# Łączenie kategorii przed testem: cecha -> (zachowywane kody, kod pozostałych), jak w notebooku
+COLLAPSE = {
+    'road_type': ([3, 6], 99),
+    'junction_control': ([4, 2], 9),
+    'junction_detail': ([1], 99),
+    'light_conditions': ([6], 99),
+    'casualty_type': ([9], 99),
+}
+
+# Cechy testowane w sekcji VI (key_features w notebooku)
+KEY_FEATURES = [
+    'is_urban_driver', 'road_type', 'junction_control', 'junction_detail',
+    'important_driver_distance', 'light_conditions', 'casualty_type', 'skidding_and_overturning'
+]
+
+# Limit elementów jednego wywołania np.bincount (pamięć tablicy połączonych kodów)
+MAX_BINCOUNT_ELEMENTS = 20_000_000
+
+
+def encode(data, features, collapse=COLLAPSE):
+    """Kody 0..k-1 cech (macierz n × len(features)) i wartości odpowiadające kodom; brak danych -> kod k."""
+    codes = np.empty((len(data), len(features)), dtype='int64')
+    levels = {}
+    for j, feature in enumerate(features):
+        values = data[feature].to_numpy(dtype='float64', na_value=np.nan)
+        missing = np.isnan(values)
+        if feature in collapse:
+            kept, other = collapse[feature]
+            values = np.where(np.isin(values, kept) | missing, values, other)
+        feature_levels = np.unique(values[~missing])
+        codes[:, j] = np.searchsorted(feature_levels, values)
+        codes[missing, j] = len(feature_levels)
+        # Kody STATS19 są całkowite - etykiety tabel bez '.0'
+        levels[feature] = feature_levels.astype('int64') if np.array_equal(feature_levels, np.round(feature_levels)) else feature_levels
+    return codes, levels
+
+
+def crosstabs(codes, n_levels, pairs, max_elements=MAX_BINCOUNT_ELEMENTS):
+    """Tabele kontyngencji dla par kolumn `codes` (bez wierszy z brakiem danych) z jednego bincount na porcję par."""
+    # Każda kolumna ma dodatkowy kod braku danych - odcinany po zliczeniu
+    sizes = [(n_levels[i] + 1) * (n_levels[j] + 1) for i, j in pairs]
+    chunk = max(1, max_elements // max(len(codes), 1))
+    tables = []
+    for start in range(0, len(pairs), chunk):
+        batch = pairs[start:start + chunk]
+        offsets = np.cumsum([0] + sizes[start:start + len(batch)])
+        flat = np.concatenate([offset + codes[:, i] * (n_levels[j] + 1) + codes[:, j]
+                               for offset, (i, j) in zip(offsets, batch)])
+        counts = np.bincount(flat, minlength=offsets[-1])
+        for offset, (i, j) in zip(offsets, batch):
+            table = counts[offset:offset + (n_levels[i] + 1) * (n_levels[j] + 1)].reshape(n_levels[i] + 1, n_levels[j] + 1)
+            tables.append(table[:-1, :-1])
+    return tables
+
+
+def chi2_tests(tables, correction=True):
+    """χ², p-value, stopnie swobody, V Craméra (zwykłe i z poprawką Bergsmy) oraz tabele oczekiwane dla listy tabel.
+    Jak scipy.stats.chi2_contingency: poprawka Yatesa dla tabel z 1 stopniem swobody (correction=True)."""
+    rows, cols = max(t.shape[0] for t in tables), max(t.shape[1] for t in tables)
+    observed = np.zeros((len(tables), rows, cols))
+    for k, table in enumerate(tables):
+        observed[k, :table.shape[0], :table.shape[1]] = table
+    n = observed.sum(axis=(1, 2))
+    row_sums, col_sums = observed.sum(axis=2), observed.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        expected = row_sums[:, :, None] * col_sums[:, None, :] / n[:, None, None]
+        # Wiersze i kolumny bez obserwacji (także dopełnienie) nie wchodzą do testu
+        r, c = (row_sums > 0).sum(axis=1), (col_sums > 0).sum(axis=1)
+        dof = (r - 1) * (c - 1)
+        diff = expected - observed
+        if correction:
+            yates = (dof == 1)[:, None, None]
+            observed = np.where(yates, observed + np.sign(diff) * np.minimum(0.5, np.abs(diff)), observed)
+        terms = np.where(expected > 0, (observed - expected) ** 2 / expected, 0.0)
+        statistic = np.where(dof > 0, terms.sum(axis=(1, 2)), np.nan)
+        p_value = chi2_distribution.sf(statistic, np.maximum(dof, 1))
+        cramer_v = np.sqrt(statistic / (n * (np.minimum(r, c) - 1)))
+        # Poprawka na obciążenie (Bergsma, 2013)
+        phi2 = np.maximum(0.0, statistic / n - (r - 1) * (c - 1) / (n - 1))
+        r_corr, c_corr = r - (r - 1) ** 2 / (n - 1), c - (c - 1) ** 2 / (n - 1)
+        cramer_v_corrected = np.sqrt(phi2 / np.minimum(r_corr - 1, c_corr - 1))
+    return [{
+        'statistic': float(statistic[k]), 'p_value': float(p_value[k]), 'dof': int(dof[k]),
+        'cramer_v': float(cramer_v[k]), 'cramer_v_corrected': float(cramer_v_corrected[k]),
+        'expected': expected[k, :table.shape[0], :table.shape[1]],
+    } for k, table in enumerate(tables)]
+
+
+def cramer_strength(cramer_v):
+    # Progi jak w notebooku (sekcja VI)
+    if np.isnan(cramer_v):
+        return 'N/A'
+    return 'Umiarkowany' if cramer_v >= 0.1 else 'Słaby'
+
+
+def _summary(rows):
+    return pd.DataFrame(rows).assign(strength=lambda df: df['cramer_v'].map(cramer_strength))
+
+
+def association_with_target(data, features, target='is_rural_accident', collapse=COLLAPSE, correction=True):
+    """Test chi-kwadrat każdej cechy z `target`: (podsumowanie, {cecha: tabela kontyngencji}).
+    Cechy nieobecne w danych lub bez wartości dostają wiersz z NaN (jak pominięty test w notebooku)."""
+    available = [f for f in features if f in data.columns and data[f].notna().any()]
+    codes, levels = encode(data, available + [target], collapse)
+    n_levels = [len(levels[f]) for f in available + [target]]
+    tables = crosstabs(codes, n_levels, [(j, len(available)) for j in range(len(available))])
+    tests = dict(zip(available, chi2_tests(tables, correction))) if tables else {}
+
+    rows, contingency_tables = [], {}
+    for feature, table in zip(available, tables):
+        contingency_tables[feature] = pd.DataFrame(table, index=pd.Index(levels[feature], name=feature),
+                                                   columns=pd.Index(levels[target], name=target))
+    for feature in features:
+        test = tests.get(feature, {'statistic': np.nan, 'p_value': np.nan, 'dof': 0, 'cramer_v': np.nan,
+                                   'cramer_v_corrected': np.nan})
+        rows.append({'feature': feature, **{k: v for k, v in test.items() if k != 'expected'}})
+    return _summary(rows), contingency_tables
+
+
+def pairwise_association(data, features, collapse=COLLAPSE, correction=True):
+    """Test chi-kwadrat i V Craméra dla wszystkich par cech: podsumowanie w układzie długim (feature_a, feature_b)."""
+    codes, levels = encode(data, features, collapse)
+    n_levels = [len(levels[f]) for f in features]
+    pairs = list(itertools.combinations(range(len(features)), 2))
+    tests = chi2_tests(crosstabs(codes, n_levels, pairs), correction) if pairs else []
+    return _summary([{'feature_a': features[i], 'feature_b': features[j], **{k: v for k, v in test.items() if k != 'expected'}}
+                     for (i, j), test in zip(pairs, tests)])
+
+
+def cramer_matrix(pairwise, column='cramer_v_corrected'):
+    """Symetryczna macierz V Craméra z wyniku pairwise_association (1 na przekątnej)."""
+    features = list(dict.fromkeys([*pairwise['feature_a'], *pairwise['feature_b']]))
+    matrix = pd.DataFrame(np.eye(len(features)), index=features, columns=features)
+    for a, b, value in zip(pairwise['feature_a'], pairwise['feature_b'], pairwise[column]):
+        matrix.loc[a, b] = matrix.loc[b, a] = value
+    return matrix
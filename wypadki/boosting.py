@@ -0,0 +1,74 @@
+# XGBoost w trybie histogramowym (tree_method='hist') na gotowej QuantileDMatrix, z wczesnym zatrzymaniem
+# na zbiorze walidacyjnym (X_val, y_val) zamiast stałej liczby drzew.
+#
+# Kwantyle cech (podział wartości na przedziały histogramu) liczone są raz, na całym zbiorze treningowym
+# (quantile_reference), i używane ponownie przez podzbiory walidacji krzyżowej i punkty krzywej uczenia
+# (parametr `ref`) - każda kolejna macierz jest tylko kwantyzowana według gotowych progów.
+import time
+
+import numpy as np
+import xgboost as xgb
+
+# Liczba rund bez poprawy AUC na zbiorze walidacyjnym, po której uczenie jest przerywane
+EARLY_STOPPING_ROUNDS = 30
+MAX_BIN = 256
+
+
+def quantile_reference(X, y=None, max_bin=MAX_BIN):
+    """QuantileDMatrix z kwantylami całego zbioru treningowego - wspólne progi dla kolejnych macierzy."""
+    return xgb.QuantileDMatrix(X, y, max_bin=max_bin)
+
+
+def native_params(params):
+    # Parametry XGBClassifier -> parametry xgb.train (n_estimators to liczba rund, n_jobs to nthread)
+    params = dict(params)
+    params.pop('n_estimators', None)
+    if 'n_jobs' in params:
+        params['nthread'] = params.pop('n_jobs')
+    return {'objective': 'binary:logistic', 'eval_metric': 'auc', 'tree_method': 'hist', **params}
+
+
+class HistXGB:
+    """XGBoost (hist) z interfejsem predict_proba / feature_importances_ jak XGBClassifier."""
+
+    def __init__(self, early_stopping_rounds=EARLY_STOPPING_ROUNDS, max_bin=MAX_BIN, **params):
+        self.params = {'n_estimators': 100, **params}
+        self.early_stopping_rounds = early_stopping_rounds
+        self.max_bin = max_bin
+        self.booster = None
+        self.best_iteration = None
+        self.fit_seconds = None
+
+    def fit(self, X, y, eval_set=None, ref=None):
+        """Uczy model; `eval_set=(X_val, y_val)` włącza wczesne zatrzymanie, `ref` to wynik quantile_reference."""
+        start = time.perf_counter()
+        dtrain = xgb.QuantileDMatrix(X, y, max_bin=self.max_bin, ref=ref)
+        evals = []
+        if eval_set is not None:
+            X_val, y_val = eval_set
+            evals = [(xgb.QuantileDMatrix(X_val, y_val, max_bin=self.max_bin, ref=ref if ref is not None else dtrain), 'val')]
+        self.booster = xgb.train(
+            native_params(self.params), dtrain,
+            num_boost_round=self.params['n_estimators'],
+            evals=evals,
+            early_stopping_rounds=self.early_stopping_rounds if evals else None,
+            verbose_eval=False,
+        )
+        self.best_iteration = self.booster.best_iteration if evals else self.params['n_estimators'] - 1
+        self.fit_seconds = time.perf_counter() - start
+        return self
+
+    def predict_proba(self, X):
+        proba = self.booster.inplace_predict(X, iteration_range=(0, self.best_iteration + 1))
+        return np.column_stack([1 - proba, proba])
+
+    def predict(self, X, threshold=0.5):
+        return (self.predict_proba(X)[:, 1] >= threshold).astype(int)
+
+    @property
+    def feature_importances_(self):
+        # Jak XGBClassifier: znormalizowany "gain" (cechy nieużyte w drzewach mają ważność 0)
+        scores = self.booster.get_score(importance_type='gain')
+        importances = np.array([scores.get(f'f{j}', 0.0) for j in range(self.booster.num_features())], dtype='float32')
+        total = importances.sum()
+        return importances / total if total > 0 else importances
@@ -0,0 +1,228 @@
+# Kompaktowy zapis modelu RandomForest (także FoldEnsemble z lasów z podzbiorów) do oceny i serwowania:
+#   - przycinanie: węzeł, którego oba liście dają to samo (skwantowane) prawdopodobieństwo, staje się liściem
+#     (powtarzane od dołu drzewa) - predykcja bez zmian,
+#   - kwantyzacja: progi jako indeksy do słownika unikalnych progów float32 (bezstratnie; indeks w najmniejszym typie
+#     bez znaku mieszczącym liczbę progów - uint16 do 65 535 progów, przy większym słowniku uint32), prawdopodobieństwa
+#     liści jako uint16 w skali 1/65535 (błąd < 8e-6), numer cechy w najmniejszym typie całkowitym,
+#   - węzły numerowane wszerz, dzieci obok siebie: zapisywane jest tylko lewe dziecko (prawe = lewe + 1),
+#   - opcjonalne ograniczenie liczby drzew: najmniejsza liczba drzew, dla której AUC na zbiorze walidacyjnym
+#     spada o nie więcej niż `auc_tolerance` względem całego lasu (drzewa podzbiorów brane na przemian),
+#   - zapis w katalogu modele/<model>_compact/ jako osobne pliki .npy + meta.json; load_compact() mapuje je
+#     do pamięci (np.load(mmap_mode='r')) - wczytanie nie czyta danych, strony pliku ładowane są przy pierwszej
+#     predykcji i współdzielone przez pamięć podręczną systemu między procesami (workery aplikacji, serwer oceny).
+#
+#   python -m wypadki.compact rf --auc-tolerance 0.001
+import argparse
+import json
+import time
+
+import numpy as np
+from scipy import sparse
+from sklearn.metrics import roc_auc_score
+
+from wypadki.config import MODELS_DIR, YEARS
+from wypadki.packed import BATCH_ROWS, sklearn_tree_arrays
+from wypadki.preprocessing import load_clean_data, saved_split_data
+from wypadki.training import FoldEnsemble, load_model, model_path
+
+# Skala prawdopodobieństw liści zapisanych jako uint16
+LEAF_SCALE = 65_535
+ARRAYS = ['roots', 'feature', 'threshold_index', 'left', 'value', 'thresholds']
+
+
+def compact_dir(name, models_dir=MODELS_DIR):
+    return models_dir / f'{name}_compact'
+
+
+def forest_estimators(model):
+    """Drzewa lasu lub zespołu lasów z podzbiorów - na przemian (1. drzewo każdego podzbioru, 2. drzewo...),
+    żeby każda liczba początkowych drzew równo reprezentowała podzbiory."""
+    forests = model.models if isinstance(model, FoldEnsemble) else [model]
+    if not all(hasattr(forest, 'estimators_') and hasattr(forest.estimators_[0], 'tree_') for forest in forests):
+        raise ValueError(f'Kompaktowy zapis obsługuje tylko RandomForestClassifier (model: {type(model).__name__})')
+    n_trees = min(len(forest.estimators_) for forest in forests)
+    return [forest.estimators_[k] for k in range(n_trees) for forest in forests]
+
+
+def _prune(left, right, value):
+    # Od dołu: węzeł z dwoma liśćmi o tej samej wartości staje się liściem; powtarzane, aż nic się nie zmieni
+    left, right = left.copy(), right.copy()
+    while True:
+        internal = np.flatnonzero(left != -1)
+        l, r = left[internal], right[internal]
+        merge = internal[(left[l] == -1) & (left[r] == -1) & (value[l] == value[r])]
+        if not merge.size:
+            return left, right
+        value[merge] = value[left[merge]]
+        left[merge] = right[merge] = -1
+
+
+def _breadth_first(left, right):
+    # Kolejność węzłów osiągalnych z korzenia poziomami (dzieci każdego węzła obok siebie) i głębokość drzewa
+    levels, level = [], np.array([0])
+    while level.size:
+        levels.append(level)
+        internal = level[left[level] != -1]
+        level = np.column_stack([left[internal], right[internal]]).ravel()
+    return np.concatenate(levels), len(levels) - 1
+
+
+class CompactForest:
+    """Las w kompaktowych tablicach: reguła `x < thresholds[threshold_index]` -> left, w przeciwnym razie left + 1.
+    Liść ma próg NaN (porównanie zawsze fałszywe) i left = własny numer - 1, więc wskazuje na siebie."""
+
+    def __init__(self, roots, feature, threshold_index, left, value, thresholds, depth, meta=None):
+        self.roots = roots
+        self.feature = feature
+        self.threshold_index = threshold_index
+        self.left = left
+        self.value = value
+        self.thresholds = thresholds
+        self.depth = depth
+        self.meta = meta or {}
+
+    @classmethod
+    def from_sklearn(cls, model):
+        trees, depth, offset = [], 0, 0
+        nodes_before = nodes_after = 0
+        for estimator in forest_estimators(model):
+            feature, threshold, left, right, _, proba = sklearn_tree_arrays(estimator.tree_)
+            value = np.rint(proba * LEAF_SCALE).astype('uint16')
+            pruned_left, pruned_right = _prune(left, right, value)
+            order, tree_depth = _breadth_first(pruned_left, pruned_right)
+            # Numer węzła po przenumerowaniu (globalny: przesunięcie o węzły poprzednich drzew)
+            new_id = np.empty(len(left), dtype='int64')
+            new_id[order] = np.arange(len(order)) + offset
+            leaf = pruned_left[order] == -1
+            trees.append((
+                np.where(leaf, 0, feature[order]),
+                np.where(leaf, np.nan, threshold[order]).astype('float32'),
+                np.where(leaf, new_id[order] - 1, new_id[np.maximum(pruned_left[order], 0)]),
+                value[order],
+            ))
+            depth = max(depth, tree_depth)
+            nodes_before += len(left)
+            nodes_after += len(order)
+            offset += len(order)
+        feature, threshold, left, value = (np.concatenate(column) for column in zip(*trees))
+        roots = np.cumsum([0] + [len(tree[0]) for tree in trees[:-1]]).astype('int32')
+        # Słownik progów: unikalne wartości float32, NaN (liście) na końcu; typ indeksu rośnie z liczbą progów
+        thresholds, threshold_index = np.unique(threshold, return_inverse=True)
+        return cls(roots, feature.astype(np.min_scalar_type(feature.max())),
+                   threshold_index.astype(np.min_scalar_type(len(thresholds))), left.astype('int32'), value,
+                   thresholds.astype('float32'), depth,
+                   meta={'nodes_before_pruning': int(nodes_before), 'nodes': int(nodes_after)})
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    def head(self, n_trees):
+        """Pierwsze `n_trees` drzew (węzły drzew leżą w tablicach kolejno)."""
+        if n_trees >= self.n_trees:
+            return self
+        end = self.roots[n_trees]
+        return CompactForest(self.roots[:n_trees], self.feature[:end], self.threshold_index[:end], self.left[:end],
+                             self.value[:end], self.thresholds, self.depth, meta={**self.meta, 'nodes': int(end)})
+
+    def leaf_values(self, X):
+        """Skwantowane prawdopodobieństwa liści: tablica (wiersze × drzewa) uint16."""
+        if sparse.issparse(X):
+            X = X.toarray()
+        X = np.asarray(X, dtype='float32')
+        nodes = np.broadcast_to(self.roots, (X.shape[0], self.n_trees)).copy()
+        for _ in range(self.depth):
+            x = np.take_along_axis(X, self.feature[nodes], axis=1)
+            nodes = self.left[nodes] + ~(x < self.thresholds[self.threshold_index[nodes]])
+        return self.value[nodes]
+
+    def predict_proba(self, X, batch_rows=BATCH_ROWS):
+        proba = np.empty(X.shape[0], dtype='float64')
+        for start in range(0, X.shape[0], batch_rows):
+            proba[start:start + batch_rows] = self.leaf_values(X[start:start + batch_rows]).mean(axis=1) / LEAF_SCALE
+        return np.column_stack([1 - proba, proba])
+
+    def auc_by_tree_count(self, X, y, counts):
+        """AUC średniej z pierwszych k drzew dla każdego k z `counts` (jedno przejście po wszystkich drzewach)."""
+        cumulative = np.zeros((X.shape[0], len(counts)))
+        for start in range(0, X.shape[0], BATCH_ROWS):
+            leaves = np.cumsum(self.leaf_values(X[start:start + BATCH_ROWS]), axis=1, dtype='float64')
+            cumulative[start:start + BATCH_ROWS] = leaves[:, np.asarray(counts) - 1]
+        return {k: float(roc_auc_score(y, cumulative[:, j])) for j, k in enumerate(counts)}
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in ARRAYS)
+
+    def save(self, directory):
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in ARRAYS:
+            np.save(directory / f'{name}.npy', getattr(self, name))
+        with open(directory / 'meta.json', 'w', encoding='utf-8') as f:
+            json.dump({**self.meta, 'depth': self.depth, 'n_trees': self.n_trees}, f, ensure_ascii=False, indent=2)
+        return directory
+
+    @classmethod
+    def load(cls, directory, mmap_mode='r'):
+        with open(directory / 'meta.json', encoding='utf-8') as f:
+            meta = json.load(f)
+        arrays = {name: np.load(directory / f'{name}.npy', mmap_mode=mmap_mode) for name in ARRAYS}
+        return cls(**arrays, depth=meta['depth'], meta=meta)
+
+
+def compact_model(model, X_val=None, y_val=None, auc_tolerance=0.001, step=10):
+    """Przycięty i skwantowany las; z danymi walidacyjnymi - także ograniczony do najmniejszej liczby drzew
+    z AUC nie niższym niż AUC całego lasu minus `auc_tolerance`."""
+    forest = CompactForest.from_sklearn(model)
+    if X_val is None:
+        return forest
+    counts = sorted({*range(step, forest.n_trees, step), forest.n_trees})
+    auc = forest.auc_by_tree_count(X_val, y_val, counts)
+    full_auc = auc[forest.n_trees]
+    n_trees = min(k for k in counts if auc[k] >= full_auc - auc_tolerance)
+    forest = forest.head(n_trees)
+    forest.meta.update({'val_auc': auc[n_trees], 'val_auc_all_trees': full_auc, 'trees_before': counts[-1]})
+    return forest
+
+
+def save_compact(model, name, X_val=None, y_val=None, auc_tolerance=0.001, models_dir=MODELS_DIR):
+    """Zapisuje kompaktowy las jako modele/<name>_compact/ (obok modele/<name>.joblib)."""
+    forest = compact_model(model, X_val, y_val, auc_tolerance)
+    forest.save(compact_dir(name, models_dir))
+    return forest
+
+
+def load_compact(name, models_dir=MODELS_DIR):
+    """Las zmapowany do pamięci (tylko do odczytu) - dane czytane z dysku dopiero przy predykcji."""
+    directory = compact_dir(name, models_dir)
+    if not (directory / 'meta.json').exists():
+        raise ValueError(f'Brak kompaktowego modelu {directory} - uruchom `python -m wypadki.compact {name}`.')
+    return CompactForest.load(directory)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Kompaktowy zapis modelu RandomForest (przycinanie, kwantyzacja, mmap).')
+    parser.add_argument('name', nargs='?', default='rf', help='nazwa modelu w katalogu modele/ (domyślnie rf)')
+    parser.add_argument('--auc-tolerance', type=float, default=0.001,
+                        help='dopuszczalny spadek AUC na zbiorze walidacyjnym przy ograniczaniu liczby drzew')
+    parser.add_argument('--all-trees', action='store_true', help='bez ograniczania liczby drzew')
+    args = parser.parse_args()
+
+    model = load_model(args.name)
+    X_val = y_val = None
+    if not args.all_trees:
+        # Zbiór walidacyjny jak w notebooku (podział 60/20/20, zapisany potok) - nieużywany do uczenia lasu
+        _, X_val, y_val = saved_split_data(load_clean_data(YEARS), 'val')
+    start = time.perf_counter()
+    forest = save_compact(model, args.name, X_val, y_val, args.auc_tolerance)
+    meta = forest.meta
+    print(f"Zapisano {compact_dir(args.name)} ({time.perf_counter() - start:.1f} s)")
+    print(f"  węzły: {meta['nodes_before_pruning']:,} -> {meta['nodes']:,} po przycięciu i ograniczeniu drzew")
+    if 'val_auc' in meta:
+        print(f"  drzewa: {meta['trees_before']} -> {forest.n_trees}, AUC walidacyjne {meta['val_auc_all_trees']:.4f} -> "
+              f"{meta['val_auc']:.4f}")
+    print(f"  rozmiar: joblib {model_path(args.name).stat().st_size / 2**20:.1f} MB -> tablice {forest.nbytes / 2**20:.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
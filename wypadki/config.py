@@ -0,0 +1,65 @@
+# Wspólne stałe projektu: źródła danych DfT (STATS19), lata analizy, katalogi robocze i listy kolumn
+from pathlib import Path
+
+# Katalogi robocze (względem katalogu głównego repozytorium)
+ROOT_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = ROOT_DIR / 'dane'
+RAW_DIR = DATA_DIR / 'raw'
+SNAPSHOT_DIR = DATA_DIR / 'snapshot'
+MODELS_DIR = ROOT_DIR / 'modele'
+RESULTS_DIR = ROOT_DIR / 'wyniki'
+
+# Linki do plików CSV (ostatnie 5 lat)
+casualties_url = 'https://data.dft.gov.uk/road-accidents-safety-data/dft-road-casualty-statistics-casualty-last-5-years.csv'
+vehicles_url = 'https://data.dft.gov.uk/road-accidents-safety-data/dft-road-casualty-statistics-vehicle-last-5-years.csv'
+accidents_url = 'https://data.dft.gov.uk/road-accidents-safety-data/dft-road-casualty-statistics-collision-last-5-years.csv'
+
+TABLE_URLS = {
+    'accidents': accidents_url,
+    'casualties': casualties_url,
+    'vehicles': vehicles_url,
+}
+
+# Lata objęte analizą
+YEARS = [2021, 2022, 2023]
+
+# Kolumny, w których -1 i 99 oznaczają brak danych
+columns_to_check_NaN = [
+    'road_type', 'light_conditions', 'junction_detail', 'junction_control', 'driver_home_area_type', 'accident_year',
+    'age_of_casualty', 'driver_distance_banding', 'weather_conditions', 'urban_or_rural_area', 'casualty_type',
+    'speed_limit', 'driver_imd_decile', 'age_of_vehicle', 'age_of_driver', 'number_of_casualties', 'skidding_and_overturning'
+]
+
+# Kolumny potrzebne w analizie, z podziałem na tabele.
+# `accident_year` jest kluczem partycji snapshotu - czytamy go tylko z tabeli wypadków, aby uniknąć sufiksów _x/_y po złączeniu.
+TABLE_COLUMNS = {
+    'accidents': [
+        'accident_index', 'accident_year', 'time', 'road_type', 'light_conditions', 'junction_detail',
+        'junction_control', 'weather_conditions', 'urban_or_rural_area', 'speed_limit', 'number_of_casualties'
+    ],
+    'casualties': [
+        'accident_index', 'vehicle_reference', 'casualty_reference', 'age_of_casualty', 'casualty_type'
+    ],
+    'vehicles': [
+        'accident_index', 'vehicle_reference', 'driver_home_area_type', 'driver_distance_banding', 'driver_imd_decile',
+        'age_of_vehicle', 'age_of_driver', 'skidding_and_overturning'
+    ],
+}
+
+# Wybór cech do modelu
+selected_features = [
+    'is_urban_driver', 'road_type', 'light_conditions', 'junction_detail', 'junction_control',
+    'driver_distance_banding', 'weather_conditions', 'is_rush_hour', 'age_of_driver_binned', 'age_of_casualty_binned',
+    'distance_speed_interaction', 'speed_limit_normalized', 'driver_imd_decile',
+    'hour_of_day', 'number_of_casualties', 'urban_driver_speed', 'skidding_and_overturning', 'casualty_type'
+]
+
+# Cechy kategorialne (kodowane zero-jedynkowo, drop_first=True) - w kolejności kolumn po kodowaniu
+categorical_features = [
+    'road_type', 'light_conditions', 'junction_detail', 'junction_control',
+    'age_of_casualty_binned', 'driver_distance_banding', 'is_rush_hour',
+    'weather_conditions', 'age_of_driver_binned', 'skidding_and_overturning', 'casualty_type'
+]
+
+# Cechy dołączane na końcu macierzy (dawniej liczone po kodowaniu zero-jedynkowym)
+engineered_features = ['important_driver_distance', 'urban_driver_long_distance', 'urban_driver_no_junction_control']
@@ -0,0 +1,196 @@
+# Kostka OLAP: liczby poszkodowanych w każdej kombinacji kluczowych wymiarów STATS19, liczona raz w notebooku
+# i zapisywana obok pakietu wyników (wyniki/cube_<wersja>.npz). Aplikacja filtruje ją zamiast danych wierszowych:
+#   - wymiary filtrów: rok, rodzaj drogi, warunki oświetlenia, ograniczenie prędkości, decyl IMD kierowcy,
+#   - wymiary miar: is_urban_driver × is_rural_accident - z nich powstają tabele sekcji III i test chi-kwadrat,
+#   - gęsta tablica 3 × 7 × 5 × 6 × 10 × 2 × 2 (~25 tys. komórek uint32, kilkadziesiąt kB po kompresji),
+#     a filtr to wybór indeksów wzdłuż osi i suma - ułamek milisekundy zamiast przeliczania 270 tys. wierszy.
+import math
+
+import numpy as np
+
+from wypadki.config import RESULTS_DIR
+from wypadki.features import is_rural_accident, is_urban_driver
+from wypadki.results import BUNDLE_VERSION
+
+# Wymiary, po których można filtrować, i ich opisy w aplikacji
+FILTER_DIMENSIONS = {
+    'accident_year': 'Rok',
+    'road_type': 'Rodzaj drogi',
+    'light_conditions': 'Warunki oświetlenia',
+    'speed_limit': 'Ograniczenie prędkości',
+    'driver_imd_decile': 'Decyl IMD kierowcy',
+}
+
+# Opisy kodów STATS19 (jak w opisie zmiennych w notebooku)
+VALUE_LABELS = {
+    'road_type': {1: 'Rondo', 2: 'Ulica jednokierunkowa', 3: 'Droga dwujezdniowa', 6: 'Droga jednojezdniowa',
+                  7: 'Droga dojazdowa', 9: 'Nieznana', 12: 'Ulica jednokierunkowa/droga dojazdowa'},
+    'light_conditions': {1: 'Światło dzienne', 4: 'Ciemność, oświetlenie działa', 5: 'Ciemność, oświetlenie nie działa',
+                         6: 'Ciemność, brak oświetlenia', 7: 'Ciemność, stan oświetlenia nieznany'},
+}
+
+DRIVERS_INDEX = ['kier. Wiejski', 'kier. Miejski']
+
+
+def value_label(dimension, value):
+    if dimension == 'speed_limit':
+        return f'{value} mph'
+    return VALUE_LABELS.get(dimension, {}).get(value, str(value))
+
+
+def cube_path(version=BUNDLE_VERSION, results_dir=RESULTS_DIR):
+    return results_dir / f'cube_{version}.npz'
+
+
+class OlapCube:
+    """Liczności w gęstej tablicy: jedna oś na wymiar, `values[wymiar]` - kody STATS19 kolejnych pozycji osi."""
+
+    def __init__(self, values, counts):
+        self.values = values
+        self.counts = counts
+
+    @classmethod
+    def build(cls, data):
+        """Kostka z oczyszczonych, złączonych danych (poziom poszkodowanego), jak `data` w notebooku."""
+        columns = {name: data[name].to_numpy(dtype='int16') for name in FILTER_DIMENSIONS}
+        columns['is_urban_driver'] = is_urban_driver(data, None)
+        columns['is_rural_accident'] = is_rural_accident(data, None)
+        values, positions = {}, []
+        for name, column in columns.items():
+            values[name], inverse = np.unique(column, return_inverse=True)
+            positions.append(inverse)
+        shape = tuple(len(v) for v in values.values())
+        # Jedno zliczenie (bincount) po spłaszczonych indeksach komórek
+        flat = np.ravel_multi_index(positions, shape)
+        counts = np.bincount(flat, minlength=math.prod(shape)).reshape(shape).astype('uint32')
+        return cls(values, counts)
+
+    @classmethod
+    def merge(cls, cubes):
+        """Suma kostek o tych samych wymiarach (np. kolejnych lat) - osie są sumą zbiorów wartości."""
+        dimensions = cubes[0].dimensions
+        values = {name: np.unique(np.concatenate([cube.values[name] for cube in cubes])) for name in dimensions}
+        counts = np.zeros(tuple(len(v) for v in values.values()), dtype='int64')
+        for cube in cubes:
+            positions = [np.searchsorted(values[name], cube.values[name]) for name in dimensions]
+            counts[np.ix_(*positions)] += cube.counts
+        return cls(values, counts.astype('uint32'))
+
+    def to_dict(self):
+        return {'values': {name: v.tolist() for name, v in self.values.items()}, 'counts': self.counts.ravel().tolist()}
+
+    @classmethod
+    def from_dict(cls, d):
+        values = {name: np.array(v) for name, v in d['values'].items()}
+        return cls(values, np.array(d['counts'], dtype='uint32').reshape(tuple(len(v) for v in values.values())))
+
+    @property
+    def dimensions(self):
+        return list(self.values)
+
+    def select(self, filters=None):
+        """Kostka zawężona do wybranych kodów, np. filters={'accident_year': [2022], 'speed_limit': [60, 70]}."""
+        counts, values = self.counts, dict(self.values)
+        for name, selected in (filters or {}).items():
+            if not selected:
+                continue
+            axis = self.dimensions.index(name)
+            keep = np.flatnonzero(np.isin(self.values[name], selected))
+            counts = np.take(counts, keep, axis=axis)
+            values[name] = self.values[name][keep]
+        return OlapCube(values, counts)
+
+    def totals(self, *dimensions):
+        """Liczności zsumowane po pozostałych wymiarach (osie w kolejności `dimensions`)."""
+        axes = [self.dimensions.index(name) for name in dimensions]
+        other = tuple(axis for axis in range(self.counts.ndim) if axis not in axes)
+        summed = self.counts.sum(axis=other, dtype='int64')
+        # Po sumowaniu osie zostają w kolejności kostki - przestawiamy je na kolejność argumentów
+        return summed.transpose(np.argsort(np.argsort(axes)))
+
+    def save(self, version=BUNDLE_VERSION, results_dir=RESULTS_DIR):
+        path = cube_path(version, results_dir)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(path, counts=self.counts, dimensions=np.array(self.dimensions),
+                            **{f'values_{name}': v for name, v in self.values.items()})
+        return path
+
+    @classmethod
+    def load(cls, version=BUNDLE_VERSION, results_dir=RESULTS_DIR):
+        """Kostka zapisana dla danej wersji wyników lub None, gdy jej nie zapisano."""
+        path = cube_path(version, results_dir)
+        if not path.exists():
+            return None
+        with np.load(path) as npz:
+            return cls({str(name): npz[f'values_{name}'] for name in npz['dimensions']}, npz['counts'])
+
+
+def _split(data, index, columns):
+    # Tabela w formacie wypadki.results.table (orient='split'), bez pandas
+    return {'index': list(index), 'columns': list(columns), 'data': data}
+
+
+def _percent(part, whole):
+    return round(100 * part / whole, 1) if whole else float('nan')
+
+
+def chi2_2x2(observed):
+    """Test chi-kwadrat niezależności tabeli 2×2 z poprawką Yatesa (jak scipy.stats.chi2_contingency):
+    (statystyka, p-value, liczba stopni swobody, tabela oczekiwana)."""
+    observed = np.asarray(observed, dtype='float64')
+    n = observed.sum()
+    expected = np.outer(observed.sum(axis=1), observed.sum(axis=0)) / n if n else np.zeros_like(observed)
+    if (expected == 0).any():
+        return float('nan'), float('nan'), 1, expected
+    diff = expected - observed
+    corrected = observed + np.sign(diff) * np.minimum(0.5, np.abs(diff))
+    statistic = float(((corrected - expected) ** 2 / expected).sum())
+    # Rozkład chi-kwadrat z 1 stopniem swobody: P(X > x) = erfc(sqrt(x / 2))
+    return statistic, math.erfc(math.sqrt(statistic / 2)), 1, expected
+
+
+def phi_strength(phi):
+    if phi < 0.1:
+        return "Bardzo słaby (φ < 0.1)"
+    if phi < 0.3:
+        return "Słaby (φ = 0.1–0.3)"
+    if phi < 0.5:
+        return "Umiarkowany (φ = 0.3–0.5)"
+    return "Silny (φ ≥ 0.5)"
+
+
+def drivers_section(cube, alpha=0.05):
+    """Tabele i test chi-kwadrat sekcji III (struktura jak `sections['drivers']` w pakiecie wyników) z kostki."""
+    # contingency[is_urban_driver, is_rural_accident]; osie miar mają zawsze kody 0 i 1
+    contingency = cube.totals('is_urban_driver', 'is_rural_accident')
+    by_year = cube.totals('accident_year', 'is_urban_driver')
+    total = int(contingency.sum())
+    rural, urban = (int(v) for v in contingency.sum(axis=1))
+
+    statistic, p_value, dof, expected = chi2_2x2(contingency)
+    phi = math.sqrt(statistic / total) if total and not math.isnan(statistic) else float('nan')
+    stats_rows = []
+    for year, (rural_year, urban_year) in zip(cube.values['accident_year'].tolist(), by_year.tolist()):
+        year_total = rural_year + urban_year
+        stats_rows.append([year, rural_year, _percent(rural_year, year_total), urban_year, _percent(urban_year, year_total),
+                           year_total])
+    return {
+        'total_accidents': total,
+        'driver_origin': _split([['kier. Miejski', urban, _percent(urban, total)],
+                                 ['kier. Wiejski', rural, _percent(rural, total)],
+                                 ['Suma', total, 100.0]],
+                                range(3), ['Pochodzenie', 'Liczba', 'Procent']),
+        'driver_stats': _split(stats_rows, range(len(stats_rows)),
+                               ['Rok', 'kier. Wiejski', 'kier. Wiejskich (%)', 'kier. Miejski', 'kier. Miejskich (%)', 'Suma']),
+        'contingency': _split(contingency.tolist(), DRIVERS_INDEX, ['Wypadek obszar Miejski', 'Wypadek obszar Wiejski']),
+        'location_stats': _split([[_percent(row[0], row.sum()), _percent(row[1], row.sum())] for row in contingency],
+                                 DRIVERS_INDEX, ['Wypadki obszar Miejski (%)', 'Wypadki obszar Wiejski (%)']),
+        'expected': _split(expected.round(1).tolist(), DRIVERS_INDEX, ['Wypadek obszar Miejski', 'Wypadek obszar Wiejski']),
+        'chi2': {
+            'statistic': statistic, 'p_value': p_value, 'dof': dof, 'phi': phi,
+            'strength': phi_strength(phi) if not math.isnan(phi) else 'Brak danych',
+            'alpha': alpha,
+            'conclusion': ("Odrzucamy hipotezę zerową (H₀). Istnieje statystycznie istotny związek (p < 0.05)." if p_value < alpha
+                           else "Nie ma podstaw do odrzucenia hipotezy zerowej (H₀) (p ≥ 0.05)."),
+        },
+    }
@@ -0,0 +1,141 @@
+# Kodowanie cech do macierzy modelu bez gęstej ramki z pd.get_dummies.
+# Słownik kategorii (kolejność kolumn) ustalany jest raz na danych uczących i zapisywany do JSON,
+# dzięki czemu zbiór testowy i nowe dane mają zawsze te same kolumny (bez X_test.reindex(...)).
+#
+# Dwie postacie wyniku:
+#   transform()             - macierz rzadka CSR (float32): pamięć rośnie z liczbą kolumn liczbowych i jedynek,
+#                             a nie z liczbą wierszy × liczbą kolumn zero-jedynkowych; kolumny liczbowe zapisane są
+#                             w każdym wierszu (także zera - XGBoost czyta nieobecny element CSR jako brak danych,
+#                             a nie 0), nieobecne są tylko zera kolumn zero-jedynkowych i braki (NaN),
+#   to_categorical_frame()  - ramka z kolumnami typu category dla XGBoost (enable_categorical=True).
+import json
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from wypadki.config import categorical_features, engineered_features, selected_features
+
+
+def _plain(value):
+    # Wartości NumPy -> typy Pythona (zapis do JSON)
+    return value.item() if hasattr(value, 'item') else value
+
+
+def stored_columns(X):
+    """Kolumny macierzy CSR zapisane w każdym wierszu (np. kolumny liczbowe z SparseOneHotEncoder.transform)."""
+    X = sparse.csr_matrix(X)
+    return np.flatnonzero(np.bincount(X.indices, minlength=X.shape[1]) == X.shape[0])
+
+
+def store_zeros(X, columns, start=0):
+    """Macierz CSR z jawnymi zerami w kolumnach `columns` wierszy od `start` w miejscu nieobecnych elementów.
+
+    Arytmetyka na macierzach rzadkich (np. wiersze syntetyczne SMOTE) usuwa zera, które XGBoost czytałby jako braki.
+    """
+    X = sparse.csr_matrix(X)
+    columns = np.asarray(columns, dtype='int64')
+    block = X[start:][:, columns]
+    block.data = np.ones_like(block.data)
+    missing_rows, missing_cols = np.nonzero(block.toarray() == 0)
+    coo = X.tocoo()
+    return sparse.csr_matrix((
+        np.concatenate([coo.data, np.zeros(len(missing_rows), dtype=X.dtype)]),
+        (np.concatenate([coo.row, missing_rows + start]), np.concatenate([coo.col, columns[missing_cols]])),
+    ), shape=X.shape, dtype=X.dtype)
+
+
+class SparseOneHotEncoder:
+    def __init__(self, numeric=None, categorical=None, drop_first=True):
+        self.numeric = numeric or [f for f in selected_features if f not in categorical_features] + engineered_features
+        self.categorical = categorical or categorical_features
+        self.drop_first = drop_first
+        self.categories = {}
+
+    def fit(self, data):
+        for column in self.categorical:
+            values = data[column]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                # Jak pd.get_dummies: wszystkie kategorie typu category, także nieobecne w danych
+                categories = list(values.cat.categories)
+            else:
+                categories = sorted(values.dropna().unique().tolist())
+            self.categories[column] = [_plain(v) for v in categories]
+        return self
+
+    def _kept(self, column):
+        categories = self.categories[column]
+        return categories[1:] if self.drop_first else categories
+
+    @property
+    def feature_names(self):
+        # Nazwy jak w pd.get_dummies: <kolumna>_<wartość>
+        dummies = [f'{column}_{value}' for column in self.categorical for value in self._kept(column)]
+        return self.numeric + dummies
+
+    def feature_groups(self):
+        """Kolumny macierzy według cech źródłowych: {cecha: [indeksy kolumn]} (kolumny zero-jedynkowe cechy razem)."""
+        groups = {column: [j] for j, column in enumerate(self.numeric)}
+        offset = len(self.numeric)
+        for column in self.categorical:
+            groups[column] = list(range(offset, offset + len(self._kept(column))))
+            offset += len(self._kept(column))
+        return groups
+
+    def transform(self, data):
+        n_rows = len(data)
+        row_ids = np.arange(n_rows)
+        rows, cols, vals = [], [], []
+
+        # Kolumny liczbowe: wszystkie wartości poza NaN, z jawnymi zerami (NaN - nieobecny element, brak dla XGBoost)
+        for j, column in enumerate(self.numeric):
+            values = data[column].to_numpy(dtype='float32', na_value=np.nan)
+            present = ~np.isnan(values)
+            rows.append(row_ids[present])
+            cols.append(np.full(present.sum(), j))
+            vals.append(values[present])
+
+        # Kolumny zero-jedynkowe: jedna jedynka na wiersz (brak, gdy kategoria pominięta lub nieznana)
+        offset = len(self.numeric)
+        for column in self.categorical:
+            kept = self._kept(column)
+            codes = pd.Categorical(data[column], categories=kept).codes
+            hit = codes >= 0
+            rows.append(row_ids[hit])
+            cols.append(offset + codes[hit])
+            vals.append(np.ones(hit.sum(), dtype='float32'))
+            offset += len(kept)
+
+        return sparse.csr_matrix(
+            (np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+            shape=(n_rows, offset), dtype='float32',
+        )
+
+    def fit_transform(self, data):
+        return self.fit(data).transform(data)
+
+    def to_categorical_frame(self, data):
+        """Ramka dla XGBoost z enable_categorical=True: stałe kategorie z dopasowania, bez kodowania zero-jedynkowego."""
+        frame = pd.DataFrame({column: data[column].to_numpy(dtype='float32', na_value=np.nan) for column in self.numeric},
+                             index=data.index)
+        for column in self.categorical:
+            frame[column] = pd.Categorical(data[column], categories=self.categories[column])
+        return frame
+
+    def to_dict(self):
+        return {'numeric': self.numeric, 'categorical': self.categorical,
+                'drop_first': self.drop_first, 'categories': self.categories}
+
+    @classmethod
+    def from_dict(cls, d):
+        encoder = cls(d['numeric'], d['categorical'], d['drop_first'])
+        encoder.categories = d['categories']
+        return encoder
+
+    def save(self, path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2, ensure_ascii=False), encoding='utf-8')
+
+    @classmethod
+    def load(cls, path):
+        return cls.from_dict(json.loads(path.read_text(encoding='utf-8')))
@@ -0,0 +1,108 @@
+# Ocena modeli na podstawie zapisanych predykcji zbioru testowego.
+# Notebook zapisuje prawdopodobieństwa obu modeli (float16) i etykiety do wyniki/predictions_<wersja>.npz
+# (obok pakietu wyników bundle_<wersja>.json), a aplikacja liczy z nich krzywe ROC/PR i macierz pomyłek:
+#   - ThresholdIndex: posortowane wyniki + skumulowana liczba przypadków pozytywnych - macierz pomyłek dla
+#     dowolnego progu to jedno wyszukiwanie binarne (O(log n)),
+#   - krzywe mają po jednym punkcie na różną wartość progu (dziesiątki tysięcy punktów), więc przed rysowaniem
+#     upraszczane są algorytmem Douglasa-Peuckera do kilkuset wierzchołków.
+import numpy as np
+
+from wypadki.config import RESULTS_DIR
+from wypadki.results import BUNDLE_VERSION
+
+# Maksymalne odchylenie uproszczonej krzywej od pełnej (w jednostkach osi 0-1)
+DECIMATE_TOLERANCE = 1e-3
+
+
+def predictions_path(version=BUNDLE_VERSION, results_dir=RESULTS_DIR):
+    return results_dir / f'predictions_{version}.npz'
+
+
+def save_predictions(y_true, probas, version=BUNDLE_VERSION, results_dir=RESULTS_DIR):
+    """Zapisuje etykiety (int8) i prawdopodobieństwa klasy 1 każdego modelu (float16), np. probas={'xgb': ..., 'rf': ...}."""
+    path = predictions_path(version, results_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(path, y_true=np.asarray(y_true, dtype='int8'),
+                        **{name: np.asarray(proba, dtype='float16') for name, proba in probas.items()})
+    return path
+
+
+def load_predictions(version=BUNDLE_VERSION, results_dir=RESULTS_DIR):
+    """(y_true, {model: prawdopodobieństwa}) lub None, gdy dla danej wersji nie zapisano predykcji."""
+    path = predictions_path(version, results_dir)
+    if not path.exists():
+        return None
+    with np.load(path) as npz:
+        return npz['y_true'], {name: npz[name] for name in npz.files if name != 'y_true'}
+
+
+class ThresholdIndex:
+    """Wyniki posortowane rosnąco ze skumulowaną liczbą przypadków pozytywnych - macierz pomyłek w O(log n)."""
+
+    def __init__(self, y_true, scores):
+        y_true = np.asarray(y_true)
+        order = np.argsort(scores, kind='stable')
+        self.scores = np.asarray(scores, dtype='float32')[order]
+        # positives_below[k] = liczba przypadków pozytywnych wśród k najniższych wyników
+        self.positives_below = np.concatenate([[0], np.cumsum(y_true[order] == 1)])
+        self.n = len(self.scores)
+        self.n_pos = int(self.positives_below[-1])
+        self.n_neg = self.n - self.n_pos
+
+    def confusion(self, threshold):
+        """Macierz pomyłek dla predykcji `wynik >= threshold`: słownik tn, fp, fn, tp."""
+        below = int(np.searchsorted(self.scores, threshold, side='left'))
+        fn = int(self.positives_below[below])
+        tn = below - fn
+        tp = self.n_pos - fn
+        return {'tn': tn, 'fp': self.n_neg - tn, 'fn': fn, 'tp': tp}
+
+    def _curve_counts(self):
+        # Dla każdego różnego wyniku (od najwyższego) jako progu: liczba trafnych i wszystkich predykcji pozytywnych
+        below = np.flatnonzero(np.r_[True, np.diff(self.scores) > 0])[::-1]
+        return self.n_pos - self.positives_below[below], self.n - below
+
+    def roc(self):
+        """Pełna krzywa ROC: (fpr, tpr) od punktu (0, 0) do (1, 1)."""
+        tp, predicted = self._curve_counts()
+        tp, fp = np.r_[0, tp], np.r_[0, predicted - tp]
+        return fp / max(self.n_neg, 1), tp / max(self.n_pos, 1)
+
+    def precision_recall(self):
+        """Pełna krzywa precision-recall: (recall, precision) dla malejących progów."""
+        tp, predicted = self._curve_counts()
+        return tp / max(self.n_pos, 1), tp / predicted
+
+    def auc(self):
+        # Pole pod krzywą ROC metodą trapezów
+        fpr, tpr = self.roc()
+        return float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1]) / 2))
+
+
+def douglas_peucker(x, y, tolerance=DECIMATE_TOLERANCE):
+    """Indeksy wierzchołków krzywej (x, y) uproszczonej algorytmem Douglasa-Peuckera (pierwszy i ostatni zachowane)."""
+    x, y = np.asarray(x, dtype='float64'), np.asarray(y, dtype='float64')
+    keep = np.zeros(len(x), dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, len(x) - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        dx, dy = x[end] - x[start], y[end] - y[start]
+        px, py = x[start + 1:end] - x[start], y[start + 1:end] - y[start]
+        norm = np.hypot(dx, dy)
+        # Odległość punktów pośrednich od odcinka (start, end)
+        distance = np.abs(dx * py - dy * px) / norm if norm > 0 else np.hypot(px, py)
+        split = int(np.argmax(distance))
+        if distance[split] > tolerance:
+            split += start + 1
+            keep[split] = True
+            stack.extend([(start, split), (split, end)])
+    return np.flatnonzero(keep)
+
+
+def decimate(x, y, tolerance=DECIMATE_TOLERANCE):
+    """Krzywa (x, y) z wierzchołkami wybranymi przez douglas_peucker - do rysowania w Plotly."""
+    keep = douglas_peucker(x, y, tolerance)
+    return np.asarray(x)[keep], np.asarray(y)[keep]
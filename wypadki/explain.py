@@ -0,0 +1,190 @@
+# Wyjaśnienia predykcji modelu XGBoost wartościami SHAP (TreeSHAP wbudowany w XGBoost: predict(pred_contribs=True)).
+#   - wkłady cech liczone są partiami wierszy zbioru testowego, partie równolegle (wątki - XGBoost zwalnia GIL,
+#     rdzenie dzielone między partie); dla modelu uczonego na całym zbiorze (train_model(refit=True)) są dokładne,
+#     dla FoldEnsemble to średnia wkładów modeli podzbiorów - wyjaśnia ona średni logit modeli, a nie logit średniego
+#     prawdopodobieństwa zwracanego przez FoldEnsemble.predict_proba (przybliżenie),
+#   - addytywność sprawdzana jest względem serwowanego modelu: sigmoid(wartość bazowa + suma wkładów) vs predict_proba;
+#     największa różnica trafia do podsumowania (additivity_max_error),
+#   - pełna macierz wkładów (wiersze × kolumny modelu) zapisywana jest jako float16 w wyniki/shap_<wersja>.npz,
+#   - do pakietu wyników trafia tylko podsumowanie (sekcja 'shap'): średnie |SHAP| kolumn i cech źródłowych
+#     (kolumny zero-jedynkowe jednej cechy sumowane) oraz tabele zależności - średni wkład cechy w każdej kategorii
+#     lub przedziale wartości. Aplikacja czyta gotowe tabele i nigdy nie liczy SHAP podczas obsługi strony.
+#
+#   python -m wypadki.explain            # przelicza SHAP zapisanego modelu xgb i dopisuje sekcję do pakietu wyników
+import argparse
+import os
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from scipy import sparse
+
+from wypadki.config import RESULTS_DIR, YEARS
+from wypadki.cube import value_label
+from wypadki.preprocessing import load_clean_data, saved_split_data
+from wypadki.results import BUNDLE_VERSION, available_bundles, export_bundle, load_bundle, table
+from wypadki.training import FoldEnsemble, load_model
+
+SHAP_BATCH_ROWS = 20_000
+TOP_FEATURES = 12
+# Cechy liczbowe o większej liczbie wartości dzielone są na przedziały kwantylowe
+MAX_LEVELS = 24
+N_BINS = 10
+
+
+def shap_path(version=BUNDLE_VERSION, results_dir=RESULTS_DIR):
+    return results_dir / f'shap_{version}.npz'
+
+
+def _boosters(model):
+    # (booster, koniec zakresu drzew) każdego modelu XGBoost; 0 = wszystkie drzewa
+    boosters = []
+    for member in (model.models if isinstance(model, FoldEnsemble) else [model]):
+        if hasattr(member, 'booster'):
+            boosters.append((member.booster, member.best_iteration + 1))
+        elif hasattr(member, 'get_booster'):
+            best_iteration = getattr(member, 'best_iteration', None)
+            boosters.append((member.get_booster(), best_iteration + 1 if best_iteration is not None else 0))
+        else:
+            raise ValueError(f'Wartości SHAP (pred_contribs) liczone są tylko dla modeli XGBoost (model: {type(member).__name__})')
+    return boosters
+
+
+def _contributions(boosters, X):
+    dmatrix = xgb.DMatrix(X)
+    contributions = np.mean([booster.predict(dmatrix, pred_contribs=True, iteration_range=(0, n_trees))
+                             for booster, n_trees in boosters], axis=0)
+    # Ostatnia kolumna to wartość bazowa (taka sama w każdym wierszu)
+    return contributions[:, :-1].astype('float16'), float(contributions[0, -1])
+
+
+def shap_values(model, X, batch_rows=SHAP_BATCH_ROWS, n_jobs=-1):
+    """Wartości SHAP wierszy X w skali logitu: (macierz float16 wiersze × kolumny, wartość bazowa)."""
+    starts = range(0, X.shape[0], batch_rows)
+    n_parallel = min(len(starts), os.cpu_count() or 1) if n_jobs == -1 else n_jobs
+    # Rdzenie dzielone między równolegle liczone partie (bez nadsubskrypcji wątków)
+    boosters = []
+    for booster, n_trees in _boosters(model):
+        booster = booster.copy()
+        booster.set_param({'nthread': max(1, (os.cpu_count() or 1) // n_parallel)})
+        boosters.append((booster, n_trees))
+    results = joblib.Parallel(n_jobs=n_parallel, prefer='threads')(
+        joblib.delayed(_contributions)(boosters, X[start:start + batch_rows]) for start in starts
+    )
+    return np.concatenate([values for values, _ in results]), results[0][1]
+
+
+def save_shap(values, expected_value, feature_names, version=BUNDLE_VERSION, results_dir=RESULTS_DIR):
+    path = shap_path(version, results_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(path, values=np.asarray(values, dtype='float16'), expected_value=expected_value,
+                        feature_names=np.array(feature_names))
+    return path
+
+
+def load_shap(version=BUNDLE_VERSION, results_dir=RESULTS_DIR):
+    """(macierz SHAP, wartość bazowa, nazwy kolumn) lub None, gdy dla danej wersji nie zapisano wartości SHAP."""
+    path = shap_path(version, results_dir)
+    if not path.exists():
+        return None
+    with np.load(path) as npz:
+        return npz['values'], float(npz['expected_value']), npz['feature_names'].tolist()
+
+
+def _levels(block, feature, encoder):
+    # Kod poziomu każdego wiersza i etykiety poziomów: kategoria (cechy zero-jedynkowe) lub wartość/przedział
+    if feature in encoder.categorical:
+        categories = encoder.categories[feature]
+        # Żadna kolumna zero-jedynkowa nie jest aktywna -> kategoria bazowa (pominięta przy drop_first) lub brak
+        labels = categories if encoder.drop_first else ['brak', *categories]
+        codes = np.where(block.any(axis=1), block.argmax(axis=1) + 1, 0)
+        return codes, [value_label(feature, value) for value in labels]
+    values = block[:, 0]
+    known = values[~np.isnan(values)]
+    unique = np.unique(known)
+    if len(unique) <= MAX_LEVELS:
+        labels = [f'{value:g}' for value in unique]
+        codes = np.searchsorted(unique, values)
+    else:
+        edges = np.unique(np.quantile(known, np.linspace(0, 1, N_BINS + 1)))
+        labels = [f'{low:.3g} – {high:.3g}' for low, high in zip(edges[:-1], edges[1:])]
+        codes = np.clip(np.searchsorted(edges, values, side='right') - 1, 0, len(edges) - 2)
+    # Braki danych poza tabelą
+    return np.where(np.isnan(values), -1, codes), labels
+
+
+def dependence_table(X, values, feature, encoder):
+    """Średni wkład SHAP cechy źródłowej w każdej kategorii lub przedziale wartości (tylko poziomy z wierszami)."""
+    columns = encoder.feature_groups()[feature]
+    block = X[:, columns]
+    block = block.toarray() if sparse.issparse(block) else np.asarray(block)
+    codes, labels = _levels(block, feature, encoder)
+    contribution = values[:, columns].astype('float32').sum(axis=1)
+    kept = codes >= 0
+    counts = np.bincount(codes[kept], minlength=len(labels))
+    total = np.bincount(codes[kept], weights=contribution[kept], minlength=len(labels))
+    total_abs = np.bincount(codes[kept], weights=np.abs(contribution[kept]), minlength=len(labels))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        df = pd.DataFrame({'Wartość': labels, 'Liczba wierszy': counts,
+                           'Średni SHAP': total / counts, 'Średnie |SHAP|': total_abs / counts})
+    return df[df['Liczba wierszy'] > 0].reset_index(drop=True)
+
+
+def additivity_error(model, X, values, expected_value):
+    """Największa różnica między sigmoid(wartość bazowa + suma wkładów SHAP) a model.predict_proba(X)[:, 1].
+
+    Dla pojedynczego modelu XGBoost różnica to tylko zaokrąglenie float16; dla FoldEnsemble obejmuje też
+    przybliżenie średniej prawdopodobieństw średnim logitem.
+    """
+    margin = expected_value + np.asarray(values, dtype='float32').sum(axis=1, dtype='float64')
+    return float(np.abs(1 / (1 + np.exp(-margin)) - model.predict_proba(X)[:, 1]).max())
+
+
+def shap_summary(values, expected_value, X, encoder, top=TOP_FEATURES, model=None):
+    """Sekcja 'shap' pakietu wyników: średnie |SHAP| kolumn modelu i cech źródłowych oraz tabele zależności
+    dla `top` najważniejszych cech źródłowych; z podanym `model` także błąd addytywności (additivity_error)."""
+    additivity = additivity_error(model, X, values, expected_value) if model is not None else None
+    values = np.asarray(values, dtype='float32')
+    groups = encoder.feature_groups()
+    features = pd.DataFrame({'Cecha': list(groups),
+                             'Średnie |SHAP|': [np.abs(values[:, columns].sum(axis=1)).mean() for columns in groups.values()]})
+    features = features.sort_values('Średnie |SHAP|', ascending=False).reset_index(drop=True)
+    columns = pd.DataFrame({'Cecha': encoder.feature_names, 'Średnie |SHAP|': np.abs(values).mean(axis=0)})
+    columns = columns.sort_values('Średnie |SHAP|', ascending=False).head(top).reset_index(drop=True)
+    return {
+        'expected_value': expected_value,
+        'rows': int(values.shape[0]),
+        'additivity_max_error': additivity,
+        'features': table(features),
+        'columns': table(columns),
+        'dependence': {feature: table(dependence_table(X, values, feature, encoder))
+                       for feature in features['Cecha'].head(top)},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Wartości SHAP modelu XGBoost na zbiorze testowym (TreeSHAP).')
+    parser.add_argument('--model', default='xgb', help='nazwa modelu w katalogu modele/ (domyślnie xgb)')
+    parser.add_argument('--batch-rows', type=int, default=SHAP_BATCH_ROWS)
+    args = parser.parse_args()
+
+    model = load_model(args.model)
+    # Zbiór testowy jak w notebooku (podział 60/20/20), przekształcony zapisanym potokiem modelu
+    pipeline, X, _ = saved_split_data(load_clean_data(YEARS), 'test')
+    start = time.perf_counter()
+    values, expected_value = shap_values(model, X, args.batch_rows)
+    print(f'SHAP: {X.shape[0]:,} wierszy × {X.shape[1]} kolumn w {time.perf_counter() - start:.1f} s')
+    print(f'Zapisano: {save_shap(values, expected_value, pipeline.feature_names)}')
+
+    summary = shap_summary(values, expected_value, X, pipeline.encoder, model=model)
+    print(f"Maks. różnica sigmoid(baza + suma SHAP) vs predict_proba: {summary['additivity_max_error']:.2e}")
+    if available_bundles():
+        bundle = load_bundle()
+        path = export_bundle({**bundle['sections'], 'shap': summary}, bundle['version'])
+        print(f'Sekcja SHAP dopisana do pakietu wyników: {path}')
+
+
+if __name__ == '__main__':
+    main()
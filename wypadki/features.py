@@ -0,0 +1,123 @@
+# Transformacje i inżynieria cech, jak w notebooku - w postaci deklaratywnej listy cech
+# liczonych operacjami na tablicach NumPy (bez wywołań Pythona dla każdego wiersza).
+# Parametry skalowania `speed_limit` podawane są z zewnątrz, dzięki czemu ten sam kod obsługuje
+# całą ramkę i przetwarzanie w partiach (wypadki.streaming).
+import numpy as np
+import pandas as pd
+
+from wypadki.config import columns_to_check_NaN
+from wypadki.time_parsing import extract_hour
+
+# Przedziały wiekowe: ≤17, 18-25, 26-40, 41-60, >60 lat
+bins_age_driver = [-float('inf'), 17, 25, 40, 60, float('inf')]
+labels_age_driver = ['1', '2', '3', '4', '5']
+
+# Godziny szczytu (przedziały domknięte): 7-9 i 15-18
+RUSH_HOUR_WINDOWS = ((7, 9), (15, 18))
+
+# Pasma odległości od miejsca zamieszkania uznane za "ważne": 10-20 km (3) i 20-100 km (4)
+IMPORTANT_DISTANCE_BANDS = (3, 4)
+
+
+def clean(data):
+    # Usunięcie wierszy z brakami (kody -1/99 są już <NA> po wczytaniu) oraz z brakiem lub błędnym zapisem
+    # godziny (`time` spoza HH:MM -> <NA> w hour_of_day), aby braki nie trafiały do SMOTE i modeli
+    data = data.dropna(subset=columns_to_check_NaN)
+    return data[extract_hour(data['time']).notna().to_numpy()]
+
+
+def _values(data, column, dtype='float64'):
+    return data[column].to_numpy(dtype=dtype)
+
+
+def hour_of_day(data, params):
+    # Godzina odczytywana wprost z tekstu HH:MM (wypadki.time_parsing); błędny zapis -> <NA>
+    return extract_hour(data['time'])
+
+
+def driver_home_area_type(data, params):
+    # Małe miasto (2) i obszar wiejski (3) łączone w jedną etykietę 2
+    area = _values(data, 'driver_home_area_type', 'int8')
+    return np.where(area == 3, 2, area).astype('int8')
+
+
+def is_urban_driver(data, params):
+    return (_values(data, 'driver_home_area_type', 'int8') == 1).astype('int8')
+
+
+def is_rural_accident(data, params):
+    return (_values(data, 'urban_or_rural_area', 'int8') == 2).astype('int8')
+
+
+def speed_limit_normalized(data, params):
+    return (_values(data, 'speed_limit') - params['speed_mean']) / params['speed_std']
+
+
+def age_of_casualty_binned(data, params):
+    return pd.cut(data['age_of_casualty'], bins=bins_age_driver, labels=labels_age_driver, right=False)
+
+
+def age_of_driver_binned(data, params):
+    return pd.cut(data['age_of_driver'], bins=bins_age_driver, labels=labels_age_driver, right=False)
+
+
+def urban_driver_speed(data, params):
+    return data['is_urban_driver'].to_numpy() * data['speed_limit_normalized'].to_numpy()
+
+
+def is_rush_hour(data, params):
+    hour = data['hour_of_day'].to_numpy(dtype='float64', na_value=np.nan)
+    rush = np.zeros(len(hour), dtype=bool)
+    for start, end in params['rush_hour_windows']:
+        rush |= (hour >= start) & (hour <= end)
+    return rush.astype('int8')
+
+
+def distance_speed_interaction(data, params):
+    return _values(data, 'driver_distance_banding') * data['urban_driver_speed'].to_numpy()
+
+
+def important_driver_distance(data, params):
+    # Odpowiednik (driver_distance_banding_4 + driver_distance_banding_3 > 0) po kodowaniu zero-jedynkowym
+    return np.isin(_values(data, 'driver_distance_banding', 'int8'), params['important_distance_bands']).astype('int8')
+
+
+def urban_driver_long_distance(data, params):
+    return data['is_urban_driver'].to_numpy() * data['important_driver_distance'].to_numpy()
+
+
+def urban_driver_no_junction_control(data, params):
+    # Kierowca miejski na skrzyżowaniu bez kontroli ruchu (junction_control = 4)
+    return data['is_urban_driver'].to_numpy() * (_values(data, 'junction_control', 'int8') == 4).astype('int8')
+
+
+# Kolejność ma znaczenie - cechy mogą korzystać z cech policzonych wcześniej
+FEATURES = {
+    'hour_of_day': hour_of_day,
+    'driver_home_area_type': driver_home_area_type,
+    'is_urban_driver': is_urban_driver,
+    'is_rural_accident': is_rural_accident,
+    'speed_limit_normalized': speed_limit_normalized,
+    'age_of_casualty_binned': age_of_casualty_binned,
+    'age_of_driver_binned': age_of_driver_binned,
+    'urban_driver_speed': urban_driver_speed,
+    'is_rush_hour': is_rush_hour,
+    'distance_speed_interaction': distance_speed_interaction,
+    'important_driver_distance': important_driver_distance,
+    'urban_driver_long_distance': urban_driver_long_distance,
+    'urban_driver_no_junction_control': urban_driver_no_junction_control,
+}
+
+
+def add_features(data, speed_mean, speed_std, rush_hour_windows=RUSH_HOUR_WINDOWS,
+                 important_distance_bands=IMPORTANT_DISTANCE_BANDS, features=FEATURES):
+    """Dodaje cechy z `features` (w kolejności słownika) do oczyszczonej ramki `data`."""
+    params = {
+        'speed_mean': speed_mean,
+        'speed_std': speed_std,
+        'rush_hour_windows': rush_hour_windows,
+        'important_distance_bands': important_distance_bands,
+    }
+    for name, compute in features.items():
+        data[name] = compute(data, params)
+    return data
@@ -0,0 +1,75 @@
+# Sposoby radzenia sobie z niezbalansowaniem klas is_rural_accident na zbiorze treningowym.
+# SMOTE na pełnym zbiorze (dotychczasowy wariant) szuka k najbliższych sąsiadów w całej klasie mniejszościowej
+# i dokłada syntetyczne wiersze, więc jest jednym z najdroższych kroków potoku. Tańsze warianty:
+#
+#   'class_weight'  - bez zmiany danych: scale_pos_weight (XGBoost) i class_weight='balanced' (RandomForest),
+#   'undersample'   - losowe ograniczenie klasy większościowej do liczności klasy mniejszościowej,
+#   'smote_subset'  - SMOTE na losowej, stratyfikowanej próbce zbioru treningowego (`max_rows` wierszy),
+#   'smote'         - SMOTE na całym zbiorze treningowym,
+#   'none'          - bez balansowania.
+#
+# Każdy wariant zwraca (X, y, model_params), gdzie model_params to parametry modeli nadpisujące
+# wypadki.models.XGB_PARAMS / RF_PARAMS. Porównanie czasu, pamięci i AUC: python -m benchmarks.bench_imbalance
+import numpy as np
+from imblearn.over_sampling import SMOTE
+from imblearn.under_sampling import RandomUnderSampler
+from scipy import sparse
+from sklearn.model_selection import train_test_split
+
+from wypadki.encoding import store_zeros, stored_columns
+
+# Domyślny wariant notebooka i aplikacji
+IMBALANCE_MODE = 'smote'
+
+
+def _no_params():
+    return {'xgb': {}, 'rf': {}}
+
+
+def no_balancing(X, y, random_state=42, **options):
+    return X, y, _no_params()
+
+
+def class_weight(X, y, random_state=42, **options):
+    positives = int((np.asarray(y) == 1).sum())
+    negatives = len(y) - positives
+    params = {'xgb': {'scale_pos_weight': negatives / positives}, 'rf': {'class_weight': 'balanced'}}
+    return X, y, params
+
+
+def undersample(X, y, random_state=42, **options):
+    X, y = RandomUnderSampler(random_state=random_state).fit_resample(X, y)
+    return X, y, _no_params()
+
+
+def smote(X, y, random_state=42, **options):
+    n_rows = X.shape[0]
+    X, y = SMOTE(random_state=random_state).fit_resample(X, y)
+    if sparse.issparse(X):
+        # Wiersze syntetyczne dopisywane są na końcu; interpolacja macierzy rzadkich gubi zera kolumn liczbowych
+        X = store_zeros(X, stored_columns(X[:n_rows]), start=n_rows)
+    return X, y, _no_params()
+
+
+def smote_subset(X, y, random_state=42, max_rows=100_000, **options):
+    if len(y) > max_rows:
+        positions, _ = train_test_split(np.arange(len(y)), train_size=max_rows,
+                                        random_state=random_state, stratify=y)
+        X, y = X[positions], np.asarray(y)[positions]
+    return smote(X, y, random_state=random_state)
+
+
+STRATEGIES = {
+    'none': no_balancing,
+    'class_weight': class_weight,
+    'undersample': undersample,
+    'smote_subset': smote_subset,
+    'smote': smote,
+}
+
+
+def balance(X, y, mode=IMBALANCE_MODE, random_state=42, **options):
+    """Balansuje zbiór treningowy wybranym wariantem; zwraca (X, y, model_params)."""
+    if mode not in STRATEGIES:
+        raise ValueError(f"Nieznany wariant balansowania '{mode}', dostępne: {list(STRATEGIES)}")
+    return STRATEGIES[mode](X, y, random_state=random_state, **options)
@@ -0,0 +1,124 @@
+# Ingest danych STATS19: jednorazowe pobranie plików CSV (lub użycie pliku lokalnego) i zapis
+# wersjonowanego snapshotu Parquet partycjonowanego po `accident_year`.
+# Kolejne uruchomienia czytają ze snapshotu tylko potrzebne kolumny i lata, bez parsowania CSV.
+#
+# Uruchomienie z terminala:
+#   python -m wypadki.ingest                                   # pobranie z data.dft.gov.uk
+#   python -m wypadki.ingest --source accidents=/sciezka/collision.csv --version v2
+import argparse
+import json
+import shutil
+import urllib.request
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.csv as pv
+import pyarrow.dataset as ds
+
+from wypadki.config import RAW_DIR, SNAPSHOT_DIR, TABLE_COLUMNS, TABLE_URLS, YEARS
+from wypadki.schema import apply_schema
+
+# Wersja snapshotu - zmiana wersji wymusza zbudowanie nowego katalogu zamiast nadpisywania starego
+SNAPSHOT_VERSION = 'v1'
+
+# Typy jawnie zadeklarowane przy parsowaniu CSV (pozostałe kolumny to kody liczbowe - typ wykrywany automatycznie)
+STRING_COLUMNS = [
+    'accident_index', 'accident_reference', 'date', 'time', 'local_authority_ons_district',
+    'local_authority_highway', 'lsoa_of_accident_location', 'lsoa_of_casualty', 'lsoa_of_driver', 'generic_make_model'
+]
+FLOAT_COLUMNS = ['location_easting_osgr', 'location_northing_osgr', 'longitude', 'latitude']
+
+# Blok 64 MB - typy kolumn liczbowych są wykrywane na podstawie pierwszego bloku pliku
+CSV_BLOCK_SIZE = 64 << 20
+
+
+def snapshot_path(table, version=SNAPSHOT_VERSION):
+    return SNAPSHOT_DIR / version / table
+
+
+def fetch_csv(table, source=None):
+    """Zwraca ścieżkę do lokalnego pliku CSV tabeli; plik z sieci pobierany jest tylko raz."""
+    if source is not None and not str(source).startswith(('http://', 'https://')):
+        return Path(source)
+
+    url = source or TABLE_URLS[table]
+    target = RAW_DIR / url.rsplit('/', 1)[-1]
+    if not target.exists():
+        RAW_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_suffix('.part')
+        with urllib.request.urlopen(url) as response, open(tmp, 'wb') as f:
+            shutil.copyfileobj(response, f, length=1 << 20)
+        tmp.replace(target)
+    return target
+
+
+def build_snapshot(tables=tuple(TABLE_URLS), sources=None, version=SNAPSHOT_VERSION):
+    """Konwertuje CSV do Parquet (partycje `accident_year=YYYY`) strumieniowo, blok po bloku."""
+    sources = sources or {}
+    manifest = {'version': version, 'created': datetime.now(timezone.utc).isoformat(), 'tables': {}}
+
+    for table in tables:
+        csv_path = fetch_csv(table, sources.get(table))
+        column_types = {c: pa.string() for c in STRING_COLUMNS}
+        column_types.update({c: pa.float64() for c in FLOAT_COLUMNS})
+        column_types['accident_year'] = pa.int16()
+
+        reader = pv.open_csv(
+            csv_path,
+            read_options=pv.ReadOptions(block_size=CSV_BLOCK_SIZE),
+            convert_options=pv.ConvertOptions(column_types=column_types),
+        )
+        ds.write_dataset(
+            reader,
+            snapshot_path(table, version),
+            format='parquet',
+            partitioning=ds.partitioning(pa.schema([('accident_year', pa.int16())]), flavor='hive'),
+            existing_data_behavior='delete_matching',
+        )
+        rows = ds.dataset(snapshot_path(table, version), format='parquet', partitioning='hive').count_rows()
+        manifest['tables'][table] = {'source': str(sources.get(table) or TABLE_URLS[table]), 'rows': rows}
+
+    manifest_path = SNAPSHOT_DIR / version / 'manifest.json'
+    if manifest_path.exists():
+        # Przebudowa części tabel - zachowujemy wpisy pozostałych
+        previous = json.loads(manifest_path.read_text(encoding='utf-8'))
+        manifest['tables'] = {**previous.get('tables', {}), **manifest['tables']}
+    manifest_path.write_text(json.dumps(manifest, indent=2, ensure_ascii=False), encoding='utf-8')
+    return manifest
+
+
+def read_snapshot(table, columns=None, years=YEARS, version=SNAPSHOT_VERSION):
+    """Czyta ze snapshotu wybrane kolumny i lata (filtr po partycjach - pozostałe pliki nie są otwierane).
+
+    Kolumny dostają kompaktowe typy z `wypadki.schema`, a kody -1/99 są zamieniane na <NA>.
+    """
+    dataset = ds.dataset(snapshot_path(table, version), format='parquet', partitioning='hive')
+    row_filter = ds.field('accident_year').isin(list(years)) if years is not None else None
+    return apply_schema(dataset.to_table(columns=columns, filter=row_filter).to_pandas(), table)
+
+
+def load_tables(years=YEARS, columns=TABLE_COLUMNS, sources=None, version=SNAPSHOT_VERSION):
+    """Zwraca słownik {tabela: DataFrame}; przy pierwszym uruchomieniu buduje brakujący snapshot."""
+    missing = [table for table in columns if not snapshot_path(table, version).exists()]
+    if missing:
+        build_snapshot(missing, sources=sources, version=version)
+    return {table: read_snapshot(table, cols, years, version) for table, cols in columns.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Budowa snapshotu Parquet danych STATS19.')
+    parser.add_argument('--source', action='append', default=[], metavar='TABELA=ŚCIEŻKA',
+                        help='lokalny plik CSV lub URL dla tabeli (accidents, casualties, vehicles)')
+    parser.add_argument('--version', default=SNAPSHOT_VERSION, help='wersja (katalog) snapshotu')
+    parser.add_argument('--tables', nargs='+', default=list(TABLE_URLS), choices=list(TABLE_URLS))
+    args = parser.parse_args()
+
+    sources = dict(item.split('=', 1) for item in args.source)
+    manifest = build_snapshot(args.tables, sources=sources, version=args.version)
+    for table, info in manifest['tables'].items():
+        print(f"{table}: {info['rows']:,} wierszy ({info['source']})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+# Złączenie tabel STATS19 bez iloczynu kartezjańskiego poszkodowani × pojazdy.
+# Poszkodowany łączony jest z własnym pojazdem po kluczu (accident_index, vehicle_reference),
+# a nie z każdym pojazdem biorącym udział w wypadku.
+#
+# Dostępne poziomy szczegółowości (grain):
+#   'accident' - jeden wiersz na wypadek (+ liczba pojazdów i poszkodowanych),
+#   'vehicle'  - jeden wiersz na pojazd/kierowcę (+ liczba poszkodowanych w pojeździe),
+#   'casualty' - jeden wiersz na poszkodowanego (+ dane jego pojazdu i kierowcy).
+import numpy as np
+import pandas as pd
+
+from wypadki.config import TABLE_COLUMNS, YEARS
+from wypadki.ingest import SNAPSHOT_VERSION, read_snapshot
+
+GRAINS = ('accident', 'vehicle', 'casualty')
+ACCIDENT_KEY = ['accident_index']
+VEHICLE_KEY = ['accident_index', 'vehicle_reference']
+
+
+def join_tables(accidents, vehicles, casualties, grain='casualty'):
+    if grain not in GRAINS:
+        raise ValueError(f"Nieznany poziom złączenia '{grain}', dostępne: {GRAINS}")
+
+    if grain == 'casualty':
+        # validate='m:1' - każdy poszkodowany trafia do co najwyżej jednego pojazdu
+        return (accidents.merge(casualties, on=ACCIDENT_KEY, how='left', validate='1:m')
+                         .merge(vehicles, on=VEHICLE_KEY, how='left', validate='m:1'))
+
+    if grain == 'vehicle':
+        n_casualties = casualties.groupby(VEHICLE_KEY, observed=True).size().rename('n_casualties_vehicle').reset_index()
+        data = (accidents.merge(vehicles, on=ACCIDENT_KEY, how='left', validate='1:m')
+                         .merge(n_casualties, on=VEHICLE_KEY, how='left', validate='m:1'))
+        data['n_casualties_vehicle'] = data['n_casualties_vehicle'].fillna(0).astype('int16')
+        return data
+
+    counts = pd.DataFrame({
+        'n_vehicles': vehicles.groupby('accident_index').size(),
+        'n_casualties_linked': casualties.groupby('accident_index').size(),
+    })
+    data = accidents.merge(counts, left_on='accident_index', right_index=True, how='left')
+    data[['n_vehicles', 'n_casualties_linked']] = data[['n_vehicles', 'n_casualties_linked']].fillna(0).astype('int16')
+    return data
+
+
+def fanout_report(accidents, vehicles, casualties):
+    """Liczba wierszy dla każdego poziomu złączenia oraz współczynnik rozmnożenia starego złączenia po accident_index."""
+    index = accidents['accident_index']
+    n_cas = casualties.groupby('accident_index').size().reindex(index, fill_value=0).to_numpy()
+    n_veh = vehicles.groupby('accident_index').size().reindex(index, fill_value=0).to_numpy()
+
+    # Złączenie left/left po samym accident_index daje max(1, n_cas) * max(1, n_veh) wierszy na wypadek
+    legacy_per_accident = np.maximum(n_cas, 1) * np.maximum(n_veh, 1)
+    casualty_rows = int(np.maximum(n_cas, 1).sum())
+    legacy_rows = int(legacy_per_accident.sum())
+
+    return {
+        'accident_rows': int(len(accidents)),
+        'vehicle_rows': int(np.maximum(n_veh, 1).sum()),
+        'casualty_rows': casualty_rows,
+        'legacy_rows': legacy_rows,
+        'fanout_factor': legacy_rows / casualty_rows if casualty_rows else float('nan'),
+        'max_rows_per_accident_legacy': int(legacy_per_accident.max()) if len(legacy_per_accident) else 0,
+    }
+
+
+def join_plan(accidents, vehicles, casualties, grain='casualty', memory_budget_mb=512):
+    """Szacuje rozmiar wyniku złączenia i liczbę partii mieszczących się w budżecie pamięci."""
+    report = fanout_report(accidents, vehicles, casualties)
+    bytes_per_row = sum(
+        df.memory_usage(index=False, deep=True).sum() / max(len(df), 1)
+        for df in (accidents, vehicles, casualties)
+    )
+    rows = report[f'{grain}_rows']
+    estimated_mb = rows * bytes_per_row / 2**20
+    n_batches = max(1, int(np.ceil(estimated_mb / memory_budget_mb)))
+    return {
+        'grain': grain,
+        'rows': rows,
+        'estimated_mb': round(estimated_mb, 1),
+        'memory_budget_mb': memory_budget_mb,
+        'n_batches': n_batches,
+        'fanout_factor': report['fanout_factor'],
+    }
+
+
+def iter_join_batches(accidents, vehicles, casualties, grain='casualty', n_batches=1):
+    """Złączenie w partiach wypadków (podział po haszu accident_index) - wszystkie wiersze wypadku trafiają do jednej partii."""
+    if n_batches <= 1:
+        yield join_tables(accidents, vehicles, casualties, grain)
+        return
+
+    def batch_of(df):
+        return pd.util.hash_pandas_object(df['accident_index'], index=False).to_numpy() % n_batches
+
+    acc_batch, veh_batch, cas_batch = batch_of(accidents), batch_of(vehicles), batch_of(casualties)
+    for b in range(n_batches):
+        yield join_tables(accidents[acc_batch == b], vehicles[veh_batch == b], casualties[cas_batch == b], grain)
+
+
+def iter_join_years(years=YEARS, grain='casualty', columns=TABLE_COLUMNS, memory_budget_mb=512, version=SNAPSHOT_VERSION):
+    """Złączenie rok po roku ze snapshotu Parquet; w pamięci jest jednocześnie tylko jeden rok (i jedna partia)."""
+    for year in years:
+        tables = {table: read_snapshot(table, cols, [year], version) for table, cols in columns.items()}
+        plan = join_plan(tables['accidents'], tables['vehicles'], tables['casualties'], grain, memory_budget_mb)
+        yield from iter_join_batches(tables['accidents'], tables['vehicles'], tables['casualties'], grain, plan['n_batches'])
@@ -0,0 +1,91 @@
+# Krzywa uczenia liczona równolegle, z zapisem wyników cząstkowych i wynikiem w magazynie wyników.
+# Odpowiednik learning_curve(estimator, X, y, train_sizes=np.linspace(0.1, 1.0, 10), cv=5, scoring='f1'):
+# te same podzbiory (StratifiedKFold bez tasowania) i te same rozmiary zbioru treningowego, ale:
+#   - liczba równoległych zadań i wątków modelu (n_jobs XGBoost/RandomForest) dzielona jest w ramach jednej puli
+#     rdzeni, zamiast uruchamiać n_jobs=-1 procesów, z których każdy używa wszystkich rdzeni,
+#   - wynik każdej pary (rozmiar, podzbiór) zapisywany jest w modele/learning_curve/<model>-<skrót>/, więc
+#     przerwane obliczenia wznawiane są od miejsca przerwania,
+#   - gotowa krzywa zapisywana jest do wyniki/learning_curve_<model>.json i czytana przez aplikację (sekcja VII).
+import json
+import os
+
+import joblib
+import numpy as np
+from sklearn.metrics import f1_score, roc_auc_score
+from sklearn.model_selection import StratifiedKFold
+
+from wypadki.config import MODELS_DIR
+from wypadki.models import MODELS
+from wypadki.results import save_result
+from wypadki.training import fingerprint
+
+LEARNING_CURVE_DIR = MODELS_DIR / 'learning_curve'
+
+SCORERS = {
+    'f1': lambda y, proba: f1_score(y, proba >= 0.5),
+    'roc_auc': roc_auc_score,
+}
+
+
+def train_sizes_abs(train_sizes, n_max):
+    # Jak w sklearn: ułamki rozmiaru największego zbioru treningowego, bez powtórzeń
+    return np.unique(np.clip((np.asarray(train_sizes) * n_max).astype(int), 1, n_max))
+
+
+def _score_point(name, params, fit_params, scoring, X, y, train_idx, test_idx, path):
+    if path.exists():
+        return json.loads(path.read_text())
+    model = MODELS[name](**params).fit(X[train_idx], y[train_idx], **fit_params)
+    point = {
+        'train': float(SCORERS[scoring](y[train_idx], model.predict_proba(X[train_idx])[:, 1])),
+        'val': float(SCORERS[scoring](y[test_idx], model.predict_proba(X[test_idx])[:, 1])),
+    }
+    path.write_text(json.dumps(point))
+    return point
+
+
+def _nan_to_none(values):
+    # JSON bez NaN (np. F1 nieokreślone dla zbyt małej próbki)
+    return [None if np.isnan(v) else float(v) for v in values]
+
+
+def compute_learning_curve(name, X, y, model_params=None, train_sizes=np.linspace(0.1, 1.0, 10), n_splits=5,
+                           scoring='f1', n_jobs=-1, fit_params=None, cache_dir=LEARNING_CURVE_DIR):
+    """Krzywa uczenia modelu `name` (wypadki.models.MODELS); zwraca słownik zapisany w wyniki/."""
+    y = np.asarray(y)
+    fit_params = fit_params or {}
+    cpus = os.cpu_count() or 1
+
+    folds = list(StratifiedKFold(n_splits=n_splits).split(np.zeros(len(y)), y))
+    sizes = train_sizes_abs(train_sizes, len(folds[0][0]))
+    tasks = [(size, k) for size in sizes for k in range(n_splits)]
+
+    # Jedna pula rdzeni: równoległe zadania × wątki modelu <= liczba rdzeni
+    n_workers = min(len(tasks), cpus if n_jobs == -1 else n_jobs)
+    params = {**(model_params or {}), 'n_jobs': max(1, cpus // n_workers)}
+
+    key = fingerprint(X, y, {'name': name, 'params': model_params, 'n_splits': n_splits, 'scoring': scoring}, fit_params)
+    run_dir = cache_dir / f'{name}-{key}'
+    run_dir.mkdir(parents=True, exist_ok=True)
+
+    points = joblib.Parallel(n_jobs=n_workers, prefer='threads')(
+        joblib.delayed(_score_point)(name, params, fit_params, scoring, X, y,
+                                     folds[k][0][:size], folds[k][1], run_dir / f'size_{size}_fold_{k}.json')
+        for size, k in tasks
+    )
+
+    train_scores = np.array([p['train'] for p in points], dtype='float64').reshape(len(sizes), n_splits)
+    val_scores = np.array([p['val'] for p in points], dtype='float64').reshape(len(sizes), n_splits)
+    curve = {
+        'model': name,
+        'scoring': scoring,
+        'train_sizes': sizes.tolist(),
+        'train_scores': [_nan_to_none(row) for row in train_scores],
+        'val_scores': [_nan_to_none(row) for row in val_scores],
+        'train_mean': _nan_to_none(train_scores.mean(axis=1)),
+        'train_std': _nan_to_none(train_scores.std(axis=1)),
+        'val_mean': _nan_to_none(val_scores.mean(axis=1)),
+        'val_std': _nan_to_none(val_scores.std(axis=1)),
+    }
+    save_result(f'learning_curve_{name}', curve)
+    return curve
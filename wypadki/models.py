@@ -0,0 +1,52 @@
+# Hiperparametry modeli z notebooka (XGBoost i RandomForest) w jednym miejscu.
+# Parametry zależne od sposobu balansowania klas (scale_pos_weight, class_weight) podawane są
+# jako `overrides` - zob. wypadki.imbalance. 'xgb_hist' to ten sam XGBoost w trybie histogramowym
+# z wczesnym zatrzymaniem (wypadki.boosting).
+from sklearn.ensemble import RandomForestClassifier
+from xgboost import XGBClassifier
+
+from wypadki.boosting import HistXGB
+
+XGB_PARAMS = {
+    'random_state': 42,
+    'scale_pos_weight': 1,  # Po SMOTE nie potrzebujemy scale_pos_weight
+    'max_depth': 9,
+    'n_estimators': 269,
+    'learning_rate': 0.06,
+    'reg_alpha': 0.1,
+    'reg_lambda': 1.9,
+    'subsample': 0.8,
+    'colsample_bytree': 0.6,
+}
+
+RF_PARAMS = {
+    'random_state': 42,
+    'n_estimators': 229,
+    'max_depth': 14,
+    'min_samples_split': 54,
+    'min_samples_leaf': 26,
+    'n_jobs': -1,
+    'max_features': 'sqrt',
+    'criterion': 'entropy',
+    'bootstrap': False,
+}
+
+
+def make_xgb(**overrides):
+    return XGBClassifier(**{**XGB_PARAMS, **overrides})
+
+
+def make_xgb_hist(**overrides):
+    # Te same hiperparametry; n_estimators to górny limit rund przy wczesnym zatrzymaniu
+    return HistXGB(**{**XGB_PARAMS, **overrides})
+
+
+def make_rf(**overrides):
+    return RandomForestClassifier(**{**RF_PARAMS, **overrides})
+
+
+MODELS = {
+    'xgb': make_xgb,
+    'xgb_hist': make_xgb_hist,
+    'rf': make_rf,
+}
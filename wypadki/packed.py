@@ -0,0 +1,168 @@
+# Szybka ścieżka predykcji: drzewa RandomForest i XGBoost przepisane do płaskich tablic węzłów NumPy
+# (cecha, próg, lewe/prawe dziecko, dziecko dla braku wartości, wartość liścia) i przechodzone wektorowo -
+# wszystkie wiersze partii × wszystkie drzewa przesuwane są o jeden poziom w każdym kroku pętli.
+#   - wynik zgodny z predict_proba (ta sama reguła podziału w float32: sklearn `x <= próg`, XGBoost `x < próg`,
+#     braki wartości w XGBoost idą do gałęzi domyślnej, a w macierzy CSR nieobecne wartości to braki - jak w XGBoost,
+#     dla RandomForest - zera, jak w sklearn),
+#   - model zajmuje kilka tablic int32/float32 zamiast obiektów drzew (RandomForest: 229 drzew o głębokości 14),
+#   - compile_model() obsługuje RandomForestClassifier, XGBClassifier, HistXGB i FoldEnsemble (średnia modeli).
+# Porównanie z predict_proba: python -m benchmarks.bench_packed
+import json
+
+import numpy as np
+from scipy import sparse
+
+from wypadki.training import FoldEnsemble
+
+# Wiersze przechodzone naraz (pamięć: wiersze × drzewa × 4 B)
+BATCH_ROWS = 8_192
+
+
+def _float32_below_or_equal(threshold):
+    # Największa wartość float32 <= progu float64 - sklearn porównuje X (float32) z progiem float64
+    t32 = threshold.astype('float32')
+    return np.where(t32 > threshold, np.nextafter(t32, np.float32(-np.inf)), t32)
+
+
+def dense(X, missing=0.0):
+    """Macierz CSR -> gęsta tablica float32, nieobecne elementy równe `missing`."""
+    if not sparse.issparse(X):
+        return np.asarray(X, dtype='float32')
+    X = sparse.csr_matrix(X)
+    result = np.full(X.shape, missing, dtype='float32')
+    rows = np.repeat(np.arange(X.shape[0]), np.diff(X.indptr))
+    result[rows, X.indices] = X.data
+    return result
+
+
+def sklearn_tree_arrays(tree):
+    """Węzły drzewa sklearn (estimator.tree_) z progami float32 dla reguły `x < próg`:
+    (feature, threshold, left, right, missing, proba klasy 1); w liściach left == right == -1."""
+    # x <= t (float64) <=> x < następna wartość float32 po największej float32 <= t
+    threshold = np.nextafter(_float32_below_or_equal(tree.threshold), np.float32(np.inf))
+    counts = tree.value[:, 0, :]
+    proba = counts[:, 1] / np.maximum(counts.sum(axis=1), np.finfo('float64').tiny)
+    # Bez braków wartości w danych uczących sklearn kieruje NaN w prawo
+    return tree.feature, threshold, tree.children_left, tree.children_right, tree.children_right, proba
+
+
+class PackedTrees:
+    """Drzewa jednego modelu w płaskich tablicach; reguła podziału: `x < threshold` -> left, brak wartości -> missing."""
+
+    def __init__(self, kind, roots, feature, threshold, left, right, missing, value, base_margin=0.0):
+        self.kind = kind  # 'rf' (średnia prawdopodobieństw drzew) lub 'xgb' (suma wag liści + base_margin, sigmoid)
+        self.roots = roots
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.missing = missing
+        self.value = value
+        self.base_margin = base_margin
+        self.is_leaf = left == np.arange(len(left))
+
+    @classmethod
+    def _pack(cls, kind, trees, base_margin=0.0):
+        # trees: lista (feature, threshold, left, right, missing, value) z lokalną numeracją węzłów i -1 w liściach
+        roots, parts, offset = [], [], 0
+        for feature, threshold, left, right, missing, value in trees:
+            n_nodes = len(left)
+            nodes = np.arange(n_nodes) + offset
+            leaf = left == -1
+            # Liść wskazuje na siebie - dalsze kroki pętli nie zmieniają pozycji
+            parts.append((
+                np.where(leaf, 0, feature).astype('int32'),
+                np.where(leaf, 0, threshold).astype('float32'),
+                np.where(leaf, nodes, left + offset).astype('int32'),
+                np.where(leaf, nodes, right + offset).astype('int32'),
+                np.where(leaf, nodes, missing + offset).astype('int32'),
+                np.where(leaf, value, 0).astype('float32'),
+            ))
+            roots.append(offset)
+            offset += n_nodes
+        arrays = [np.concatenate(column) for column in zip(*parts)]
+        return cls(kind, np.array(roots, dtype='int32'), *arrays, base_margin=base_margin)
+
+    @classmethod
+    def from_sklearn(cls, forest):
+        return cls._pack('rf', [sklearn_tree_arrays(estimator.tree_) for estimator in forest.estimators_])
+
+    @classmethod
+    def from_xgboost(cls, booster, n_trees=None):
+        """Pierwsze `n_trees` drzew boostera (domyślnie wszystkie), z zapisu modelu w JSON (dokładne progi float32)."""
+        model = json.loads(booster.save_raw(raw_format='json'))['learner']
+        base_score = float(model['learner_model_param']['base_score'])
+        trees = []
+        for tree in model['gradient_booster']['model']['trees'][:n_trees]:
+            left, right = np.array(tree['left_children']), np.array(tree['right_children'])
+            conditions = np.array(tree['split_conditions'], dtype='float32')
+            missing = np.where(np.array(tree['default_left'], dtype=bool), left, right)
+            # W liściach split_conditions przechowuje wagę liścia
+            trees.append((np.array(tree['split_indices']), conditions, left, right, missing, conditions))
+        return cls._pack('xgb', trees, base_margin=float(np.log(base_score / (1 - base_score))))
+
+    def leaf_values(self, X):
+        """Wartości liści: tablica (wiersze × drzewa)."""
+        # Nieobecne wartości CSR to braki (NaN) w XGBoost i zera w sklearn
+        X = dense(X, np.nan if self.kind == 'xgb' else 0.0)
+        nodes = np.broadcast_to(self.roots, (X.shape[0], len(self.roots))).copy()
+        while not self.is_leaf[nodes].all():
+            x = np.take_along_axis(X, self.feature[nodes], axis=1)
+            nodes = np.where(np.isnan(x), self.missing[nodes],
+                             np.where(x < self.threshold[nodes], self.left[nodes], self.right[nodes]))
+        return self.value[nodes]
+
+    def predict_proba(self, X, batch_rows=BATCH_ROWS):
+        proba = np.empty(X.shape[0], dtype='float64')
+        for start in range(0, X.shape[0], batch_rows):
+            leaves = self.leaf_values(X[start:start + batch_rows])
+            if self.kind == 'rf':
+                proba[start:start + batch_rows] = leaves.mean(axis=1)
+            else:
+                margin = self.base_margin + leaves.sum(axis=1, dtype='float64')
+                proba[start:start + batch_rows] = 1 / (1 + np.exp(-margin))
+        return np.column_stack([1 - proba, proba])
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.roots, self.feature, self.threshold, self.left, self.right, self.missing, self.value))
+
+    def save(self, path):
+        np.savez_compressed(path, kind=self.kind, base_margin=self.base_margin, roots=self.roots, feature=self.feature,
+                            threshold=self.threshold, left=self.left, right=self.right, missing=self.missing, value=self.value)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as npz:
+            return cls(str(npz['kind']), npz['roots'], npz['feature'], npz['threshold'], npz['left'], npz['right'],
+                       npz['missing'], npz['value'], base_margin=float(npz['base_margin']))
+
+
+class PackedEnsemble:
+    """Średnia prawdopodobieństw skompilowanych modeli (odpowiednik FoldEnsemble)."""
+
+    def __init__(self, members):
+        self.members = members
+
+    def predict_proba(self, X):
+        return np.mean([member.predict_proba(X) for member in self.members], axis=0)
+
+    @property
+    def nbytes(self):
+        return sum(member.nbytes for member in self.members)
+
+
+def compile_model(model):
+    """Model z notebooka/wypadki.training -> PackedTrees lub PackedEnsemble z tym samym predict_proba."""
+    if isinstance(model, FoldEnsemble):
+        return PackedEnsemble([compile_model(member) for member in model.models])
+    if hasattr(model, 'estimators_'):
+        return PackedTrees.from_sklearn(model)
+    if hasattr(model, 'booster'):
+        # HistXGB: predykcja z drzew do najlepszej iteracji (wczesne zatrzymanie)
+        return PackedTrees.from_xgboost(model.booster, model.best_iteration + 1)
+    if hasattr(model, 'get_booster'):
+        best_iteration = getattr(model, 'best_iteration', None)
+        return PackedTrees.from_xgboost(model.get_booster(), best_iteration + 1 if best_iteration is not None else None)
+    raise ValueError(f'Nieobsługiwany model: {type(model).__name__}')
@@ -0,0 +1,159 @@
+# Ważność permutacyjna cech: spadek AUC-ROC na zbiorze testowym po losowym przestawieniu wierszy cechy.
+# W przeciwieństwie do ważności typu gain nie faworyzuje cech z wieloma progami podziału (speed_limit_normalized
+# i jego interakcje), bo mierzy wpływ cechy na jakość predykcji, a nie na budowę drzew.
+#   - kolumny zero-jedynkowe jednej cechy (np. wszystkie road_type_*) permutowane są razem - tą samą permutacją,
+#     więc wiersz nadal ma co najwyżej jedną aktywną kategorię, a wynik dotyczy cechy źródłowej,
+#   - macierz testowa zapisywana jest raz jako gęsta tablica .npy (braki wartości jak w modelu: NaN dla XGBoost,
+#     0 dla RandomForest) razem z modelem (joblib) i otwierana w procesach (joblib/loky) jako memmap tylko do odczytu,
+#   - procesy czytają wspólną macierz partiami wierszy: do małego bufora procesu kopiowana jest partia z kolumnami
+#     cechy wziętymi z przestawionych wierszy, więc żaden proces nie trzyma prywatnej kopii zbioru testowego;
+#     cechy dzielone są między procesy, a rdzenie między procesy i wątki modelu,
+#   - `n_repeats` powtórzeń z różnymi permutacjami daje średnią, odchylenie i przedział ufności (t-Studenta),
+#   - wynik zapisywany jest w magazynie wyników (wyniki/permutation_importance_<model>.json) dla aplikacji.
+#
+#   python -m wypadki.permutation --model xgb --repeats 5
+#   python -m wypadki.permutation --model rf --packed --n-jobs 4
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from scipy.stats import t as t_distribution
+from sklearn.metrics import roc_auc_score
+
+from wypadki.config import YEARS
+from wypadki.packed import compile_model, dense
+from wypadki.preprocessing import load_clean_data, saved_split_data
+from wypadki.results import save_result, table
+from wypadki.training import FoldEnsemble, load_model
+
+# Wiersze partii kopiowanej do bufora procesu roboczego (bufor: partia × kolumny modelu, float32)
+PERMUTATION_BATCH_ROWS = 50_000
+
+
+def _members(model):
+    return model.models if isinstance(model, FoldEnsemble) else [model]
+
+
+def missing_value(model):
+    """Wartość nieobecnych elementów macierzy CSR po zamianie na gęstą: NaN dla XGBoost (brak), 0 dla sklearn."""
+    # PackedEnsemble (wypadki.packed) ma listę `members`, FoldEnsemble - `models`
+    members = getattr(model, 'members', None) or _members(model)
+    xgboost = [hasattr(m, 'booster') or hasattr(m, 'get_booster') or getattr(m, 'kind', None) == 'xgb' for m in members]
+    return np.nan if any(xgboost) else 0.0
+
+
+def _limit_threads(model, n_threads):
+    # Wątki modelu w procesie roboczym (bez nadsubskrypcji rdzeni)
+    for member in _members(model):
+        if hasattr(member, 'booster'):
+            member.booster.set_param({'nthread': n_threads})
+        elif hasattr(member, 'get_booster'):
+            member.get_booster().set_param({'nthread': n_threads})
+        if hasattr(member, 'n_jobs'):
+            member.n_jobs = n_threads
+
+
+def _permuted_proba(model, X, columns, order, buffer):
+    # Predykcje dla X z kolumnami `columns` przestawionymi wg `order`, liczone partiami wierszy w buforze procesu
+    proba = np.empty(len(X), dtype='float64')
+    for start in range(0, len(X), len(buffer)):
+        stop = min(start + len(buffer), len(X))
+        batch = buffer[:stop - start]
+        batch[:] = X[start:stop]
+        batch[:, columns] = X[order[start:stop, None], columns]
+        proba[start:stop] = model.predict_proba(batch)[:, 1]
+    return proba
+
+
+def _score_groups(run_dir, tasks, n_repeats, seed, n_threads, batch_rows=PERMUTATION_BATCH_ROWS):
+    model = joblib.load(run_dir / 'model.joblib', mmap_mode='r')
+    _limit_threads(model, n_threads)
+    y = np.load(run_dir / 'y.npy')
+    # Wspólna macierz tylko do odczytu (strony współdzielone przez procesy) + bufor jednej partii na proces
+    X = np.load(run_dir / 'X.npy', mmap_mode='r')
+    buffer = np.empty((min(batch_rows, len(X)), X.shape[1]), dtype=X.dtype)
+    scores = {}
+    for k, feature, columns in tasks:
+        columns = np.asarray(columns)
+        scores[feature] = []
+        for r in range(n_repeats):
+            # Permutacja zależy tylko od (seed, cecha, powtórzenie) - wynik niezależny od podziału między procesy
+            order = np.random.default_rng([seed, k, r]).permutation(len(X))
+            scores[feature].append(float(roc_auc_score(y, _permuted_proba(model, X, columns, order, buffer))))
+    return scores
+
+
+def permutation_importance(model, X, y, groups, n_repeats=5, n_jobs=-1, seed=42, confidence=0.95):
+    """Ważność permutacyjna (spadek AUC) cech źródłowych `groups` ({cecha: [indeksy kolumn]}, np.
+    SparseOneHotEncoder.feature_groups()): ramka posortowana malejąco i AUC bez permutacji."""
+    cpus = os.cpu_count() or 1
+    n_workers = min(len(groups), cpus if n_jobs == -1 else n_jobs)
+    n_threads = max(1, cpus // n_workers)
+    y = np.asarray(y)
+    X = dense(X, missing_value(model))
+    baseline = float(roc_auc_score(y, model.predict_proba(X)[:, 1]))
+
+    tasks = [(k, feature, columns) for k, (feature, columns) in enumerate(groups.items())]
+    with tempfile.TemporaryDirectory() as tmp:
+        run_dir = Path(tmp)
+        np.save(run_dir / 'X.npy', X)
+        np.save(run_dir / 'y.npy', y)
+        joblib.dump(model, run_dir / 'model.joblib')
+        # Cechy na przemian między procesy - każdy proces wczytuje model raz i czyta macierz przez memmap
+        results = joblib.Parallel(n_jobs=n_workers)(
+            joblib.delayed(_score_groups)(run_dir, tasks[w::n_workers], n_repeats, seed, n_threads)
+            for w in range(n_workers)
+        )
+    scores = {feature: s for result in results for feature, s in result.items()}
+
+    rows = []
+    for feature, columns in groups.items():
+        drops = baseline - np.array(scores[feature])
+        mean, std, half_width = drops.mean(), 0.0, 0.0
+        if n_repeats > 1:
+            std = drops.std(ddof=1)
+            half_width = t_distribution.ppf((1 + confidence) / 2, n_repeats - 1) * std / np.sqrt(n_repeats)
+        rows.append({'feature': feature, 'columns': len(columns), 'importance': mean, 'std': std,
+                     'ci_low': mean - half_width, 'ci_high': mean + half_width})
+    importance = pd.DataFrame(rows).sort_values('importance', ascending=False).reset_index(drop=True)
+    return importance, baseline
+
+
+def save_permutation_importance(name, importance, baseline, n_repeats, confidence=0.95, seconds=None):
+    return save_result(f'permutation_importance_{name}', {
+        'baseline_auc': baseline, 'n_repeats': n_repeats, 'confidence': confidence, 'seconds': seconds,
+        'importance': table(importance),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Ważność permutacyjna cech (spadek AUC na zbiorze testowym).')
+    parser.add_argument('--model', default='xgb', help='nazwa modelu w katalogu modele/ (domyślnie xgb)')
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--n-jobs', type=int, default=-1, help='liczba równoległych procesów')
+    parser.add_argument('--packed', action='store_true', help='predykcja drzewami skompilowanymi (wypadki.packed)')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    model = load_model(args.model)
+    if args.packed:
+        model = compile_model(model)
+    # Zbiór testowy jak w notebooku (podział 60/20/20), przekształcony zapisanym potokiem modelu
+    pipeline, X_test, y_test = saved_split_data(load_clean_data(YEARS), 'test')
+    start = time.perf_counter()
+    importance, baseline = permutation_importance(model, X_test, y_test, pipeline.encoder.feature_groups(),
+                                                  args.repeats, args.n_jobs, args.seed)
+    seconds = time.perf_counter() - start
+    path = save_permutation_importance(args.model, importance, baseline, args.repeats, seconds=seconds)
+    print(f"AUC bez permutacji: {baseline:.4f}; {len(importance)} cech × {args.repeats} powtórzeń w {seconds:.1f} s\n")
+    print(importance.to_string(float_format=lambda v: f'{v:.4f}'))
+    print(f'\nZapisano: {path}')
+
+
+if __name__ == '__main__':
+    main()
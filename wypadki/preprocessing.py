@@ -0,0 +1,139 @@
+# Dopasowany potok przygotowania danych jako jeden artefakt: czyszczenie kodów braków danych,
+# hour_of_day, speed_limit_normalized (parametry skalowania), binowanie wieku, cechy interakcji
+# i kodowanie zero-jedynkowe (stały słownik kolumn).
+#
+# Potok dopasowywany jest wyłącznie na zbiorze treningowym i zapisywany do jednego pliku JSON
+# (modele/preprocessing.json). Aplikacja Streamlit lub skrypt oceniający wczytuje go w milisekundach
+# i przekształca nowe lata STATS19 bez ponownego dopasowania czegokolwiek.
+import json
+
+import numpy as np
+from sklearn.model_selection import train_test_split
+
+from wypadki.config import MODELS_DIR, TABLE_COLUMNS, YEARS
+from wypadki.encoding import SparseOneHotEncoder
+from wypadki.features import IMPORTANT_DISTANCE_BANDS, RUSH_HOUR_WINDOWS, add_features, clean
+from wypadki.ingest import SNAPSHOT_VERSION, load_tables
+from wypadki.join import join_tables
+from wypadki.schema import mask_sentinels
+
+PREPROCESSING_PATH = MODELS_DIR / 'preprocessing.json'
+
+
+class PreprocessingPipeline:
+    def __init__(self, rush_hour_windows=RUSH_HOUR_WINDOWS, important_distance_bands=IMPORTANT_DISTANCE_BANDS):
+        self.rush_hour_windows = [tuple(w) for w in rush_hour_windows]
+        self.important_distance_bands = list(important_distance_bands)
+        self.speed_mean = None
+        self.speed_std = None
+        self.encoder = SparseOneHotEncoder()
+
+    def fit(self, data, speed_moments=None):
+        """Dopasowuje parametry na oczyszczonych danych treningowych.
+
+        `speed_moments` (wypadki.streaming.RunningMoments) pozwala podać statystyki policzone partiami.
+        """
+        if speed_moments is not None:
+            self.speed_mean, self.speed_std = float(speed_moments.mean), float(speed_moments.std)
+        else:
+            speed = data['speed_limit'].to_numpy(dtype='float64')
+            std = speed.std()
+            self.speed_mean, self.speed_std = float(speed.mean()), float(std) if std > 0 else 1.0
+        self.encoder.fit(self.add_features(data.copy()))
+        return self
+
+    def add_features(self, data):
+        data = add_features(data, self.speed_mean, self.speed_std,
+                            rush_hour_windows=self.rush_hour_windows,
+                            important_distance_bands=self.important_distance_bands)
+        # Dane muszą przejść przez clean(): błędny zapis godziny nie może trafić do macierzy modelu
+        n_missing = int(data['hour_of_day'].isna().sum())
+        if n_missing:
+            raise ValueError(f'Brak godziny (hour_of_day) w {n_missing} wierszach - błędny zapis `time` '
+                             f'(oczekiwano HH:MM); dane należy najpierw oczyścić funkcją clean()')
+        return data
+
+    def encode(self, data):
+        return self.encoder.transform(data)
+
+    def transform(self, data, return_frame=False):
+        """Surowe (złączone) dane -> macierz CSR modelu. Wiersze z brakami danych są pomijane.
+
+        Przy `return_frame=True` zwraca też ramkę z cechami (jej indeks wskazuje zachowane wiersze).
+        """
+        frame = self.add_features(clean(mask_sentinels(data.copy())))
+        X = self.encode(frame)
+        return (X, frame) if return_frame else X
+
+    @property
+    def feature_names(self):
+        return self.encoder.feature_names
+
+    def to_dict(self):
+        return {
+            'speed_limit': {'mean': self.speed_mean, 'std': self.speed_std},
+            'rush_hour_windows': [list(w) for w in self.rush_hour_windows],
+            'important_distance_bands': self.important_distance_bands,
+            'encoder': self.encoder.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, d):
+        pipeline = cls(d['rush_hour_windows'], d['important_distance_bands'])
+        pipeline.speed_mean = d['speed_limit']['mean']
+        pipeline.speed_std = d['speed_limit']['std']
+        pipeline.encoder = SparseOneHotEncoder.from_dict(d['encoder'])
+        return pipeline
+
+    def save(self, path=PREPROCESSING_PATH):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2, ensure_ascii=False), encoding='utf-8')
+
+    @classmethod
+    def load(cls, path=PREPROCESSING_PATH):
+        return cls.from_dict(json.loads(path.read_text(encoding='utf-8')))
+
+
+def split_positions(y, test_size=0.2, val_size=0.25, random_state=42):
+    """Pozycje wierszy train/val/test jak w notebooku (80/20, potem 75/25 z części 80%), ze stratyfikacją."""
+    positions = np.arange(len(y))
+    pos_temp, pos_test = train_test_split(positions, test_size=test_size, random_state=random_state, stratify=y)
+    pos_train, pos_val = train_test_split(pos_temp, test_size=val_size, random_state=random_state,
+                                          stratify=np.asarray(y)[pos_temp])
+    return pos_train, pos_val, pos_test
+
+
+def load_clean_data(years=YEARS, version=SNAPSHOT_VERSION):
+    """Złączone (poszkodowany + pojazd + wypadek) i oczyszczone dane ze snapshotu, jak w notebooku."""
+    tables = load_tables(years=years, columns=TABLE_COLUMNS, version=version)
+    return clean(join_tables(tables['accidents'], tables['vehicles'], tables['casualties'], grain='casualty'))
+
+
+def prepare_model_data(data):
+    """Oczyszczone, złączone dane -> (potok dopasowany na zbiorze treningowym, macierze i etykiety train/val/test)."""
+    data = data.reset_index(drop=True)
+    pos_train, pos_val, pos_test = split_positions((data['urban_or_rural_area'] == 2).astype(int))
+    pipeline = PreprocessingPipeline().fit(data.iloc[pos_train])
+    data = pipeline.add_features(data)
+    X = pipeline.encode(data)
+    y = data['is_rural_accident'].to_numpy()
+    return pipeline, {
+        'X_train': X[pos_train], 'y_train': y[pos_train],
+        'X_val': X[pos_val], 'y_val': y[pos_val],
+        'X_test': X[pos_test], 'y_test': y[pos_test],
+    }
+
+
+def saved_split_data(data, split='test', path=PREPROCESSING_PATH):
+    """Oczyszczone, złączone dane -> (zapisany potok, macierz i etykiety zbioru `split` ('train'/'val'/'test')).
+
+    Podział jak w prepare_model_data, ale potok wczytywany jest z modele/preprocessing.json (ten, z którym uczono
+    zapisane modele) i tylko przekształca dane - bez ponownego dopasowania.
+    """
+    if not path.exists():
+        raise ValueError(f'Brak zapisanego potoku {path} - uruchom notebook (preprocessing.save()) przed obliczeniami.')
+    pipeline = PreprocessingPipeline.load(path)
+    data = data.reset_index(drop=True)
+    positions = dict(zip(('train', 'val', 'test'), split_positions((data['urban_or_rural_area'] == 2).astype(int))))
+    X, frame = pipeline.transform(data.iloc[positions[split]], return_frame=True)
+    return pipeline, X, frame['is_rural_accident'].to_numpy()
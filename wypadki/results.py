@@ -0,0 +1,75 @@
+# Magazyn wyników (katalog wyniki/): metryki i dane do wykresów zapisywane przez notebook jako pliki JSON,
+# czytane przez aplikację Streamlit zamiast wartości wpisanych na sztywno.
+#
+# Pojedyncze wyniki (np. cv_metrics.json, learning_curve_<model>.json) zapisywane są w trakcie obliczeń,
+# a na końcu notebook eksportuje wersjonowany pakiet wyników (bundle_<wersja>.json): wszystkie tabele,
+# krzywe i metryki sekcji aplikacji oraz zebrane pojedyncze wyniki. Aplikacja wczytuje tylko pakiet.
+import json
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from wypadki.config import RESULTS_DIR, YEARS
+
+BUNDLE_PREFIX = 'bundle_'
+# Domyślna wersja pakietu - zakres lat analizy, np. '2021-2023'
+BUNDLE_VERSION = f'{min(YEARS)}-{max(YEARS)}'
+
+
+def result_path(name, results_dir=RESULTS_DIR):
+    return results_dir / f'{name}.json'
+
+
+def save_result(name, payload, results_dir=RESULTS_DIR):
+    path = result_path(name, results_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding='utf-8')
+    return path
+
+
+def load_result(name, default=None, results_dir=RESULTS_DIR):
+    path = result_path(name, results_dir)
+    if not path.exists():
+        return default
+    return json.loads(path.read_text(encoding='utf-8'))
+
+
+def update_result(name, key, value, results_dir=RESULTS_DIR):
+    """Dopisuje/zastępuje jeden klucz (np. wyniki jednego modelu) w istniejącym pliku wyników."""
+    payload = load_result(name, {}, results_dir)
+    payload[key] = value
+    return save_result(name, payload, results_dir)
+
+
+def table(df):
+    """DataFrame -> słownik do zapisu w JSON (indeks, kolumny, wiersze)."""
+    return df.to_dict(orient='split')
+
+
+def frame(d):
+    """Słownik z table() -> DataFrame."""
+    return pd.DataFrame(d['data'], index=d['index'], columns=d['columns'])
+
+
+def available_bundles(results_dir=RESULTS_DIR):
+    """Wersje zapisanych pakietów wyników, posortowane rosnąco."""
+    return sorted(path.stem[len(BUNDLE_PREFIX):] for path in results_dir.glob(f'{BUNDLE_PREFIX}*.json'))
+
+
+def export_bundle(sections, version=BUNDLE_VERSION, results_dir=RESULTS_DIR):
+    """Zapisuje pakiet wyników: sekcje z notebooka oraz pozostałe wyniki z magazynu (artifacts)."""
+    artifacts = {path.stem: json.loads(path.read_text(encoding='utf-8'))
+                 for path in sorted(results_dir.glob('*.json')) if not path.stem.startswith(BUNDLE_PREFIX)}
+    bundle = {
+        'version': version,
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'sections': sections,
+        'artifacts': artifacts,
+    }
+    return save_result(f'{BUNDLE_PREFIX}{version}', bundle, results_dir)
+
+
+def load_bundle(version=None, results_dir=RESULTS_DIR):
+    """Pakiet wyników w podanej wersji (domyślnie najnowszej)."""
+    version = version or available_bundles(results_dir)[-1]
+    return load_result(f'{BUNDLE_PREFIX}{version}', results_dir=results_dir)
@@ -0,0 +1,78 @@
+# Rejestr schematów trzech tabel DfT (STATS19): kompaktowe typy kolumn deklarowane z góry.
+# Kody STATS19 są małymi liczbami całkowitymi, więc trzymamy je jako nullable Int8/Int16
+# (brak danych = <NA>, bez rzutowania na float64). Wartości -1 i 99 w kolumnach `columns_to_check_NaN`
+# zamieniane są na <NA> już przy wczytywaniu.
+import pandas as pd
+
+from wypadki.config import columns_to_check_NaN
+
+SCHEMAS = {
+    'accidents': {
+        'accident_index': 'string',
+        'accident_year': 'Int16',
+        'time': 'string',
+        'road_type': 'Int8',
+        'light_conditions': 'Int8',
+        'junction_detail': 'Int8',
+        'junction_control': 'Int8',
+        'weather_conditions': 'Int8',
+        'urban_or_rural_area': 'Int8',
+        'speed_limit': 'Int8',
+        'number_of_casualties': 'Int16',
+    },
+    'casualties': {
+        'accident_index': 'string',
+        'accident_year': 'Int16',
+        'vehicle_reference': 'Int16',
+        'casualty_reference': 'Int16',
+        'age_of_casualty': 'Int8',
+        'casualty_type': 'Int16',
+    },
+    'vehicles': {
+        'accident_index': 'string',
+        'accident_year': 'Int16',
+        'vehicle_reference': 'Int16',
+        'driver_home_area_type': 'Int8',
+        'driver_distance_banding': 'Int8',
+        'driver_imd_decile': 'Int8',
+        'age_of_vehicle': 'Int16',
+        'age_of_driver': 'Int8',
+        'skidding_and_overturning': 'Int8',
+    },
+}
+
+# Kody oznaczające brak danych
+SENTINELS = {column: [-1, 99] for column in columns_to_check_NaN}
+
+
+def apply_schema(df, table):
+    """Rzutuje kolumny na typy z rejestru i zamienia kody braków danych na <NA> (w miejscu)."""
+    schema = SCHEMAS[table]
+    for column in df.columns.intersection(list(schema)):
+        df[column] = df[column].astype(schema[column])
+    return mask_sentinels(df)
+
+
+def mask_sentinels(df):
+    """Zamienia kody -1/99 na <NA> w kolumnach z `SENTINELS` obecnych w ramce (w miejscu)."""
+    for column in df.columns.intersection(list(SENTINELS)):
+        values = df[column]
+        df[column] = values.mask(values.isin(SENTINELS[column]))
+    return df
+
+
+def read_table_csv(table, source, columns=None, chunksize=None):
+    """Czyta CSV tabeli tylko z potrzebnymi kolumnami i od razu w kompaktowych typach (bez low_memory=False)."""
+    usecols = columns or list(SCHEMAS[table])
+    schema = SCHEMAS[table]
+    return pd.read_csv(
+        source,
+        usecols=usecols,
+        dtype={column: schema[column] for column in usecols if column in schema},
+        na_values={column: [str(v) for v in SENTINELS[column]] for column in usecols if column in SENTINELS},
+        chunksize=chunksize,
+    )
+
+
+def memory_mb(df):
+    return df.memory_usage(index=True, deep=True).sum() / 2**20
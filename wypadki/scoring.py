@@ -0,0 +1,214 @@
+# Ocena nowych danych STATS19 zapisanymi modelami: prawdopodobieństwo wypadku na terenie wiejskim
+# (is_rural_accident) dla każdego wiersza pliku CSV/Parquet w formacie złączonych tabel (poziom poszkodowanego,
+# kolumny jak w wypadki.config.TABLE_COLUMNS).
+#   - potok przygotowania danych (modele/preprocessing.json) i modele (modele/<model>.joblib) wczytywane są raz,
+#   - plik czytany jest partiami (pd.read_csv z chunksize / pyarrow iter_batches), każda partia przekształcana
+#     i oceniana wektorowo, a wynik dopisywany do wyjścia CSV od razu - pamięć zależy od rozmiaru partii,
+#   - wiersze z brakami danych (pomijane przez potok) dostają puste prawdopodobieństwo,
+#   - tryb `serve` to lokalny serwer HTTP (biblioteka standardowa) dla małych zapytań online z pomiarem opóźnień,
+#   - `--packed` ocenia drzewa skompilowane do tablic NumPy (wypadki.packed) zamiast predict_proba modeli,
+#   - `--compact` ocenia las zapisany przez wypadki.compact (modele/<model>_compact/, mapowany do pamięci
+#     i współdzielony między procesami) - modele bez zapisu kompaktowego wczytywane są jak zwykle.
+#
+#   python -m wypadki.scoring score nowe_dane.parquet --out wyniki_oceny.csv --models xgb rf
+#   python -m wypadki.scoring serve --port 8000
+#   curl -X POST localhost:8000/score -d '{"rows": [{"time": "08:15", "road_type": 6, ...}]}'
+import argparse
+import json
+import sys
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from wypadki.compact import compact_dir, load_compact
+from wypadki.config import TABLE_COLUMNS
+from wypadki.packed import compile_model
+from wypadki.preprocessing import PreprocessingPipeline
+from wypadki.schema import SCHEMAS
+from wypadki.training import load_model
+
+# Kolumny identyfikujące wiersz - przepisywane do wyniku, jeśli są w pliku
+ID_COLUMNS = ['accident_index', 'vehicle_reference', 'casualty_reference']
+INPUT_COLUMNS = list(dict.fromkeys(c for columns in TABLE_COLUMNS.values() for c in columns if c not in ID_COLUMNS))
+# urban_or_rural_area to zmienna celu - w nowych danych może jej nie być (nie jest cechą modelu)
+TARGET_COLUMN = 'urban_or_rural_area'
+DTYPES = {column: dtype for schema in SCHEMAS.values() for column, dtype in schema.items()}
+
+BATCH_ROWS = 100_000
+
+
+class Scorer:
+    """Potok przygotowania danych i modele wczytane raz; score() zwraca prawdopodobieństwa dla ramki."""
+
+    def __init__(self, models=('xgb', 'rf'), packed=False, compact=False):
+        self.pipeline = PreprocessingPipeline.load()
+        compact_names = {name for name in models if compact and compact_dir(name).exists()}
+        self.models = {name: load_compact(name) if name in compact_names else load_model(name) for name in models}
+        if packed:
+            self.models = {name: model if name in compact_names else compile_model(model)
+                           for name, model in self.models.items()}
+
+    def prepare(self, frame):
+        missing = [c for c in INPUT_COLUMNS if c not in frame.columns and c != TARGET_COLUMN]
+        if missing:
+            raise ValueError(f'Brak kolumn wejściowych: {missing}')
+        frame = frame[[c for c in INPUT_COLUMNS if c in frame.columns]].copy()
+        if TARGET_COLUMN not in frame.columns:
+            # Wartość zastępcza, nie etykieta: potrzebna tylko, by clean() (urban_or_rural_area jest w
+            # columns_to_check_NaN) nie usunął wierszy i by dało się policzyć is_rural_accident - żadna z nich
+            # nie jest cechą modelu, więc nie wpływa na prawdopodobieństwa
+            frame[TARGET_COLUMN] = 1
+        for column in frame.columns:
+            frame[column] = frame[column].astype(DTYPES[column])
+        return frame
+
+    def score(self, frame):
+        """Ramka z kolumną proba_<model> dla każdego modelu, indeks jak w `frame` (NaN dla pominiętych wierszy)."""
+        X, kept = self.pipeline.transform(self.prepare(frame), return_frame=True)
+        scores = pd.DataFrame(index=frame.index)
+        for name, model in self.models.items():
+            proba = np.full(len(frame), np.nan, dtype='float32')
+            if X.shape[0]:
+                proba[frame.index.get_indexer(kept.index)] = model.predict_proba(X)[:, 1]
+            scores[f'proba_{name}'] = proba
+        return scores
+
+
+def iter_batches(path, batch_rows=BATCH_ROWS):
+    """Partie pliku CSV lub Parquet (tylko kolumny wejściowe i identyfikatory) z ciągłym indeksem wierszy."""
+    path = Path(path)
+    wanted = set(INPUT_COLUMNS) | set(ID_COLUMNS)
+    if path.suffix == '.parquet':
+        parquet = pq.ParquetFile(path)
+        batches = (batch.to_pandas() for batch in parquet.iter_batches(
+            batch_size=batch_rows, columns=[c for c in parquet.schema_arrow.names if c in wanted]))
+    else:
+        batches = pd.read_csv(path, usecols=lambda c: c in wanted, chunksize=batch_rows,
+                              dtype={c: t for c, t in DTYPES.items() if c in wanted})
+    start = 0
+    for batch in batches:
+        batch.index = pd.RangeIndex(start, start + len(batch))
+        start += len(batch)
+        yield batch
+
+
+def score_file(scorer, path, out=sys.stdout, batch_rows=BATCH_ROWS):
+    """Ocenia plik partiami i zapisuje CSV (numer wiersza, identyfikatory, proba_<model>) do `out` na bieżąco."""
+    start = time.perf_counter()
+    rows = 0
+    for k, batch in enumerate(iter_batches(path, batch_rows)):
+        scores = scorer.score(batch)
+        ids = batch[[c for c in ID_COLUMNS if c in batch.columns]]
+        pd.concat([ids, scores], axis=1).to_csv(out, header=k == 0, index_label='row', float_format='%.6f')
+        rows += len(batch)
+    seconds = time.perf_counter() - start
+    return {'rows': rows, 'seconds': seconds, 'rows_per_min': rows / seconds * 60 if seconds else float('nan')}
+
+
+class LatencyLog:
+    """Czasy ostatnich zapytań HTTP (ms) - percentyle dla /stats."""
+
+    def __init__(self, maxlen=10_000):
+        self.times = deque(maxlen=maxlen)
+        self.lock = threading.Lock()
+
+    def add(self, ms):
+        with self.lock:
+            self.times.append(ms)
+
+    def summary(self):
+        with self.lock:
+            times = np.array(self.times)
+        if not times.size:
+            return {'requests': 0}
+        return {'requests': int(times.size), 'p50_ms': float(np.percentile(times, 50)),
+                'p99_ms': float(np.percentile(times, 99)), 'max_ms': float(times.max())}
+
+
+def make_handler(scorer, latencies):
+    class ScoringHandler(BaseHTTPRequestHandler):
+        def _send(self, status, payload):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == '/health':
+                self._send(200, {'status': 'ok', 'models': list(scorer.models)})
+            elif self.path == '/stats':
+                self._send(200, latencies.summary())
+            else:
+                self._send(404, {'error': 'nieznana ścieżka'})
+
+        def do_POST(self):
+            if self.path != '/score':
+                self._send(404, {'error': 'nieznana ścieżka'})
+                return
+            start = time.perf_counter()
+            try:
+                rows = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))['rows']
+                scores = scorer.score(pd.DataFrame.from_records(rows))
+            except (ValueError, KeyError, TypeError) as exc:
+                self._send(400, {'error': str(exc)})
+                return
+            # NaN (wiersz pominięty przez potok) -> null
+            self._send(200, {column: [None if np.isnan(v) else float(v) for v in scores[column]] for column in scores})
+            latencies.add((time.perf_counter() - start) * 1000)
+
+        def log_message(self, format, *args):
+            # Bez wpisu na stderr dla każdego zapytania
+            pass
+
+    return ScoringHandler
+
+
+def make_server(scorer, host='127.0.0.1', port=8000):
+    """Serwer HTTP: POST /score ({"rows": [...]}) -> {"proba_<model>": [...]}, GET /health, GET /stats."""
+    return ThreadingHTTPServer((host, port), make_handler(scorer, LatencyLog()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Ocena danych STATS19 zapisanymi modelami (prawdopodobieństwo is_rural_accident).')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    score_parser = subparsers.add_parser('score', help='ocena pliku CSV/Parquet partiami')
+    score_parser.add_argument('path')
+    score_parser.add_argument('--out', default=None, help='plik wynikowy CSV (domyślnie standardowe wyjście)')
+    score_parser.add_argument('--batch-rows', type=int, default=BATCH_ROWS)
+    serve_parser = subparsers.add_parser('serve', help='lokalny serwer HTTP')
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=8000)
+    for sub in (score_parser, serve_parser):
+        sub.add_argument('--models', nargs='+', default=['xgb', 'rf'], choices=['xgb', 'rf'])
+        sub.add_argument('--packed', action='store_true', help='drzewa skompilowane do tablic NumPy (wypadki.packed)')
+        sub.add_argument('--compact', action='store_true', help='las zapisany przez wypadki.compact (mmap)')
+    args = parser.parse_args()
+
+    scorer = Scorer(args.models, packed=args.packed, compact=args.compact)
+    if args.command == 'score':
+        if args.out:
+            with open(args.out, 'w', newline='', encoding='utf-8') as out:
+                stats = score_file(scorer, args.path, out, args.batch_rows)
+        else:
+            stats = score_file(scorer, args.path, sys.stdout, args.batch_rows)
+        print(f"Ocenione wiersze: {stats['rows']:,} w {stats['seconds']:.1f} s ({stats['rows_per_min']:,.0f} wierszy/min)",
+              file=sys.stderr)
+    else:
+        server = make_server(scorer, args.host, args.port)
+        print(f'Serwer oceny: http://{args.host}:{args.port} (POST /score, GET /health, GET /stats)', file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+# Przetwarzanie danych STATS19 w partiach (dla wielu lat lub pełnych plików "last-5-years").
+# Dane czytane są ze snapshotu Parquet rok po roku i w partiach wypadków (wypadki.join.iter_join_years),
+# więc szczytowe zużycie pamięci zależy od rozmiaru partii, a nie od rozmiaru całego zbioru.
+#
+# Dwa przebiegi:
+#   1. statystyki `speed_limit` (średnia, wariancja) liczone online i łączone między partiami,
+#   2. czyszczenie + cechy z tymi samymi parametrami skalowania, zapis każdej partii do osobnego pliku Parquet.
+#
+# Uruchomienie z terminala:
+#   python -m wypadki.streaming --years 2019 2020 2021 2022 2023 --memory-budget-mb 256
+import argparse
+import json
+
+import numpy as np
+import pandas as pd
+
+from wypadki.config import DATA_DIR, YEARS
+from wypadki.features import add_features, clean
+from wypadki.ingest import SNAPSHOT_VERSION
+from wypadki.join import iter_join_years
+
+FEATURES_DIR = DATA_DIR / 'features'
+
+
+class RunningMoments:
+    """Średnia i wariancja liczone partiami (algorytm Chana), zgodne z StandardScaler (ddof=0)."""
+
+    def __init__(self, count=0, mean=0.0, m2=0.0):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+
+    def update(self, values):
+        values = np.asarray(values, dtype='float64')
+        if values.size == 0:
+            return self
+        batch_mean = values.mean()
+        return self.merge(RunningMoments(values.size, batch_mean, ((values - batch_mean) ** 2).sum()))
+
+    def merge(self, other):
+        count = self.count + other.count
+        if count == 0:
+            return self
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / count
+        self.count = count
+        return self
+
+    @property
+    def var(self):
+        return self.m2 / self.count if self.count else float('nan')
+
+    @property
+    def std(self):
+        # Jak w StandardScaler: zerowa wariancja nie skaluje danych
+        std = np.sqrt(self.var)
+        return std if std > 0 else 1.0
+
+    def to_dict(self):
+        return {'count': int(self.count), 'mean': float(self.mean), 'm2': float(self.m2)}
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(d['count'], d['mean'], d['m2'])
+
+
+def iter_clean_batches(years=YEARS, memory_budget_mb=256, version=SNAPSHOT_VERSION):
+    for batch in iter_join_years(years, grain='casualty', memory_budget_mb=memory_budget_mb, version=version):
+        yield clean(batch)
+
+
+def speed_limit_moments(years=YEARS, memory_budget_mb=256, version=SNAPSHOT_VERSION):
+    # Przebieg 1: statystyki do normalizacji speed_limit
+    moments = RunningMoments()
+    for batch in iter_clean_batches(years, memory_budget_mb, version):
+        moments.update(batch['speed_limit'].to_numpy(dtype='float64'))
+    return moments
+
+
+def run_streaming_pipeline(out_dir=None, years=YEARS, memory_budget_mb=256, version=SNAPSHOT_VERSION):
+    """Zapisuje partie cech do `out_dir/part-XXXXX.parquet` oraz parametry skalowania do `out_dir/_stats.json`."""
+    out_dir = out_dir or FEATURES_DIR / version
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for old_part in out_dir.glob('part-*.parquet'):
+        old_part.unlink()
+
+    moments = speed_limit_moments(years, memory_budget_mb, version)
+
+    # Przebieg 2: cechy z globalnymi parametrami skalowania
+    rows = 0
+    n_parts = 0
+    for batch in iter_clean_batches(years, memory_budget_mb, version):
+        if batch.empty:
+            continue
+        batch = add_features(batch, moments.mean, moments.std)
+        batch.to_parquet(out_dir / f'part-{n_parts:05d}.parquet', index=False)
+        rows += len(batch)
+        n_parts += 1
+
+    stats = {'years': list(years), 'rows': rows, 'parts': n_parts, 'speed_limit': moments.to_dict()}
+    (out_dir / '_stats.json').write_text(json.dumps(stats, indent=2), encoding='utf-8')
+    return stats
+
+
+def read_feature_batches(out_dir=None, columns=None, version=SNAPSHOT_VERSION):
+    out_dir = out_dir or FEATURES_DIR / version
+    return pd.read_parquet(out_dir, columns=columns)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Przetwarzanie danych STATS19 w partiach.')
+    parser.add_argument('--years', nargs='+', type=int, default=YEARS)
+    parser.add_argument('--memory-budget-mb', type=int, default=256)
+    parser.add_argument('--version', default=SNAPSHOT_VERSION, help='wersja snapshotu Parquet')
+    args = parser.parse_args()
+
+    stats = run_streaming_pipeline(years=args.years, memory_budget_mb=args.memory_budget_mb, version=args.version)
+    print(f"Zapisano {stats['rows']:,} wierszy w {stats['parts']} partiach "
+          f"(speed_limit: średnia {stats['speed_limit']['mean']:.3f})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+# Szybkie wyodrębnianie godziny (i opcjonalnie minuty oraz pory dnia) z kolumny `time` w formacie HH:MM.
+# Zamiast budować pełną kolumnę datetime64 (pd.to_datetime), tekst zamieniany jest na macierz bajtów
+# i cyfry odczytywane są wektorowo z odpowiednich pozycji. Wartości błędne (np. '25:00', '7.30', '')
+# dają <NA> zamiast wyjątku. Akceptowany jest także zapis bez zera wiodącego (H:MM).
+import numpy as np
+import pandas as pd
+
+# Pora dnia wg godziny: noc 0-5, rano 6-11, popołudnie 12-17, wieczór 18-23
+TIME_OF_DAY_LABELS = ['noc', 'rano', 'popołudnie', 'wieczór']
+TIME_OF_DAY_BY_HOUR = np.repeat(np.arange(4), 6)
+
+_COLON = ord(':')
+
+
+def _parse(times):
+    # Zwraca (godzina, minuta, czy_poprawne) jako tablice NumPy
+    text = pd.Series(times).astype('string').fillna('').to_numpy(dtype=object)
+    try:
+        raw = text.astype('S6')
+    except UnicodeEncodeError:
+        raw = np.array([t.encode('ascii', 'replace') for t in text], dtype='S6')
+
+    b = raw.view(np.uint8).reshape(len(raw), 6).astype(np.int16)
+    d = b - ord('0')
+    digit = (d >= 0) & (d <= 9)
+
+    # HH:MM (dokładnie 5 znaków) lub H:MM (dokładnie 4 znaki)
+    long_format = digit[:, 0] & digit[:, 1] & (b[:, 2] == _COLON) & digit[:, 3] & digit[:, 4] & (b[:, 5] == 0)
+    short_format = digit[:, 0] & (b[:, 1] == _COLON) & digit[:, 2] & digit[:, 3] & (b[:, 4] == 0)
+
+    hour = np.where(long_format, d[:, 0] * 10 + d[:, 1], d[:, 0])
+    minute = np.where(long_format, d[:, 3] * 10 + d[:, 4], d[:, 2] * 10 + d[:, 3])
+    valid = (long_format | short_format) & (hour <= 23) & (minute <= 59)
+    return hour, minute, valid
+
+
+def _nullable(values, valid, index):
+    return pd.Series(pd.arrays.IntegerArray(values.astype('int8'), ~valid), index=index)
+
+
+def extract_hour(times):
+    """Godzina 0-23 jako Int8 (<NA> dla wartości błędnych), z zachowaniem indeksu wejścia."""
+    hour, _, valid = _parse(times)
+    return _nullable(hour, valid, getattr(times, 'index', None))
+
+
+def extract_time(times, minute=True, time_of_day=False):
+    """Ramka z kolumnami `hour`, opcjonalnie `minute` i `time_of_day` (kategoria pory dnia)."""
+    hour, minutes, valid = _parse(times)
+    index = getattr(times, 'index', None)
+    result = pd.DataFrame({'hour': _nullable(hour, valid, index)})
+    if minute:
+        result['minute'] = _nullable(minutes, valid, index)
+    if time_of_day:
+        codes = np.where(valid, TIME_OF_DAY_BY_HOUR[np.where(valid, hour, 0)], -1)
+        result['time_of_day'] = pd.Categorical.from_codes(codes, categories=TIME_OF_DAY_LABELS)
+    return result
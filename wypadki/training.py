@@ -0,0 +1,189 @@
+# Trenowanie modeli z walidacją krzyżową bez podwójnego uczenia.
+# Dotychczas cross_val_score(model, X_train, y_train, cv=5) uczył 5 modeli tylko po to, by wypisać AUC,
+# a potem model.fit(X_train, y_train) uczył szósty. Tutaj:
+#   - podzbiory (StratifiedKFold, jak w cross_val_score) uczone są równolegle (wątki - XGBoost i RandomForest
+#     zwalniają GIL, więc macierz treningowa nie jest kopiowana do procesów), z podziałem rdzeni między podzbiory,
+#   - modele podzbiorów i predykcje out-of-fold zapisywane są w modele/cv/<model>-<skrót>/ (skrót z parametrów
+#     i danych), więc ponowne uruchomienie notebooka wczytuje je zamiast uczyć od nowa; czas uczenia podzbioru
+#     zapisywany jest obok modelu, a wczytanie z pamięci podręcznej oznaczane osobno (metryka 'cached'),
+#   - modelem końcowym jest domyślnie (refit=False) zespół modeli podzbiorów (średnia prawdopodobieństw) - bez
+#     szóstego uczenia na całym zbiorze, kosztem 5× dłuższej predykcji i 5× większego pliku; refit=True (opcjonalnie)
+#     uczy dodatkowo jeden model na całym zbiorze treningowym,
+#   - metryki walidacji krzyżowej trafiają do magazynu wyników (wyniki/cv_metrics.json) dla aplikacji Streamlit,
+#   - modele końcowe zapisywane są pod stałą nazwą (modele/<model>.joblib) dla skryptu oceniającego (wypadki.scoring).
+import hashlib
+import json
+import os
+import time
+
+import joblib
+import numpy as np
+from scipy import sparse
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import StratifiedKFold
+
+from wypadki.config import MODELS_DIR
+from wypadki.models import MODELS
+from wypadki.results import update_result
+
+CV_DIR = MODELS_DIR / 'cv'
+
+
+def _update_digest(digest, value):
+    # Macierze po bajtach (rzadkie: data/indices/indptr), QuantileDMatrix po progach kwantyli,
+    # krotki, listy i słowniki rekurencyjnie, pozostałe wartości jako JSON
+    if sparse.issparse(value):
+        parts = (value.data, value.indices, value.indptr)
+    elif hasattr(value, 'get_quantile_cut'):
+        parts = (*value.get_quantile_cut(), np.array([value.num_row(), value.num_col()]))
+    elif isinstance(value, np.ndarray) or hasattr(value, 'to_numpy'):
+        parts = (np.asarray(value),)
+    elif isinstance(value, (tuple, list)):
+        for item in value:
+            _update_digest(digest, item)
+        return
+    elif isinstance(value, dict):
+        for key in sorted(value):
+            digest.update(str(key).encode())
+            _update_digest(digest, value[key])
+        return
+    else:
+        digest.update(json.dumps(value, default=str).encode())
+        return
+    for part in parts:
+        digest.update(np.ascontiguousarray(part).tobytes())
+
+
+def fingerprint(X, y, params, fit_params=None):
+    """Skrót parametrów modelu, danych i wartości `fit_params` (np. eval_set, ref) - klucz pamięci podręcznej."""
+    digest = hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode())
+    _update_digest(digest, (X, y))
+    if fit_params:
+        _update_digest(digest, fit_params)
+    return digest.hexdigest()[:12]
+
+
+class FoldEnsemble:
+    """Modele z podzbiorów walidacji krzyżowej wraz z predykcjami out-of-fold."""
+
+    def __init__(self, models, oof, fold_auc, fit_seconds, cached=None):
+        self.models = models
+        self.oof = oof
+        self.fold_auc = fold_auc
+        self.fit_seconds = fit_seconds
+        self.cached = cached or [False] * len(models)
+
+    def predict_proba(self, X):
+        return np.mean([model.predict_proba(X) for model in self.models], axis=0)
+
+    def predict(self, X, threshold=0.5):
+        return (self.predict_proba(X)[:, 1] >= threshold).astype(int)
+
+    @property
+    def feature_importances_(self):
+        return np.mean([model.feature_importances_ for model in self.models], axis=0)
+
+    def metrics(self, y):
+        metrics = {
+            'fold_auc': self.fold_auc,
+            'mean_auc': float(np.mean(self.fold_auc)),
+            'std_auc': float(np.std(self.fold_auc)),
+            'oof_auc': float(roc_auc_score(y, self.oof)),
+            'fit_seconds': self.fit_seconds,
+            'cached': self.cached,
+        }
+        # Modele z wczesnym zatrzymaniem (wypadki.boosting.HistXGB)
+        if all(getattr(model, 'best_iteration', None) is not None for model in self.models):
+            metrics['best_iteration'] = [int(model.best_iteration) for model in self.models]
+        return metrics
+
+
+def _fit_fold(name, params, fit_params, X, y, train_idx, test_idx, path):
+    # Zwraca (model, predykcje, czas uczenia, czy wczytany); przy wczytaniu czas uczenia pochodzi z pliku obok
+    # modelu (None dla modeli zapisanych bez niego), a nie z czasu wczytania
+    timing_path = path.with_suffix('.json')
+    if path.exists():
+        model = joblib.load(path)
+        seconds = json.loads(timing_path.read_text())['fit_seconds'] if timing_path.exists() else None
+        cached = True
+    else:
+        start = time.perf_counter()
+        model = MODELS[name](**params).fit(X[train_idx], y[train_idx], **fit_params)
+        seconds = time.perf_counter() - start
+        cached = False
+        joblib.dump(model, path)
+        timing_path.write_text(json.dumps({'fit_seconds': seconds}))
+    proba = model.predict_proba(X[test_idx])[:, 1]
+    return model, proba, seconds, cached
+
+
+def cross_validate(name, X, y, model_params=None, n_splits=5, n_jobs=-1, cache_dir=CV_DIR, fit_params=None):
+    """Walidacja krzyżowa modelu `name` (wypadki.models.MODELS) z równoległymi podzbiorami i zapisem modeli.
+
+    `fit_params` trafiają do model.fit() w każdym podzbiorze (np. eval_set i ref dla 'xgb_hist').
+    """
+    y = np.asarray(y)
+    fit_params = fit_params or {}
+    n_parallel = min(n_splits, os.cpu_count() or 1) if n_jobs == -1 else n_jobs
+    # Rdzenie dzielone między równolegle uczone podzbiory (bez nadsubskrypcji wątków)
+    params = {**(model_params or {}), 'n_jobs': max(1, (os.cpu_count() or 1) // n_parallel)}
+
+    key = fingerprint(X, y, {"name": name, "params": model_params, "n_splits": n_splits}, fit_params)
+    run_dir = cache_dir / f'{name}-{key}'
+    run_dir.mkdir(parents=True, exist_ok=True)
+
+    folds = list(StratifiedKFold(n_splits=n_splits).split(np.zeros(len(y)), y))
+    results = joblib.Parallel(n_jobs=n_parallel, prefer='threads')(
+        joblib.delayed(_fit_fold)(name, params, fit_params, X, y, train_idx, test_idx, run_dir / f'fold_{k}.joblib')
+        for k, (train_idx, test_idx) in enumerate(folds)
+    )
+
+    oof = np.empty(len(y), dtype='float32')
+    fold_auc = []
+    for (_, test_idx), (_, proba, _, _) in zip(folds, results):
+        oof[test_idx] = proba
+        fold_auc.append(float(roc_auc_score(y[test_idx], proba)))
+    np.save(run_dir / 'oof.npy', oof)
+    models, _, fit_seconds, cached = (list(column) for column in zip(*results))
+    return FoldEnsemble(models, oof, fold_auc, fit_seconds, cached)
+
+
+def train_model(name, X, y, model_params=None, n_splits=5, refit=False, n_jobs=-1, cache_dir=CV_DIR, fit_params=None):
+    """Walidacja krzyżowa + model końcowy; zwraca (model, zespół podzbiorów).
+
+    Przy refit=False (domyślnie) modelem końcowym jest zespół podzbiorów - bez szóstego uczenia, ale z predykcją
+    i rozmiarem n_splits razy większymi i przybliżonymi wartościami SHAP (wypadki.explain). refit=True uczy
+    dodatkowo jeden model na całym zbiorze.
+    """
+    y = np.asarray(y)
+    ensemble = cross_validate(name, X, y, model_params, n_splits, n_jobs, cache_dir, fit_params)
+    update_result('cv_metrics', name, ensemble.metrics(y))
+    if not refit:
+        return ensemble, ensemble
+
+    path = cache_dir / f'{name}-{fingerprint(X, y, {"name": name, "params": model_params}, fit_params)}' / 'full.joblib'
+    if path.exists():
+        return joblib.load(path), ensemble
+    model = MODELS[name](**(model_params or {})).fit(X, y, **(fit_params or {}))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    joblib.dump(model, path)
+    return model, ensemble
+
+
+def model_path(name, models_dir=MODELS_DIR):
+    return models_dir / f'{name}.joblib'
+
+
+def save_model(model, name, models_dir=MODELS_DIR):
+    """Zapisuje model końcowy (np. FoldEnsemble z train_model) jako modele/<name>.joblib."""
+    path = model_path(name, models_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    joblib.dump(model, path)
+    return path
+
+
+def load_model(name, models_dir=MODELS_DIR):
+    path = model_path(name, models_dir)
+    if not path.exists():
+        raise ValueError(f'Brak zapisanego modelu {path} - uruchom notebook (save_model) przed oceną.')
+    return joblib.load(path)
@@ -0,0 +1,190 @@
+# Strojenie hiperparametrów XGBoost i RandomForest metodą Hyperband (successive halving w kilku "nawiasach").
+# Budżetem próby jest liczba wierszy zbioru treningowego: wiele konfiguracji uczonych jest na małej próbce,
+# a do kolejnych szczebli (×eta wierszy) przechodzi tylko najlepsza 1/eta część wg AUC-ROC na zbiorze walidacyjnym.
+#
+#   - próby uruchamiane są równolegle w procesach (joblib/loky), z podziałem rdzeni między procesy i wątki modelu,
+#   - macierze zapisywane są raz do plików .npy i otwierane w procesach jako np.memmap (bez kopiowania danych),
+#   - każda zakończona próba dopisywana jest do trials.jsonl - przerwane strojenie wznawiane jest bez powtórzeń,
+#   - `time_budget_s` ogranicza łączny czas: po jego przekroczeniu nie są uruchamiane kolejne szczeble.
+#
+# Uruchomienie z terminala (np. po dodaniu nowego roku STATS19):
+#   python -m wypadki.tuning --model xgb --years 2021 2022 2023 2024 --time-budget-min 120 --n-jobs 4
+import argparse
+import json
+import math
+import os
+import time
+
+import joblib
+import numpy as np
+from scipy import sparse
+from sklearn.metrics import roc_auc_score
+
+from wypadki.config import MODELS_DIR, YEARS
+from wypadki.imbalance import IMBALANCE_MODE, balance
+from wypadki.models import MODELS
+from wypadki.preprocessing import load_clean_data, prepare_model_data
+from wypadki.results import save_result
+from wypadki.training import fingerprint
+
+TUNING_DIR = MODELS_DIR / 'tuning'
+
+# Przestrzenie przeszukiwania: ('int', od, do), ('float', od, do), ('log', od, do) lub ('choice', [wartości])
+SEARCH_SPACES = {
+    'xgb': {
+        'max_depth': ('int', 3, 12),
+        'n_estimators': ('int', 100, 600),
+        'learning_rate': ('log', 0.01, 0.3),
+        'reg_alpha': ('log', 0.001, 10.0),
+        'reg_lambda': ('log', 0.1, 10.0),
+        'subsample': ('float', 0.5, 1.0),
+        'colsample_bytree': ('float', 0.4, 1.0),
+    },
+    'rf': {
+        'n_estimators': ('int', 100, 400),
+        'max_depth': ('int', 6, 20),
+        'min_samples_split': ('int', 2, 100),
+        'min_samples_leaf': ('int', 1, 50),
+        'max_features': ('choice', ['sqrt', 'log2']),
+        'criterion': ('choice', ['gini', 'entropy']),
+    },
+}
+
+
+def sample_params(space, rng):
+    params = {}
+    for name, (kind, *spec) in space.items():
+        if kind == 'int':
+            params[name] = int(rng.integers(spec[0], spec[1] + 1))
+        elif kind == 'float':
+            params[name] = float(rng.uniform(spec[0], spec[1]))
+        elif kind == 'log':
+            params[name] = float(np.exp(rng.uniform(np.log(spec[0]), np.log(spec[1]))))
+        else:
+            params[name] = spec[0][int(rng.integers(len(spec[0])))]
+    return params
+
+
+def save_arrays(run_dir, X_train, y_train, X_val, y_val, seed=42):
+    """Zapis macierzy do .npy (raz na strojenie). Wiersze treningowe są tasowane, więc próbka = początek macierzy."""
+    order = np.random.default_rng(seed).permutation(X_train.shape[0])
+    X_train, y_train = X_train[order], np.asarray(y_train)[order]
+    data_dir = run_dir / 'data'
+    data_dir.mkdir(parents=True, exist_ok=True)
+    for prefix, X, y in (('train', X_train, y_train), ('val', X_val, y_val)):
+        X = sparse.csr_matrix(X)
+        np.save(data_dir / f'{prefix}_data.npy', X.data)
+        np.save(data_dir / f'{prefix}_indices.npy', X.indices)
+        np.save(data_dir / f'{prefix}_indptr.npy', X.indptr)
+        np.save(data_dir / f'{prefix}_y.npy', np.asarray(y))
+        (data_dir / f'{prefix}_shape.json').write_text(json.dumps(list(X.shape)))
+    return data_dir
+
+
+def load_arrays(data_dir, prefix):
+    # Tablice otwierane jako memmap - procesy współdzielą strony pliku zamiast kopii danych
+    parts = [np.load(data_dir / f'{prefix}_{part}.npy', mmap_mode='r') for part in ('data', 'indices', 'indptr')]
+    shape = tuple(json.loads((data_dir / f'{prefix}_shape.json').read_text()))
+    return sparse.csr_matrix(tuple(parts), shape=shape, copy=False), np.load(data_dir / f'{prefix}_y.npy', mmap_mode='r')
+
+
+def _run_trial(name, params, rows, data_dir, n_threads):
+    start = time.perf_counter()
+    X_train, y_train = load_arrays(data_dir, 'train')
+    X_val, y_val = load_arrays(data_dir, 'val')
+    model = MODELS[name](**{**params, 'n_jobs': n_threads}).fit(X_train[:rows], np.asarray(y_train[:rows]))
+    auc = roc_auc_score(y_val, model.predict_proba(X_val)[:, 1])
+    return {'auc': float(auc), 'seconds': time.perf_counter() - start}
+
+
+def hyperband_brackets(max_rows, min_rows, eta):
+    """Nawiasy Hyperband: lista (liczba konfiguracji, lista rozmiarów próbek kolejnych szczebli)."""
+    s_max = int(math.log(max_rows / min_rows, eta) + 1e-9)
+    brackets = []
+    for s in range(s_max, -1, -1):
+        n = int(math.ceil((s_max + 1) / (s + 1) * eta ** s))
+        brackets.append((n, [int(max_rows * eta ** (i - s)) for i in range(s + 1)]))
+    return brackets
+
+
+def tune(name, X_train, y_train, X_val, y_val, fixed_params=None, min_rows=5_000, eta=3, n_jobs=-1,
+         time_budget_s=None, seed=42, cache_dir=TUNING_DIR):
+    """Hyperband dla modelu `name`; zwraca najlepszą konfigurację i zapisuje podsumowanie do wyniki/tuning_<model>.json."""
+    start = time.perf_counter()
+    fixed_params = fixed_params or {}
+    cpus = os.cpu_count() or 1
+    n_workers = cpus if n_jobs == -1 else n_jobs
+    n_threads = max(1, cpus // n_workers)
+
+    run_dir = cache_dir / f'{name}-{fingerprint(X_train, y_train, {"name": name, "fixed": fixed_params, "seed": seed})}'
+    data_dir = run_dir / 'data'
+    if not data_dir.exists():
+        save_arrays(run_dir, X_train, y_train, X_val, y_val, seed)
+    trials_path = run_dir / 'trials.jsonl'
+    done = {}
+    if trials_path.exists():
+        for line in trials_path.read_text().splitlines():
+            trial = json.loads(line)
+            done[(trial['trial'], trial['rows'])] = trial
+
+    max_rows = X_train.shape[0]
+    for b, (n_configs, rungs) in enumerate(hyperband_brackets(max_rows, min_rows, eta)):
+        # Konfiguracje wyznaczane z ziarna (seed, nawias, numer) - identyczne po wznowieniu
+        candidates = {f'{b}-{k}': {**sample_params(SEARCH_SPACES[name], np.random.default_rng([seed, b, k])), **fixed_params}
+                      for k in range(n_configs)}
+        for i, rows in enumerate(rungs):
+            if done and time_budget_s is not None and time.perf_counter() - start > time_budget_s:
+                break
+            todo = [trial for trial in candidates if (trial, rows) not in done]
+            results = joblib.Parallel(n_jobs=n_workers)(
+                joblib.delayed(_run_trial)(name, candidates[trial], rows, data_dir, n_threads) for trial in todo
+            )
+            with trials_path.open('a') as f:
+                for trial, result in zip(todo, results):
+                    record = {'trial': trial, 'rows': rows, 'params': candidates[trial], **result}
+                    done[(trial, rows)] = record
+                    f.write(json.dumps(record) + '\n')
+            # Do następnego szczebla przechodzi najlepsza 1/eta część konfiguracji
+            ranked = sorted(candidates, key=lambda trial: done[(trial, rows)]['auc'], reverse=True)
+            keep = max(1, int(n_configs * eta ** -(i + 1)))
+            candidates = {trial: candidates[trial] for trial in ranked[:keep]}
+        if time_budget_s is not None and time.perf_counter() - start > time_budget_s:
+            print(f'Przekroczono budżet czasu ({time_budget_s:.0f} s) - strojenie przerwane po nawiasie {b}.')
+            break
+
+    # Najlepsza konfiguracja spośród ocenionych na największej próbce
+    largest = max(trial['rows'] for trial in done.values())
+    best = max((trial for trial in done.values() if trial['rows'] == largest), key=lambda trial: trial['auc'])
+    summary = {
+        'model': name,
+        'best_params': best['params'],
+        'best_auc': best['auc'],
+        'best_rows': best['rows'],
+        'n_trials': len(done),
+        'seconds': time.perf_counter() - start,
+    }
+    save_result(f'tuning_{name}', summary)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Strojenie hiperparametrów (Hyperband, budżet = liczba wierszy).')
+    parser.add_argument('--model', choices=list(SEARCH_SPACES), default='xgb')
+    parser.add_argument('--years', type=int, nargs='+', default=YEARS)
+    parser.add_argument('--imbalance', default=IMBALANCE_MODE, help='wariant balansowania (wypadki.imbalance)')
+    parser.add_argument('--min-rows', type=int, default=5_000, help='najmniejsza próbka (pierwszy szczebel)')
+    parser.add_argument('--eta', type=int, default=3)
+    parser.add_argument('--n-jobs', type=int, default=-1, help='liczba równoległych procesów')
+    parser.add_argument('--time-budget-min', type=float, default=None, help='łączny budżet czasu (minuty)')
+    args = parser.parse_args()
+
+    _, data = prepare_model_data(load_clean_data(args.years))
+    X_train, y_train, model_params = balance(data['X_train'], data['y_train'], mode=args.imbalance)
+    summary = tune(args.model, X_train, y_train, data['X_val'], data['y_val'], fixed_params=model_params[args.model],
+                   min_rows=args.min_rows, eta=args.eta, n_jobs=args.n_jobs,
+                   time_budget_s=args.time_budget_min * 60 if args.time_budget_min else None)
+    print(json.dumps(summary, indent=2, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+# Przyrostowa aktualizacja statystyk o kolejne lata STATS19 bez przeliczania historii.
+# Dla każdego roku zapisywane są addytywne statystyki dostateczne (wyniki/yearly/stats_<rok>.json):
+#   - kostka liczności (wypadki.cube) - tabele sekcji III, w tym liczby is_urban_driver w latach (Tabela 2),
+#   - tabele kontyngencji cech sekcji VI z is_rural_accident (wypadki.association),
+#   - momenty speed_limit (liczność, średnia, M2 - wypadki.streaming.RunningMoments) do normalizacji.
+# Dodanie roku to przetworzenie tylko jego danych; statystyki wszystkich lat są sumowane, a test chi-kwadrat,
+# proporcje i tabele aplikacji liczone z sumy w milisekundach.
+#
+# Uruchomienie z terminala (po pojawieniu się danych za nowy rok w snapshocie):
+#   python -m wypadki.yearly --add 2024
+#   python -m wypadki.yearly --export                 # pakiet wyników i kostka dla wszystkich zapisanych lat
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from wypadki.association import KEY_FEATURES, association_with_target, chi2_tests, cramer_strength
+from wypadki.config import RESULTS_DIR
+from wypadki.cube import OlapCube, drivers_section
+from wypadki.features import add_features
+from wypadki.preprocessing import load_clean_data
+from wypadki.results import available_bundles, export_bundle, load_bundle, load_result, save_result
+from wypadki.streaming import RunningMoments
+
+YEARLY_DIR = RESULTS_DIR / 'yearly'
+
+# Etykiety tabel kontyngencji w pakiecie wyników (jak w eksporcie z notebooka)
+DRIVER_LABELS = ['Kier. wiejski', 'Kier. miejski']
+ACCIDENT_LABELS = ['Wypadek miejski', 'Wypadek wiejski']
+
+
+def year_statistics(data, year, features=KEY_FEATURES):
+    """Statystyki dostateczne jednego roku z oczyszczonych danych (bez cech - dodawane tutaj)."""
+    speed = RunningMoments().update(data['speed_limit'].to_numpy(dtype='float64'))
+    # Parametry skalowania nie wpływają na cechy kategorialne użyte w testach
+    data = add_features(data, speed.mean, speed.std)
+    _, tables = association_with_target(data, features)
+    return {
+        'year': year,
+        'rows': len(data),
+        'speed_limit': speed.to_dict(),
+        'cube': OlapCube.build(data).to_dict(),
+        'contingency': {feature: {'levels': table.index.tolist(), 'target_levels': table.columns.tolist(),
+                                  'counts': table.values.tolist()}
+                        for feature, table in tables.items()},
+    }
+
+
+def add_year(year, results_dir=YEARLY_DIR):
+    """Przetwarza dane jednego roku ze snapshotu i zapisuje jego statystyki."""
+    stats = year_statistics(load_clean_data([year]), year)
+    return save_result(f'stats_{year}', stats, results_dir)
+
+
+def available_years(results_dir=YEARLY_DIR):
+    return sorted(int(path.stem[len('stats_'):]) for path in results_dir.glob('stats_*.json'))
+
+
+def _merge_tables(tables):
+    # Suma tabel kontyngencji o (być może) różnych zbiorach kategorii
+    levels = sorted({level for t in tables for level in t['levels']})
+    target_levels = sorted({level for t in tables for level in t['target_levels']})
+    counts = np.zeros((len(levels), len(target_levels)), dtype='int64')
+    for t in tables:
+        rows = [levels.index(level) for level in t['levels']]
+        cols = [target_levels.index(level) for level in t['target_levels']]
+        counts[np.ix_(rows, cols)] += np.array(t['counts'], dtype='int64')
+    return pd.DataFrame(counts, index=levels, columns=target_levels)
+
+
+def merge_statistics(years=None, results_dir=YEARLY_DIR):
+    """Suma statystyk wybranych lat (domyślnie wszystkich zapisanych): kostka, tabele kontyngencji, momenty."""
+    years = years or available_years(results_dir)
+    if not years:
+        raise ValueError(f'Brak statystyk rocznych w {results_dir} - uruchom najpierw `python -m wypadki.yearly --add <rok>`.')
+    yearly = [load_result(f'stats_{year}', results_dir=results_dir) for year in years]
+    missing = [year for year, stats in zip(years, yearly) if stats is None]
+    if missing:
+        raise ValueError(f'Brak statystyk dla lat: {missing}')
+    speed = RunningMoments()
+    for stats in yearly:
+        speed.merge(RunningMoments.from_dict(stats['speed_limit']))
+    features = list(dict.fromkeys(feature for stats in yearly for feature in stats['contingency']))
+    return {
+        'years': list(years),
+        'rows': sum(stats['rows'] for stats in yearly),
+        'speed_limit': speed,
+        'cube': OlapCube.merge([OlapCube.from_dict(stats['cube']) for stats in yearly]),
+        'contingency': {feature: _merge_tables([stats['contingency'][feature] for stats in yearly
+                                                if feature in stats['contingency']])
+                        for feature in features},
+    }
+
+
+def chi2_features_section(contingency, labels=None):
+    """Sekcja chi2_features pakietu wyników z tabel kontyngencji (posortowana malejąco wg V Craméra)."""
+    labels = labels or {}
+    tests = dict(zip(contingency, chi2_tests([table.values for table in contingency.values()])))
+    entries = []
+    for feature, table in contingency.items():
+        test = tests[feature]
+        index = DRIVER_LABELS if feature == 'is_urban_driver' else [str(level) for level in table.index]
+        entries.append({
+            'feature': feature,
+            'label': labels.get(feature, feature),
+            'statistic': None if np.isnan(test['statistic']) else test['statistic'],
+            'p_value': None if np.isnan(test['p_value']) else test['p_value'],
+            'cramer_v': None if np.isnan(test['cramer_v']) else test['cramer_v'],
+            'strength': cramer_strength(test['cramer_v']),
+            'contingency': {'index': index, 'columns': ACCIDENT_LABELS, 'data': table.values.tolist()},
+            'expected': {'index': index, 'columns': ACCIDENT_LABELS, 'data': test['expected'].round(1).tolist()}
+                        if feature == 'is_urban_driver' else None,
+        })
+    return sorted(entries, key=lambda e: -1 if e['cramer_v'] is None else e['cramer_v'], reverse=True)
+
+
+def export(years=None, results_dir=YEARLY_DIR):
+    """Pakiet wyników i kostka dla lat `years`: sekcje III i VI przeliczone ze statystyk rocznych, pozostałe sekcje
+    (modele, ważność cech, ocena) przenoszone z najnowszego pakietu i oznaczane jego wersją ('model_version')."""
+    merged = merge_statistics(years, results_dir)
+    version = f"{min(merged['years'])}-{max(merged['years'])}"
+    previous = load_bundle() if available_bundles() else None
+    previous_sections = previous['sections'] if previous else {}
+    labels = {entry['feature']: entry['label'] for entry in previous_sections.get('chi2_features', [])}
+    sections = {
+        **previous_sections,
+        'drivers': drivers_section(merged['cube']),
+        'chi2_features': chi2_features_section(merged['contingency'], labels),
+    }
+    if previous:
+        # Modele nie są uczone na nowych latach - aplikacja pokazuje, z którego pakietu pochodzą ich wyniki
+        # i wczytuje ich predykcje (wyniki/predictions_<model_version>.npz)
+        sections['model_version'] = previous_sections.get('model_version', previous['version'])
+    merged['cube'].save(version)
+    return export_bundle(sections, version), (previous['version'] if previous else None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Przyrostowa aktualizacja statystyk o kolejne lata STATS19.')
+    parser.add_argument('--add', type=int, nargs='*', default=[], metavar='ROK', help='lata do przetworzenia')
+    parser.add_argument('--years', type=int, nargs='+', default=None, help='lata sumowane (domyślnie wszystkie zapisane)')
+    parser.add_argument('--export', action='store_true', help='zapisz pakiet wyników i kostkę dla sumy lat')
+    args = parser.parse_args()
+
+    for year in args.add:
+        start = time.perf_counter()
+        path = add_year(year)
+        print(f'{year}: statystyki zapisane w {path} ({time.perf_counter() - start:.1f} s)')
+
+    start = time.perf_counter()
+    merged = merge_statistics(args.years)
+    drivers = drivers_section(merged['cube'])
+    chi2_features_section(merged['contingency'])
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"Lata {merged['years']}: {merged['rows']:,} wierszy, χ² (pochodzenie kierowcy) = {drivers['chi2']['statistic']:,.1f}, "
+          f"speed_limit: średnia {merged['speed_limit'].mean:.3f}, odch. std. {merged['speed_limit'].std:.3f} "
+          f"- przeliczenie {elapsed_ms:.1f} ms")
+
+    if args.export:
+        path, previous_version = export(args.years)
+        print(f'Zapisano pakiet wyników: {path}'
+              + (f' (sekcje modeli przeniesione z pakietu {previous_version})' if previous_version else ''))
+
+
+if __name__ == '__main__':
+    main()